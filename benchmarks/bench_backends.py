@@ -0,0 +1,76 @@
+"""
+Benchmark de backends de inferencia: ultralytics (PyTorch eager) vs onnxruntime.
+
+Mide la latencia por imagen de los tres modelos YOLO (autos, placas, logos) en
+CPU con cada backend sobre data/test_images, y la concordancia de las cajas
+entre ambos (mismo id de clase e IoU >= 0.5).
+
+Placas y logos se evaluan sobre los recortes de vehiculos que encuentra el
+detector de autos (o la imagen completa si no encuentra ninguno).
+
+Uso:
+    python benchmarks/bench_backends.py [--runs 20]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.inference import UltralyticsBackend, OnnxBackend
+from benchmarks.metrics import agreement
+
+MODELS = ['car_detector', 'plate_detector', 'brand_detector']
+
+
+def time_backend(backend, images, runs):
+    """Latencia media por imagen (ms) y salidas de la ultima corrida."""
+    backend.predict(images[:1])  # warmup
+    start = time.perf_counter()
+    for _ in range(runs):
+        outputs = [backend.predict([img])[0] for img in images]
+    return (time.perf_counter() - start) / (runs * len(images)) * 1000, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ultralytics vs onnxruntime")
+    parser.add_argument('--images', default=os.path.join(PROJECT_ROOT, 'data', 'test_images'))
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.images, '*')))
+    frames = [img for img in (cv2.imread(p) for p in paths) if img is not None]
+
+    # Recortes de vehiculos para los modelos de placas y logos
+    car_model = UltralyticsBackend(os.path.join(PROJECT_ROOT, 'models', 'car_detector.pt'))
+    crops = []
+    for frame, output in zip(frames, car_model.predict(frames)):
+        boxes = output.xyxy.astype(int)
+        crops.extend(frame[y1:y2, x1:x2] for x1, y1, x2, y2 in boxes if x2 - x1 > 20 and y2 - y1 > 20)
+    crops = crops or frames
+
+    print("\n" + "=" * 70)
+    print(f"BENCHMARK BACKENDS CPU ({len(frames)} imagenes, {len(crops)} recortes, {args.runs} corridas)")
+    print("=" * 70)
+    print(f"{'modelo':<16}{'ultralytics ms':>16}{'onnx ms':>12}{'speedup':>10}{'concordancia':>14}")
+
+    for name in MODELS:
+        model_path = os.path.join(PROJECT_ROOT, 'models', f'{name}.pt')
+        images = frames if name == 'car_detector' else crops
+
+        torch_ms, torch_out = time_backend(UltralyticsBackend(model_path), images, args.runs)
+        onnx_ms, onnx_out = time_backend(OnnxBackend(model_path), images, args.runs)
+        score = np.mean([agreement(a, b) for a, b in zip(torch_out, onnx_out)])
+
+        print(f"{name:<16}{torch_ms:>16.1f}{onnx_ms:>12.1f}{torch_ms / onnx_ms:>10.2f}{score:>14.1%}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
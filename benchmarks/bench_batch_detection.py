@@ -0,0 +1,83 @@
+"""
+Benchmark de deteccion de vehiculos por batch.
+
+Compara el throughput de CarDetector.detect_vehicles (un frame por llamada)
+contra detect_vehicles_batch con distintos tamanos de batch, y verifica que
+ambos caminos devuelven exactamente las mismas detecciones.
+
+Uso:
+    python benchmarks/bench_batch_detection.py [--frames 32] [--sizes 1 2 4 8 16]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.car_detector import CarDetector
+
+
+def load_frames(images_dir, num_frames, width, height):
+    """Carga las imagenes de prueba como frames de un mismo tamano (como un video)."""
+    paths = sorted(glob.glob(os.path.join(images_dir, '*')))
+    images = [cv2.imread(p) for p in paths]
+    images = [cv2.resize(img, (width, height)) for img in images if img is not None]
+    if not images:
+        raise RuntimeError(f"No se encontraron imagenes en {images_dir}")
+    return [images[i % len(images)] for i in range(num_frames)]
+
+
+def run_single(detector, frames):
+    start = time.perf_counter()
+    detections = [detector.detect_vehicles(frame) for frame in frames]
+    return detections, time.perf_counter() - start
+
+
+def run_batched(detector, frames, batch_size):
+    start = time.perf_counter()
+    detections = []
+    for i in range(0, len(frames), batch_size):
+        detections.extend(detector.detect_vehicles_batch(frames[i:i + batch_size]))
+    return detections, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de deteccion por batch")
+    parser.add_argument('--images', default=os.path.join(PROJECT_ROOT, 'data', 'test_images'))
+    parser.add_argument('--frames', type=int, default=32)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    args = parser.parse_args()
+
+    frames = load_frames(args.images, args.frames, args.width, args.height)
+    detector = CarDetector()
+
+    # Warmup
+    detector.detect_vehicles_batch(frames[:2])
+
+    reference, single_time = run_single(detector, frames)
+
+    print("\n" + "=" * 60)
+    print(f"BENCHMARK DETECCION POR BATCH ({len(frames)} frames {args.width}x{args.height})")
+    print("=" * 60)
+    print(f"{'modo':<12}{'ms/frame':>10}{'FPS':>10}{'speedup':>10}{'identico':>10}")
+    print(f"{'single':<12}{single_time / len(frames) * 1000:>10.1f}"
+          f"{len(frames) / single_time:>10.1f}{1.0:>10.2f}{'-':>10}")
+
+    for batch_size in args.sizes:
+        detections, elapsed = run_batched(detector, frames, batch_size)
+        identical = [d.to_list() for d in detections] == [d.to_list() for d in reference]
+        print(f"{'batch=' + str(batch_size):<12}{elapsed / len(frames) * 1000:>10.1f}"
+              f"{len(frames) / elapsed:>10.1f}{single_time / elapsed:>10.2f}"
+              f"{'SI' if identical else 'NO':>10}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
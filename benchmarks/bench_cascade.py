@@ -0,0 +1,81 @@
+"""
+Benchmark de deteccion en cascada (coarse-to-fine).
+
+Compara CarDetector en modo 'standard' (una pasada a resolucion completa)
+contra el modo 'cascade' con distintos tamanos de pasada gruesa. Reporta
+latencia media por frame, regiones refinadas por frame y el recall de la
+cascada tomando como referencia las detecciones del modo standard (con
+CAR_MIN_CONFIDENCE). Si las imagenes tienen etiquetas YOLO reporta tambien
+el recall contra las etiquetas.
+
+Uso:
+    python benchmarks/bench_cascade.py [--coarse 256 320 416] [--runs 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.car_detector import CarDetector
+from benchmarks.bench_tiling import load_images
+from benchmarks.metrics import load_yolo_labels, recall50
+
+
+def run(detector, images, runs):
+    """Latencia media por frame (ms), regiones refinadas por frame y detecciones."""
+    detector.detect_vehicles(images[0])  # warmup
+    regions = 0
+    start = time.perf_counter()
+    for _ in range(runs):
+        detections = []
+        for img in images:
+            detections.append(detector.detect_vehicles(img))
+            if detector.last_cascade_stats:
+                regions += detector.last_cascade_stats['regions']
+    frames = runs * len(images)
+    return (time.perf_counter() - start) * 1000 / frames, regions / frames, detections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de deteccion en cascada")
+    parser.add_argument('--images', default=os.path.join(PROJECT_ROOT, 'data', 'test_images'))
+    parser.add_argument('--coarse', type=int, nargs='+', default=[256, 320, 416])
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    loaded = load_images(args.images)
+    images = [img for _, img in loaded]
+    labels = [load_yolo_labels(p, img.shape) for p, img in loaded]
+    has_labels = all(label is not None for label in labels)
+
+    detector = CarDetector()
+
+    detector.detection_mode = 'standard'
+    base_ms, _, reference = run(detector, images, args.runs)
+    reference_gt = [(ref.xyxy.astype(np.float32), ref.class_ids) for ref in reference]
+
+    rows = [('standard', base_ms, 0.0, reference)]
+    detector.detection_mode = 'cascade'
+    for coarse in args.coarse:
+        detector.cascade_coarse_imgsz = coarse
+        elapsed_ms, regions, detections = run(detector, images, args.runs)
+        rows.append((f"cascade {coarse}", elapsed_ms, regions, detections))
+
+    print("\n" + "=" * 76)
+    print(f"BENCHMARK CASCADA ({len(images)} imagenes, confianza minima {detector.min_confidence})")
+    print("=" * 76)
+    print(f"{'modo':<14}{'ms/frame':>10}{'speedup':>9}{'regiones':>10}{'recall vs std':>15}{'recall':>9}")
+    for name, elapsed_ms, regions, detections in rows:
+        recall = f"{recall50(detections, labels):.3f}" if has_labels else '-'
+        print(f"{name:<14}{elapsed_ms:>10.1f}{base_ms / elapsed_ms:>9.2f}{regions:>10.1f}"
+              f"{recall50(detections, reference_gt):>15.3f}{recall:>9}")
+    print("=" * 76)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark del clasificador de color por tabla (LUT) contra K-Means.
+
+Sobre los recortes de los vehiculos detectados en las imagenes de prueba,
+mide el tiempo por vehiculo de K-Means (K=3, metodo anterior) y del
+histograma por LUT para distintos tamanos de tabla, y reporta la
+concordancia de colores entre ambos y los desacuerdos mas frecuentes.
+
+Uso:
+    python benchmarks/bench_color_lut.py [--bins 16 32 64]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.classifier import build_color_lut, color_roi, dominant_color_kmeans, dominant_color_lut
+from benchmarks.bench_ocr_batch import load_vehicle_crops
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del clasificador de color por LUT")
+    parser.add_argument('--images', default=os.path.join(PROJECT_ROOT, 'data', 'test_images'))
+    parser.add_argument('--bins', type=int, nargs='+', default=[16, 32, 64])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    rois = [roi for roi in (color_roi(crop) for crop in load_vehicle_crops(args.images)) if roi is not None]
+
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        kmeans_colors = [dominant_color_kmeans(roi) for roi in rois]
+    kmeans_ms = (time.perf_counter() - start) * 1000 / (args.runs * len(rois))
+
+    print("\n" + "=" * 66)
+    print(f"BENCHMARK COLOR LUT vs K-MEANS ({len(rois)} vehiculos, {args.runs} corridas)")
+    print("=" * 66)
+    print(f"{'metodo':<14}{'ms/vehiculo':>13}{'speedup':>10}{'build ms':>11}{'concord.':>11}")
+    print(f"{'kmeans':<14}{kmeans_ms:>13.3f}{1.0:>10.2f}{'-':>11}{'-':>11}")
+
+    disagreements = {}
+    for bins in args.bins:
+        build_color_lut.cache_clear()
+        start = time.perf_counter()
+        lut = build_color_lut(bins)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            lut_colors = [dominant_color_lut(roi, lut) for roi in rois]
+        lut_ms = (time.perf_counter() - start) * 1000 / (args.runs * len(rois))
+
+        same = sum(a == b for a, b in zip(kmeans_colors, lut_colors))
+        disagreements[bins] = Counter((a, b) for a, b in zip(kmeans_colors, lut_colors) if a != b)
+        print(f"{f'lut {bins}^3':<14}{lut_ms:>13.3f}{kmeans_ms / lut_ms:>10.2f}"
+              f"{build_ms:>11.1f}{same / len(rois):>11.1%}")
+    print("=" * 66)
+
+    for bins, counter in disagreements.items():
+        if counter:
+            top = ', '.join(f"{a}->{b} x{n}" for (a, b), n in counter.most_common(5))
+            print(f"Desacuerdos lut {bins}^3 (kmeans->lut): {top}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark del CropBatcher para los detectores de placas y logos.
+
+Compara una llamada a YOLO por recorte de vehiculo (camino original) contra
+CropBatcher (recortes con letterbox a un tamano fijo y batches de
+CROP_BATCH_SIZE) con distintas cantidades de vehiculos por frame. Reporta
+latencia por frame y concordancia de cajas entre ambos caminos.
+
+Uso:
+    python benchmarks/bench_crop_batch.py [--vehicles 1 4 10 20] [--batch-size 8]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.crop_batcher import CropBatcher
+from src.inference import load_yolo_backend
+from benchmarks.bench_ocr_batch import load_vehicle_crops
+from benchmarks.metrics import agreement
+
+MODELS = ['plate_detector', 'brand_detector']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de deteccion de placas/logos por batch")
+    parser.add_argument('--images', default=os.path.join(PROJECT_ROOT, 'data', 'test_images'))
+    parser.add_argument('--vehicles', type=int, nargs='+', default=[1, 4, 10, 20])
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    crops = load_vehicle_crops(args.images)
+    batcher = CropBatcher(batch_size=args.batch_size, imgsz=args.imgsz)
+
+    print("\n" + "=" * 74)
+    print(f"BENCHMARK CROP BATCHER (batch {args.batch_size}, imgsz {args.imgsz}, {args.runs} corridas)")
+    print("=" * 74)
+    print(f"{'modelo':<16}{'vehiculos':>10}{'por recorte ms':>16}{'batch ms':>11}{'speedup':>10}{'concord.':>11}")
+
+    for name in MODELS:
+        backend = load_yolo_backend(os.path.join(PROJECT_ROOT, 'models', f'{name}.pt'))
+        backend.predict(crops[:1])  # warmup
+        for count in args.vehicles:
+            frame_crops = [crops[i % len(crops)] for i in range(count)]
+
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                single = [backend.predict([crop])[0] for crop in frame_crops]
+            single_ms = (time.perf_counter() - start) * 1000 / args.runs
+
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                batched = batcher.predict(backend, frame_crops)
+            batched_ms = (time.perf_counter() - start) * 1000 / args.runs
+
+            score = np.mean([agreement(a, b) for a, b in zip(single, batched)])
+            print(f"{name:<16}{count:>10}{single_ms:>16.1f}{batched_ms:>11.1f}"
+                  f"{single_ms / batched_ms:>10.2f}{score:>11.1%}")
+    print("=" * 74)
+
+
+if __name__ == "__main__":
+    main()
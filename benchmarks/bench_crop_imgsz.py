@@ -0,0 +1,97 @@
+"""
+Benchmark del tamano de entrada por recorte para los detectores de placas y logos.
+
+Sobre un conjunto fijo de recortes de vehiculos compara el CropBatcher con
+tamano fijo (CROP_BATCH_IMGSZ, referencia) contra configuraciones con tamano
+segun el recorte (CROP_IMGSZ_SIZES / CROP_IMGSZ_UPSCALE). Reporta ms por
+recorte y recall contra las cajas de la referencia, total y por tamano de
+recorte, para elegir los umbrales.
+
+Uso:
+    python benchmarks/bench_crop_imgsz.py [--sizes 320,640 256,416,640] [--upscale 1.0 1.5]
+"""
+import argparse
+import os
+import sys
+import time
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.crop_batcher import CropBatcher
+from src.inference import load_yolo_backend
+from benchmarks.bench_ocr_batch import load_vehicle_crops
+from benchmarks.metrics import recall50
+
+MODELS = ['plate_detector', 'brand_detector']
+# Limites (lado mayor del recorte) para el desglose de recall
+CROP_BUCKETS = [(0, 320), (320, 640), (640, None)]
+
+
+def run(batcher, backend, crops, runs):
+    """Salidas del batcher y ms por recorte (promedio de `runs` corridas)."""
+    start = time.perf_counter()
+    for _ in range(runs):
+        outputs = batcher.predict(backend, crops)
+    return outputs, (time.perf_counter() - start) * 1000 / (runs * len(crops))
+
+
+def bucket_recall(outputs, reference, crops, low, high):
+    """Recall contra la referencia solo en los recortes con lado mayor en [low, high)."""
+    selected = [i for i, crop in enumerate(crops)
+                if max(crop.shape[:2]) >= low and (high is None or max(crop.shape[:2]) < high)]
+    if not selected:
+        return None
+    ground_truths = [(reference[i].xyxy, reference[i].class_ids) for i in selected]
+    return recall50([outputs[i] for i in selected], ground_truths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de tamano de entrada por recorte")
+    parser.add_argument('--images', default=os.path.join(PROJECT_ROOT, 'data', 'test_images'))
+    parser.add_argument('--sizes', nargs='+', default=['320,640', '256,416,640'],
+                        help="Conjuntos de tamanos separados por coma")
+    parser.add_argument('--upscale', type=float, nargs='+', default=[1.0, 1.5])
+    parser.add_argument('--reference-imgsz', type=int, default=640)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    crops = load_vehicle_crops(args.images)
+    bucket_names = [f"{low}-{high or 'inf'}" for low, high in CROP_BUCKETS]
+    bucket_counts = [sum(1 for c in crops if max(c.shape[:2]) >= low and (high is None or max(c.shape[:2]) < high))
+                     for low, high in CROP_BUCKETS]
+
+    print("\n" + "=" * 90)
+    print(f"BENCHMARK IMGSZ POR RECORTE ({len(crops)} recortes, referencia {args.reference_imgsz}, {args.runs} corridas)")
+    print("Recortes por lado mayor: " + ", ".join(f"{n}px: {c}" for n, c in zip(bucket_names, bucket_counts)))
+    print("=" * 90)
+    print(f"{'modelo':<16}{'sizes':<14}{'upscale':>8}{'ms/recorte':>12}{'speedup':>9}{'recall':>9}"
+          + ''.join(f"{name:>11}" for name in bucket_names))
+
+    for name in MODELS:
+        backend = load_yolo_backend(os.path.join(PROJECT_ROOT, 'models', f'{name}.pt'))
+        backend.predict(crops[:1])  # warmup
+
+        reference_batcher = CropBatcher(batch_size=args.batch_size, imgsz=args.reference_imgsz)
+        reference, reference_ms = run(reference_batcher, backend, crops, args.runs)
+        print(f"{name:<16}{'fijo':<14}{'-':>8}{reference_ms:>12.2f}{1.0:>9.2f}{'-':>9}"
+              + ''.join(f"{'-':>11}" for _ in CROP_BUCKETS))
+
+        ground_truths = [(out.xyxy, out.class_ids) for out in reference]
+        for sizes_arg in args.sizes:
+            sizes = tuple(int(s) for s in sizes_arg.split(','))
+            for upscale in args.upscale:
+                batcher = CropBatcher(batch_size=args.batch_size, sizes=sizes, upscale=upscale)
+                outputs, ms = run(batcher, backend, crops, args.runs)
+                recall = recall50(outputs, ground_truths)
+                per_bucket = [bucket_recall(outputs, reference, crops, low, high) for low, high in CROP_BUCKETS]
+                print(f"{name:<16}{sizes_arg:<14}{upscale:>8.2f}{ms:>12.2f}{reference_ms / ms:>9.2f}{recall:>9.1%}"
+                      + ''.join(f"{r:>11.1%}" if r is not None else f"{'-':>11}" for r in per_bucket))
+    print("=" * 90)
+    print("Recall: cajas de la referencia encontradas con IoU >= 0.5")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark de OCR de placas por batch.
+
+Compara PlateRecognizer.recognize_plate llamado una vez por vehiculo contra
+recognize_plates_batch con todos los vehiculos de un "frame" (readtext_batched
+de EasyOCR), para distintas cantidades de vehiculos por frame. Verifica que
+ambos caminos leen las mismas placas.
+
+Los vehiculos se recortan de data/test_images con CarDetector y se repiten
+hasta completar cada tamano de frame (escena de estacionamiento).
+
+Uso:
+    python benchmarks/bench_ocr_batch.py [--vehicles 1 4 8 16]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.car_detector import CarDetector
+from src.plate_recognizer import PlateRecognizer
+
+
+def load_vehicle_crops(images_dir):
+    """Recortes de los vehiculos detectados en las imagenes de prueba."""
+    paths = sorted(glob.glob(os.path.join(images_dir, '*')))
+    frames = [img for img in (cv2.imread(p) for p in paths) if img is not None]
+    detector = CarDetector()
+    crops = []
+    for frame, detections in zip(frames, detector.detect_vehicles_batch(frames)):
+        for x1, y1, x2, y2 in detections.xyxy:
+            if x2 - x1 >= 20 and y2 - y1 >= 20:
+                crops.append(frame[y1:y2, x1:x2])
+    if not crops:
+        raise RuntimeError(f"No se detectaron vehiculos en {images_dir}")
+    return crops
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de OCR de placas por batch")
+    parser.add_argument('--images', default=os.path.join(PROJECT_ROOT, 'data', 'test_images'))
+    parser.add_argument('--vehicles', type=int, nargs='+', default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    crops = load_vehicle_crops(args.images)
+    recognizer = PlateRecognizer()
+    recognizer.recognize_plate(crops[0])  # warmup
+
+    print("\n" + "=" * 66)
+    print(f"BENCHMARK OCR POR BATCH ({len(crops)} vehiculos distintos)")
+    print("=" * 66)
+    print(f"{'vehiculos':<11}{'secuencial ms':>15}{'batch ms':>11}{'speedup':>10}{'mismas placas':>16}")
+
+    for count in args.vehicles:
+        frame_crops = [crops[i % len(crops)] for i in range(count)]
+
+        start = time.perf_counter()
+        sequential = [recognizer.recognize_plate(crop) for crop in frame_crops]
+        sequential_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        batched = recognizer.recognize_plates_batch(frame_crops)
+        batched_ms = (time.perf_counter() - start) * 1000
+
+        same = [r['text'] for r in sequential] == [r['text'] for r in batched]
+        print(f"{count:<11}{sequential_ms:>15.1f}{batched_ms:>11.1f}"
+              f"{sequential_ms / batched_ms:>10.2f}{'SI' if same else 'NO':>16}")
+    print("=" * 66)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark de deteccion de placas: por vehiculo vs una pasada al frame completo.
+
+Para cada imagen de prueba detecta los vehiculos y luego compara
+PlateRecognizer.detect_plate_regions_batch (YOLO sobre cada recorte) contra
+detect_plate_regions_full_frame (YOLO una vez sobre el frame y asignacion de
+placas por contencion). Reporta ms por frame y cuantos vehiculos terminan con
+la misma placa (IoU >= 0.5 en coordenadas del vehiculo).
+
+Uso:
+    python benchmarks/bench_plate_full_frame.py [--imgsz 960 1280] [--runs 5]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.car_detector import CarDetector
+from src.plate_recognizer import PlateRecognizer
+from benchmarks.metrics import box_iou
+
+
+def same_plate(a, b):
+    """True si ambos caminos devuelven la misma placa (o ninguno encuentra placa)."""
+    if a[1] is None or b[1] is None:
+        return a[1] is None and b[1] is None
+    return box_iou(np.array([a[1]], np.float32), np.array([b[1]], np.float32))[0, 0] >= 0.5
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de placas por vehiculo vs frame completo")
+    parser.add_argument('--images', default=os.path.join(PROJECT_ROOT, 'data', 'test_images'))
+    parser.add_argument('--imgsz', type=int, nargs='+', default=[960, 1280])
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.images, '*')))
+    frames = [img for img in (cv2.imread(p) for p in paths) if img is not None]
+    detector = CarDetector()
+    recognizer = PlateRecognizer()
+
+    scenes = []
+    for frame, detections in zip(frames, detector.detect_vehicles_batch(frames)):
+        boxes = [d['bbox'] for d in detections]
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in boxes]
+        if crops:
+            scenes.append((frame, boxes, crops))
+    if not scenes:
+        raise RuntimeError(f"No se detectaron vehiculos en {args.images}")
+    vehicles = sum(len(crops) for _, _, crops in scenes)
+
+    def per_vehicle():
+        return [recognizer.detect_plate_regions_batch(crops) for _, _, crops in scenes]
+
+    def full_frame():
+        return [recognizer.detect_plate_regions_full_frame(frame, boxes, crops)
+                for frame, boxes, crops in scenes]
+
+    rows = []
+    per_vehicle()  # warmup
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        reference = per_vehicle()
+    base_ms = (time.perf_counter() - start) * 1000 / (args.runs * len(scenes))
+    rows.append(('por vehiculo', base_ms, vehicles))
+
+    for imgsz in args.imgsz:
+        recognizer.full_frame_imgsz = imgsz
+        full_frame()  # warmup
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            regions = full_frame()
+        elapsed_ms = (time.perf_counter() - start) * 1000 / (args.runs * len(scenes))
+        matches = sum(same_plate(a, b) for ref, reg in zip(reference, regions) for a, b in zip(ref, reg))
+        rows.append((f"frame {imgsz}", elapsed_ms, matches))
+
+    print("\n" + "=" * 62)
+    print(f"BENCHMARK PLACAS ({len(scenes)} frames, {vehicles} vehiculos)")
+    print("=" * 62)
+    print(f"{'modo':<16}{'ms/frame':>10}{'speedup':>10}{'misma placa':>16}")
+    for name, elapsed_ms, matches in rows:
+        print(f"{name:<16}{elapsed_ms:>10.1f}{base_ms / elapsed_ms:>10.2f}{f'{matches}/{vehicles}':>16}")
+    print("=" * 62)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark de deteccion en mosaico (tiles) para frames de alta resolucion.
+
+Compara CarDetector en modo 'standard' (frame completo reducido al tamano de
+entrada de YOLO) contra el modo 'tiled' con distintos tamanos de tile y
+solapes. Reporta latencia por frame, tiles por frame, costo por tile y
+cuantos vehiculos se detectan. Si las imagenes tienen etiquetas YOLO
+(images/ + labels/) reporta ademas el recall.
+
+Uso:
+    python benchmarks/bench_tiling.py [--tile-sizes 640 960] [--overlaps 0.1 0.2 0.3]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.car_detector import CarDetector
+from benchmarks.metrics import box_iou, load_yolo_labels, recall50
+
+
+def load_images(images_dir):
+    if os.path.isdir(os.path.join(images_dir, 'images')):
+        images_dir = os.path.join(images_dir, 'images')
+    paths = sorted(glob.glob(os.path.join(images_dir, '*')))
+    loaded = [(p, cv2.imread(p)) for p in paths]
+    loaded = [(p, img) for p, img in loaded if img is not None]
+    if not loaded:
+        raise RuntimeError(f"No se encontraron imagenes en {images_dir}")
+    return loaded
+
+
+def run(detector, images, runs):
+    """Latencia media por frame (ms), tiles por frame y detecciones."""
+    detector.detect_vehicles(images[0])  # warmup
+    start = time.perf_counter()
+    for _ in range(runs):
+        detections = [detector.detect_vehicles(img) for img in images]
+    elapsed_ms = (time.perf_counter() - start) * 1000 / (runs * len(images))
+    tiles = detector.last_tile_stats['tiles'] if detector.last_tile_stats else 1
+    return elapsed_ms, tiles, detections
+
+
+def count_new(reference, candidate):
+    """Vehiculos de candidate que no estan en reference (IoU < 0.5)."""
+    new = 0
+    for ref, cand in zip(reference, candidate):
+        if len(cand) == 0:
+            continue
+        if len(ref) == 0:
+            new += len(cand)
+            continue
+        iou = box_iou(cand.xyxy.astype(np.float32), ref.xyxy.astype(np.float32))
+        new += int((iou.max(axis=1) < 0.5).sum())
+    return new
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de deteccion en mosaico")
+    parser.add_argument('--images', default=os.path.join(PROJECT_ROOT, 'data', 'test_images'))
+    parser.add_argument('--tile-sizes', type=int, nargs='+', default=[640, 960])
+    parser.add_argument('--overlaps', type=float, nargs='+', default=[0.1, 0.2, 0.3])
+    parser.add_argument('--no-full-frame', action='store_true',
+                        help="Sin pasada adicional al frame completo")
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    loaded = load_images(args.images)
+    images = [img for _, img in loaded]
+    labels = [load_yolo_labels(p, img.shape) for p, img in loaded]
+    has_labels = all(label is not None for label in labels)
+
+    detector = CarDetector()
+    detector.tile_full_frame = not args.no_full_frame
+
+    detector.detection_mode = 'standard'
+    detector.last_tile_stats = None
+    base_ms, _, reference = run(detector, images, args.runs)
+
+    rows = [('standard', base_ms, 1, reference)]
+    detector.detection_mode = 'tiled'
+    for tile_size in args.tile_sizes:
+        for overlap in args.overlaps:
+            detector.tile_size = tile_size
+            detector.tile_overlap = overlap
+            elapsed_ms, tiles, detections = run(detector, images, args.runs)
+            rows.append((f"{tile_size}/{overlap:.0%}", elapsed_ms, tiles, detections))
+
+    print("\n" + "=" * 80)
+    print(f"BENCHMARK MOSAICO ({len(images)} imagenes, pasada completa: {detector.tile_full_frame})")
+    print("=" * 80)
+    print(f"{'modo':<14}{'ms/frame':>10}{'tiles':>7}{'ms/tile':>9}{'costo':>8}"
+          f"{'vehiculos':>11}{'nuevos':>8}{'recall':>9}")
+    for name, elapsed_ms, tiles, detections in rows:
+        recall = f"{recall50(detections, labels):.3f}" if has_labels else '-'
+        print(f"{name:<14}{elapsed_ms:>10.1f}{tiles:>7}{elapsed_ms / tiles:>9.1f}"
+              f"{elapsed_ms / base_ms:>7.1f}x{sum(len(d) for d in detections):>11}"
+              f"{count_new(reference, detections):>8}{recall:>9}")
+    print("=" * 80)
+    print("tiles = tiles de la ultima imagen; nuevos = vehiculos que el modo standard no detecta")
+
+
+if __name__ == "__main__":
+    main()
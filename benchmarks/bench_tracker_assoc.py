@@ -0,0 +1,107 @@
+"""
+Benchmark de la asociacion tracks <-> detecciones de VehicleTracker.
+
+Simula un estacionamiento visto desde arriba con N vehiculos estacionados en
+filas (cajas vecinas que se tocan) y mide el tiempo por frame de la
+asociacion anterior (matriz IoU con doble loop en Python + greedy por
+argmax) contra la actual (IoU vectorizado + asignacion hungara). Reporta
+tambien la concordancia de los pares asignados entre ambas.
+
+Uso:
+    python benchmarks/bench_tracker_assoc.py [--tracks 10 100 500]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.tracker import VehicleTracker, _Track, lap
+
+
+def parking_lot(n, rng, spot=(120, 60), gap=4):
+    """Cajas [x1, y1, x2, y2] de n vehiculos estacionados en filas."""
+    cols = int(np.ceil(np.sqrt(n * 2)))
+    idx = np.arange(n)
+    x1 = (idx % cols) * (spot[1] + gap) + rng.uniform(-3, 3, n)
+    y1 = (idx // cols) * (spot[0] + gap) + rng.uniform(-3, 3, n)
+    return np.stack([x1, y1, x1 + spot[1], y1 + spot[0]], axis=1)
+
+
+def legacy_associate(tracker, detections):
+    """Asociacion anterior: IoU con doble loop y greedy por argmax."""
+    iou_matrix = np.zeros((len(tracker.tracks), len(detections)), dtype=np.float32)
+    for t_idx, track in enumerate(tracker.tracks):
+        for d_idx, det in enumerate(detections):
+            iou_matrix[t_idx, d_idx] = tracker._iou(track.bbox, det["bbox"])
+
+    matches = []
+    matched_tracks = set()
+    matched_dets = set()
+    while True:
+        t_idx, d_idx = np.unravel_index(np.argmax(iou_matrix), iou_matrix.shape)
+        if iou_matrix[t_idx, d_idx] < tracker.iou_threshold:
+            break
+        if t_idx in matched_tracks or d_idx in matched_dets:
+            iou_matrix[t_idx, d_idx] = -1
+            continue
+        matches.append((int(t_idx), int(d_idx)))
+        matched_tracks.add(t_idx)
+        matched_dets.add(d_idx)
+        iou_matrix[t_idx, :] = -1
+        iou_matrix[:, d_idx] = -1
+    return matches
+
+
+def make_frame(n, rng, jitter=6.0, missing=0.05, new=0.05):
+    """Tracker con n tracks y detecciones del frame siguiente (con ruido, faltantes y nuevas)."""
+    boxes = parking_lot(n, rng)
+    tracker = VehicleTracker()
+    tracker.tracks = [_Track(list(box), i + 1) for i, box in enumerate(boxes)]
+
+    keep = rng.random(n) >= missing
+    dets = boxes[keep] + rng.normal(0, jitter, (int(keep.sum()), 4))
+    extra = parking_lot(int(n * new) + 1, rng) + np.tile(boxes[:, 2:].max(axis=0), 2) + 200
+    dets = np.concatenate([dets, extra])[rng.permutation(len(dets) + len(extra))]
+    return tracker, [{"bbox": [float(v) for v in det]} for det in dets]
+
+
+def timed(fn, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = fn()
+    return result, (time.perf_counter() - start) * 1000 / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de asociacion del tracker")
+    parser.add_argument('--tracks', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    solver = 'lap.lapjv' if lap is not None else 'scipy linear_sum_assignment'
+
+    print("\n" + "=" * 72)
+    print(f"BENCHMARK ASOCIACION DEL TRACKER ({solver}, {args.runs} corridas)")
+    print("=" * 72)
+    print(f"{'tracks':>8}{'dets':>8}{'anterior ms':>14}{'actual ms':>12}{'speedup':>10}{'mismos pares':>15}")
+
+    for n in args.tracks:
+        tracker, detections = make_frame(n, rng)
+        legacy, legacy_ms = timed(lambda: legacy_associate(tracker, detections), args.runs)
+        (matches, _, _), new_ms = timed(lambda: tracker._associate(detections), args.runs)
+        same = len(set(legacy) & set(matches)) / max(len(legacy), 1)
+        print(f"{n:>8}{len(detections):>8}{legacy_ms:>14.2f}{new_ms:>12.2f}"
+              f"{legacy_ms / new_ms:>10.1f}{same:>15.1%}")
+    print("=" * 72)
+    print("Mismos pares: fraccion de los pares del greedy que la asignacion hungara conserva")
+
+
+if __name__ == "__main__":
+    main()
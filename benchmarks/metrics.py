@@ -0,0 +1,132 @@
+"""
+Metricas compartidas por los benchmarks: IoU, concordancia entre modelos y mAP50.
+
+Las detecciones son objetos con atributos xyxy (N, 4), confidence (N,) y
+class_ids (N,) como src.inference.DetectionArrays.
+"""
+import os
+
+import numpy as np
+
+
+def box_iou(a, b):
+    """IoU entre dos conjuntos de cajas (N, 4) y (M, 4)."""
+    tl = np.maximum(a[:, None, :2], b[None, :, :2])
+    br = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.prod((br - tl).clip(0), axis=2)
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def agreement(reference, candidate, iou_threshold=0.5):
+    """F1 de las cajas de candidate usando reference como verdad (misma clase)."""
+    if len(reference) == 0 and len(candidate) == 0:
+        return 1.0
+    if len(reference) == 0 or len(candidate) == 0:
+        return 0.0
+    iou = box_iou(reference.xyxy, candidate.xyxy)
+    iou[reference.class_ids[:, None] != candidate.class_ids[None, :]] = 0
+    matched = 0
+    used = set()
+    for r in np.argsort(-reference.confidence):
+        c = int(np.argmax(iou[r]))
+        if iou[r, c] >= iou_threshold and c not in used:
+            used.add(c)
+            iou[:, c] = 0
+            matched += 1
+    return 2.0 * matched / (len(reference) + len(candidate))
+
+
+def load_yolo_labels(image_path, image_shape):
+    """
+    Lee las etiquetas YOLO de una imagen (dataset/images/x.jpg -> dataset/labels/x.txt).
+
+    Returns:
+        tuple or None: (xyxy (N, 4), class_ids (N,)) en pixeles, o None si no hay etiquetas
+    """
+    folder, filename = os.path.split(image_path)
+    label_dir = os.path.join(os.path.dirname(folder), 'labels')
+    label_path = os.path.join(label_dir, os.path.splitext(filename)[0] + '.txt')
+    if not os.path.exists(label_path):
+        return None
+
+    h, w = image_shape[:2]
+    rows = [line.split() for line in open(label_path) if len(line.split()) == 5]
+    if not rows:
+        return np.zeros((0, 4), dtype=np.float32), np.zeros((0,), dtype=np.int64)
+    data = np.array(rows, dtype=np.float32)
+    cx, cy, bw, bh = data[:, 1] * w, data[:, 2] * h, data[:, 3] * w, data[:, 4] * h
+    xyxy = np.stack([cx - bw / 2, cy - bh / 2, cx + bw / 2, cy + bh / 2], axis=1)
+    return xyxy, data[:, 0].astype(np.int64)
+
+
+def map50(predictions, ground_truths):
+    """
+    mAP a IoU 0.5 (interpolacion de todos los puntos, promedio sobre clases).
+
+    Args:
+        predictions (list): Detecciones por imagen
+        ground_truths (list): (xyxy, class_ids) por imagen
+
+    Returns:
+        float: mAP50
+    """
+    classes = set()
+    for _, gt_classes in ground_truths:
+        classes.update(gt_classes.tolist())
+
+    aps = []
+    for cls in sorted(classes):
+        scores, hits = [], []
+        num_gt = 0
+        for pred, (gt_xyxy, gt_classes) in zip(predictions, ground_truths):
+            gt = gt_xyxy[gt_classes == cls]
+            num_gt += len(gt)
+            mask = pred.class_ids == cls
+            boxes, confs = pred.xyxy[mask], pred.confidence[mask]
+            order = np.argsort(-confs)
+            used = np.zeros(len(gt), dtype=bool)
+            iou = box_iou(boxes[order], gt) if len(gt) and len(boxes) else np.zeros((len(boxes), 0))
+            for row, idx in enumerate(order):
+                scores.append(confs[idx])
+                if iou.shape[1]:
+                    best = int(np.argmax(np.where(used, 0, iou[row])))
+                    if iou[row, best] >= 0.5 and not used[best]:
+                        used[best] = True
+                        hits.append(1)
+                        continue
+                hits.append(0)
+        if num_gt == 0:
+            continue
+        order = np.argsort(-np.array(scores))
+        tp = np.cumsum(np.array(hits)[order]) if hits else np.zeros(0)
+        recall = tp / num_gt
+        precision = tp / np.arange(1, len(tp) + 1)
+        # Envolvente de precision y area bajo la curva
+        mrec = np.concatenate([[0.0], recall, [1.0]])
+        mpre = np.concatenate([[1.0], precision, [0.0]])
+        mpre = np.flip(np.maximum.accumulate(np.flip(mpre)))
+        idx = np.where(mrec[1:] != mrec[:-1])[0]
+        aps.append(float(np.sum((mrec[idx + 1] - mrec[idx]) * mpre[idx + 1])))
+
+    return float(np.mean(aps)) if aps else 0.0
+
+
+def recall50(predictions, ground_truths):
+    """
+    Fraccion de cajas etiquetadas encontradas con IoU >= 0.5 (sin importar la clase).
+
+    Args:
+        predictions (list): Detecciones por imagen
+        ground_truths (list): (xyxy, class_ids) por imagen
+
+    Returns:
+        float: Recall
+    """
+    found, total = 0, 0
+    for pred, (gt_xyxy, _) in zip(predictions, ground_truths):
+        total += len(gt_xyxy)
+        if len(gt_xyxy) and len(pred):
+            found += int((box_iou(gt_xyxy, pred.xyxy.astype(np.float32)).max(axis=1) >= 0.5).sum())
+    return found / total if total else 0.0
@@ -117,6 +117,304 @@ REDUCE_DB_LOGGING = True
 REDETECTION_INTERVAL_CAMERA = 15  # Camara: cada 1 segundo a 30fps
 REDETECTION_INTERVAL_VIDEO = 5    # Video: cada 5 frames para precision
 
+# Ejecutar CarDetector solo 1 de cada N frames (video y camara)
+# En los frames intermedios el tracker predice las cajas con su filtro de Kalman,
+# asi las cajas y los cruces de linea siguen a frame rate completo.
+# TRACKING_MAX_AGE y MAX_FRAMES_WITHOUT_DETECTION cuentan ejecuciones del detector.
+# 1 = detectar en todos los frames (comportamiento original)
+DETECTION_FRAME_INTERVAL = 1
+
 # Frames maximos sin deteccion antes de ocultar bbox
 # OPTIMIZADO: Evita que bbox persistan cuando vehiculo sale del cuadro
-MAX_FRAMES_WITHOUT_DETECTION = 3  # Ocultar si no detectado en ultimos 3 frames
\ No newline at end of file
+MAX_FRAMES_WITHOUT_DETECTION = 3  # Ocultar si no detectado en ultimos 3 frames
+
+# Frames de video que se detectan juntos en una sola llamada a YOLO (modo video)
+# En CPU un batch mayor reparte el overhead fijo de torch entre varios frames.
+# Ver benchmarks/bench_batch_detection.py para elegir el valor en cada equipo
+VIDEO_DETECTION_BATCH_SIZE = 4
+
+
+# ==================== REGION DE INTERES ====================
+# Region del frame donde corre el detector de vehiculos (modo video/camara)
+# El EventDetector solo usa la banda alrededor de EVENT_LINE_POSITION, asi que
+# recortar el frame a esa zona reduce el costo de YOLO en proporcion al area.
+#
+# None: frame completo
+# Rectangulo: (x1, y1, x2, y2) en pixeles; x2/y2 = None llega al borde del frame
+#   Ej. banda de la linea: (0, 80, None, 380)
+# Poligono: [(x, y), (x, y), ...] - se recorta a su rectangulo contenedor y
+#   se rellena con gris lo que queda fuera del poligono
+DETECTION_ROI = None
+
+
+# ==================== MOTION GATE ====================
+# Salta YOLO, tracking y dibujo en frames estaticos (ej. entrada vacia de noche)
+# Solo salta cuando no hay movimiento Y no hay tracks activos
+
+# Activar compuerta de movimiento (desactivada por defecto: cambia el
+# comportamiento del analisis de video; activar en camaras fijas)
+MOTION_GATE_ENABLED = False
+
+# Metodo: 'diff' (diferencia con frame anterior) o 'mog2' (sustractor de fondo)
+MOTION_GATE_METHOD = 'diff'
+
+# Ancho del frame reducido usado para el analisis (pixeles)
+MOTION_GATE_SCALE_WIDTH = 160
+
+# Diferencia minima de nivel de gris para considerar un pixel en movimiento
+MOTION_GATE_PIXEL_THRESHOLD = 25
+
+# Fraccion minima de pixeles en movimiento para despertar el detector
+MOTION_GATE_MIN_RATIO = 0.002  # 0.2% del frame reducido
+
+# Forzar una deteccion cada N frames saltados (vehiculos que aparecen quietos)
+MOTION_GATE_MAX_SKIP_FRAMES = 30
+
+
+# ==================== INFERENCIA ====================
+# Backend de los tres modelos YOLO (autos, placas, logos)
+# 'ultralytics': PyTorch en modo eager (default)
+# 'onnx': onnxruntime en CPU. El .onnx se exporta una sola vez y se cachea
+#         junto al .pt en /models (se reexporta si el .pt cambia)
+INFERENCE_BACKEND = 'ultralytics'
+
+# Hilos intra-op de onnxruntime (0 = automatico, todos los nucleos)
+ONNX_NUM_THREADS = 0
+
+# Modelos cuantizados a INT8 (models/<modelo>.int8.onnx, ver tools/quantize_models.py)
+# Activar por modelo solo si el reporte de precision lo marca como seguro
+QUANTIZED_MODELS = {
+    'car_detector': False,
+    'plate_detector': False,
+    'brand_detector': False,
+}
+
+
+# ==================== MODO DE DETECCION ====================
+# Como corre CarDetector sobre cada frame
+# 'standard': frame completo reducido al tamano de entrada de YOLO
+# 'tiled': mosaico de tiles solapados en un solo batch + NMS entre tiles.
+#          Recupera autos lejanos en frames 4K/gran angular, a costa de
+#          ~N tiles de inferencia (ver benchmarks/bench_tiling.py)
+# 'cascade': pasada gruesa a baja resolucion + pasada fina solo en regiones dudosas
+CAR_DETECTION_MODE = 'standard'
+
+# Lado de cada tile en pixeles del frame (se infiere sin reescalar)
+CAR_TILE_SIZE = 640
+
+# Solape entre tiles vecinos (fraccion del tile). Un auto mas chico que el
+# solape aparece completo en al menos un tile
+CAR_TILE_OVERLAP = 0.2
+
+# Pasada adicional al frame completo para autos grandes que no caben en un tile
+CAR_TILE_FULL_FRAME = True
+
+# IoU para fusionar cajas repetidas entre tiles (y entre pasadas de la cascada)
+CAR_TILE_NMS_IOU = 0.5
+
+# --- Ajuste automatico de imgsz (modo 'standard') ---
+# Mide la latencia real del detector en una ventana movil y sube/baja el
+# tamano de entrada en pasos de 32 para cumplir el presupuesto por frame.
+# Util en equipos con CPU muy distinta (evita ajustar cada uno a mano).
+# Con INFERENCE_BACKEND = 'onnx' requiere el ONNX dinamico (no el INT8 fijo)
+CAR_AUTOTUNE_ENABLED = False
+
+# Latencia objetivo de deteccion por frame (ms)
+CAR_AUTOTUNE_BUDGET_MS = 40.0
+
+# Tamano de entrada inicial y limites
+CAR_AUTOTUNE_INITIAL_IMGSZ = 640
+CAR_AUTOTUNE_MIN_IMGSZ = 256
+CAR_AUTOTUNE_MAX_IMGSZ = 1280
+
+# Frames medidos antes de cada decision
+CAR_AUTOTUNE_WINDOW = 30
+
+# --- Modo 'cascade' (coarse-to-fine) ---
+# Pasada gruesa a baja resolucion sobre el frame completo; solo las cajas
+# dudosas o pequenas se recortan y se vuelven a detectar a resolucion completa.
+# Con autos grandes y claros cerca de la entrada casi nunca hay segunda pasada
+# (ver benchmarks/bench_cascade.py)
+
+# Tamano de entrada de la pasada gruesa y de la pasada fina
+CAR_CASCADE_COARSE_IMGSZ = 320
+CAR_CASCADE_FINE_IMGSZ = 640
+
+# Confianza minima de la pasada gruesa (debajo de CAR_MIN_CONFIDENCE para no
+# perder autos que la pasada fina confirma)
+CAR_CASCADE_MIN_CONFIDENCE = 0.15
+
+# Cajas gruesas con esta confianza (y no pequenas) se aceptan sin refinar
+CAR_CASCADE_ACCEPT_CONFIDENCE = 0.6
+
+# Cajas menores a esta fraccion del frame se refinan siempre
+CAR_CASCADE_SMALL_RATIO = 0.01  # 1% del frame
+
+# Lado minimo (pixeles del frame) de cada region refinada
+CAR_CASCADE_REGION_SIZE = 320
+
+# Con mas regiones dudosas que esto se repite el frame completo a resolucion fina
+CAR_CASCADE_MAX_REGIONS = 6
+
+
+# ==================== OCR DE PLACAS ====================
+# Cascada de OCR: las 4 tecnicas (otsu, adaptive, adaptive_inv, enhanced) se
+# prueban en orden de tasa de victorias historica y se corta al primer
+# resultado que pasa validate_plate_text con confianza suficiente.
+# False = correr siempre las 4 tecnicas (comportamiento original)
+OCR_EARLY_EXIT_ENABLED = True
+
+# Confianza minima de EasyOCR para cortar la cascada
+OCR_EARLY_EXIT_CONFIDENCE = 0.6
+
+
+# ==================== BATCH DE RECORTES ====================
+# Los detectores de placas y logos corren una vez por batch de recortes de
+# vehiculos del frame (en vez de una vez por vehiculo).
+# Recortes por llamada al modelo
+CROP_BATCH_SIZE = 8
+
+# Lado del cuadrado al que se lleva cada recorte con letterbox (multiplo de 32)
+CROP_BATCH_IMGSZ = 640
+
+# Lado de entrada segun el tamano del recorte, por detector. Cada recorte usa
+# el menor tamano >= su lado mayor x CROP_IMGSZ_UPSCALE (el mayor si ninguno
+# alcanza): un auto lejano de 200px va a 320 en vez de inflarse a 640.
+# None (o sin entrada para un detector) = siempre CROP_BATCH_IMGSZ (default).
+# Para activarlo, correr primero benchmarks/bench_crop_imgsz.py y usar solo
+# tamanos cuyo recall contra 640 se mantenga en todos los tamanos de recorte:
+# CROP_IMGSZ_SIZES = {
+#     'plate_detector': (320, 640),
+#     'brand_detector': (320, 640),
+# }
+CROP_IMGSZ_SIZES = None
+
+# Factor sobre el lado mayor del recorte al elegir el tamano (>1 = mas margen
+# para placas chicas a cambio de velocidad)
+CROP_IMGSZ_UPSCALE = 1.0
+
+
+# ==================== DETECCION DE PLACAS ====================
+# 'per_vehicle': plate_detector sobre el recorte de cada vehiculo (default)
+# 'full_frame': plate_detector una sola vez sobre el frame (o DETECTION_ROI) y
+#               cada placa se asigna al vehiculo que la contiene. Con muchos
+#               vehiculos en escena pasa de N llamadas por frame a una.
+#               Placas fuera de la ROI no se detectan en este modo.
+PLATE_DETECTION_MODE = 'per_vehicle'
+
+# Tamano de entrada para la pasada al frame completo (placas chicas necesitan
+# mas resolucion que un recorte; ver benchmarks/bench_plate_full_frame.py)
+PLATE_FULL_FRAME_IMGSZ = 1280
+
+
+# ==================== CONSENSO DE PLACA ====================
+# Cada track acumula sus lecturas OCR y vota caracter por caracter
+# (ponderado por confianza). La placa del track sigue al consenso hasta que
+# el vehiculo genera un evento de entrada/salida.
+PLATE_CONSENSUS_ENABLED = True
+
+# Lecturas seguidas con el mismo consenso para congelar la placa del track.
+# Un track congelado sigue re-detectando el bbox de placa/logo pero sin OCR
+PLATE_CONSENSUS_STABLE_READS = 3
+
+
+# ==================== CACHE DE OCR ====================
+# Cache LRU de resultados de OCR indexada por un hash perceptual (dHash) del
+# recorte de la placa. Un vehiculo quieto o en cola produce recortes casi
+# identicos frame a frame; con la cache se lee una sola vez.
+OCR_CACHE_ENABLED = True
+
+# Entradas maximas (se descarta la menos usada)
+OCR_CACHE_SIZE = 256
+
+# (ancho, alto) del dHash en bits. Apaisado como la placa
+OCR_CACHE_HASH_SIZE = (32, 8)
+
+# Distancia de Hamming maxima para reusar un resultado. Un caracter distinto
+# cambia ~10 bits; el ruido de camara 1-3. Subirlo arriesga confundir placas
+OCR_CACHE_MAX_DISTANCE = 5
+
+
+# ==================== CALIDAD DE RECORTE DE PLACA ====================
+# Cada recorte de placa recibe un puntaje barato (nitidez por varianza del
+# Laplaciano, tamano en pixeles y contraste). En un track ya leido el OCR solo
+# corre si el recorte supera al mejor leido por el margen: se descartan los
+# frames movidos o lejanos y se relee cuando el vehiculo se acerca.
+PLATE_QUALITY_ENABLED = True
+
+# Mejora relativa minima sobre el mejor recorte leido del track (0.15 = 15%)
+PLATE_QUALITY_MARGIN = 0.15
+
+# Mejores recortes leidos que se conservan por track
+PLATE_QUALITY_BUFFER_SIZE = 3
+
+# Tope del umbral de calidad para releer (el puntaje maximo es 1.0; sin tope
+# un recorte perfecto dejaria al track sin volver a leerse)
+PLATE_QUALITY_MAX_THRESHOLD = 0.95
+
+
+# ==================== HILOS ====================
+# Pool de hilos para el trabajo por vehiculo fuera de los modelos: calidad y
+# hash de la placa, mejora y binarizacion para OCR, color. OpenCV libera el
+# GIL, asi que en imagenes con muchos vehiculos se reparte entre nucleos.
+# Los resultados conservan el orden de los vehiculos.
+# None = automatico (min(4, nucleos - 1)); 1 = todo en serie
+WORKER_THREADS = None
+
+# Hilos intra-op de torch. None = automatico con pool: nucleos - WORKER_THREADS,
+# sin bajar de la mitad de los nucleos (el pool casi no se solapa con la
+# inferencia, asi que quitarle mas a torch la haria mas lenta)
+TORCH_NUM_THREADS = None
+
+# True: calcular las 4 tecnicas de binarizacion de cada placa como tareas
+# separadas del pool apenas se mejora la placa, en vez de una por ronda de la
+# cascada. Una sola placa usa hasta 4 hilos; a cambio se preprocesan tecnicas
+# que la salida temprana quizas no use (el OCR sigue cortando igual)
+OCR_PARALLEL_TECHNIQUES = False
+
+
+# ==================== CARGA DE MODELOS ====================
+# True: el pipeline carga primero el detector de vehiculos (la camara y el
+# tracking arrancan de inmediato) y el OCR y el clasificador de marcas cargan
+# y se calientan en paralelo en background. Imagenes y videos esperan a que
+# esten listos; la camara registra los vehiculos cuando terminan.
+# False: el constructor espera a todos los modelos (cargan igual en paralelo)
+MODEL_BACKGROUND_LOADING = True
+
+# Los modelos (YOLO por ruta + backend, EasyOCR por idiomas) se cargan una vez
+# por proceso y se comparten entre pipelines (una por camara o por analisis).
+# True: al cargar cada modelo se corre una inferencia sobre una imagen vacia
+# para que el primer frame real no pague la inicializacion
+MODEL_WARMUP_ENABLED = True
+
+
+# ==================== COLOR ====================
+# 'lut': cada pixel del ROI central se etiqueta con una tabla BGR -> color
+#        precalculada y gana la etiqueta mas frecuente (default)
+# 'kmeans': K-Means (K=3) por vehiculo y se nombra el cluster dominante
+# Ver benchmarks/bench_color_lut.py (tiempo y concordancia entre ambos)
+COLOR_METHOD = 'lut'
+
+# Niveles por canal de la tabla (divisor de 256; 32 = 32x32x32 celdas)
+COLOR_LUT_BINS = 32
+
+
+# ==================== ATRIBUTOS POR TRACK ====================
+# En la re-deteccion cada atributo se recalcula por separado: placa (bbox +
+# OCR), marca (logo + bbox) y color. Faltantes se reintentan cada frame y el
+# resto cada REDETECTION_INTERVAL_*. Marca y color se votan entre lecturas.
+# Lecturas seguidas iguales para congelar marca o color (el color congelado
+# ya no se recalcula)
+ATTRIBUTE_FREEZE_AGREEMENTS = 3
+
+# Placa confirmada o marca congelada: su bbox se refresca cada
+# REDETECTION_INTERVAL_* x este factor
+ATTRIBUTE_FROZEN_REFRESH_FACTOR = 4
+
+
+# ==================== CACHE DE RECORTES POR FRAME ====================
+# Las vistas derivadas del recorte de cada track (letterbox para los detectores
+# de placas y logos, ROI de color 60x60, HSV reducido del fallback) se calculan
+# una sola vez por frame y las comparten todas las etapas de reconocimiento.
+# Con el mismo imgsz, placas y logos usan el mismo letterbox.
+CROP_CACHE_ENABLED = True
@@ -255,8 +255,11 @@ class VehicleDetectorApp:
                 mode='video'
             )
             
+            # El detector de vehiculos ya esta listo (camara disponible);
+            # OCR y marcas siguen cargando en background. El sondeo toca widgets:
+            # se agenda en el loop de Tk (este metodo corre en un hilo aparte)
             print("[APP-INIT] Pipeline cargado exitosamente\n")
-            self.status_label.configure(text="Modelos cargados. Listo para usar.")
+            self.root.after(0, self._poll_model_status)
             
         except Exception as e:
             error_msg = traceback.format_exc()
@@ -265,6 +268,26 @@ class VehicleDetectorApp:
             messagebox.showerror("Error de Carga", 
                                f"Error al cargar modelos:\n{str(e)}\n\nRevisa la consola para mas detalles.")
     
+    def _poll_model_status(self):
+        """
+        Refleja en la barra de estado la carga en background de OCR y marcas.
+        Se re-agenda cada 500ms hasta que todos los modelos terminan.
+        """
+        status = self.pipeline.get_model_status()
+        pending = [name for name, state in status.items() if state in ('pending', 'loading')]
+        failed = [name for name, state in status.items() if state == 'error']
+        
+        if failed:
+            self.status_label.configure(text=f"Error cargando {', '.join(failed)}: Ver consola")
+            messagebox.showerror("Error de Carga",
+                               f"Error al cargar modelos: {', '.join(failed)}\n\nRevisa la consola para mas detalles.")
+        elif pending:
+            self.status_label.configure(text=f"Camara lista. Cargando {', '.join(pending)}...")
+            self.root.after(500, self._poll_model_status)
+        else:
+            print("[APP-INIT] Todos los modelos listos\n")
+            self.status_label.configure(text="Modelos cargados. Listo para usar.")
+    
     def _create_widgets(self):
         """
         Crea los widgets de la interfaz grafica.
@@ -671,6 +694,21 @@ class VehicleDetectorApp:
                 daemon=True
             ).start()
     
+    def _process_video_frame_safe(self, frame):
+        """
+        Procesa un frame suelto (fallback del batch) con la foto de stats de ese frame.
+        
+        Returns:
+            dict or None: Resultado de process_video_frame con 'video_stats', None si fallo
+        """
+        try:
+            result = self.pipeline.process_video_frame(frame)
+            result['video_stats'] = self.pipeline.get_video_stats()
+            return result
+        except Exception as e:
+            print(f"[APP-ERROR] Error procesando frame: {str(e)}")
+            return None
+    
     def _process_video(self, video_path):
         """Procesa un video frame por frame."""
         print(f"\n[APP-VIDEO] Abriendo video: {video_path}")
@@ -688,6 +726,10 @@ class VehicleDetectorApp:
             
             print(f"[APP-VIDEO] Video abierto - Total frames: {total_frames}, FPS: {fps}")
             
+            if not self.pipeline.models_ready:
+                self.status_label.configure(text="Esperando modelos de OCR y marcas...")
+                self.pipeline.wait_until_ready()
+            
             self.status_label.configure(text="Procesando video...")
             self.video_fps = fps
             
@@ -699,52 +741,73 @@ class VehicleDetectorApp:
             self.progress.set(0)
             self.progress_label.configure(text="0%")
 
-            print("[APP-VIDEO] Iniciando procesamiento frame por frame...\n")
-            
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
+            # Frames decodificados que se detectan juntos en un solo batch
+            batch_size = max(1, getattr(config, 'VIDEO_DETECTION_BATCH_SIZE', 1))
+            print(f"[APP-VIDEO] Iniciando procesamiento (batch de deteccion: {batch_size} frames)...\n")
+            
+            video_ended = False
+            while cap.isOpened() and not video_ended:
+                # Acumular hasta batch_size frames decodificados
+                frames = []
+                while len(frames) < batch_size:
+                    ret, frame = cap.read()
+                    if not ret:
+                        video_ended = True
+                        break
+                    frames.append(frame)
+                
+                if not frames:
                     break
                 
-                frame_idx += 1
+                results = [None] * len(frames)
+                if self.pipeline:
+                    try:
+                        results = self.pipeline.process_video_batch(frames)
+                    except Exception as e:
+                        # Fallo del batch completo: procesar frame por frame (cada
+                        # frame con su propio manejo de errores)
+                        print(f"[APP-ERROR] Error procesando batch de frames: {str(e)}, frame por frame")
+                        results = [self._process_video_frame_safe(frame) for frame in frames]
                 
-                try:
-                    if self.pipeline:
-                        result = self.pipeline.process_video_frame(frame)
-                        annotated = result['annotated_image']
-                        detections = result['detections']
-                        
-                        # Guardar detecciones de este frame para highlight
-                        self.detections_per_frame.append(detections)
+                for frame, result in zip(frames, results):
+                    frame_idx += 1
+                    
+                    try:
+                        if result is not None:
+                            annotated = result['annotated_image']
+                            detections = result['detections']
+                            
+                            # Guardar detecciones de este frame para highlight
+                            self.detections_per_frame.append(detections)
+                            
+                            # Acumular informacion de vehiculos unicos
+                            self._accumulate_vehicle_info(detections, frame_idx, fps)
+                            
+                            # Guardar stats de este frame (foto tomada al procesarlo,
+                            # no al final del batch)
+                            self.video_stats_history.append(result['video_stats'])
+                        else:
+                            annotated = frame
+                            self.detections_per_frame.append([])
+                            self.video_stats_history.append({
+                                'inside': 0, 'entries': 0, 'exits': 0, 
+                                'last_entry': None, 'last_exit': None
+                            })
                         
-                        # Acumular informacion de vehiculos unicos
-                        self._accumulate_vehicle_info(detections, frame_idx, fps)
+                        annotated_frames.append(annotated)
                         
-                        # Guardar stats de este frame
-                        current_stats = self.pipeline.get_video_stats().copy()
-                        self.video_stats_history.append(current_stats)
-                    else:
-                        annotated = frame
+                    except Exception as e:
+                        print(f"[APP-ERROR] Error procesando frame {frame_idx}: {str(e)}")
+                        annotated_frames.append(frame.copy())
                         self.detections_per_frame.append([])
                         self.video_stats_history.append({
-                            'inside': 0, 'entries': 0, 'exits': 0, 
+                            'inside': 0, 'entries': 0, 'exits': 0,
                             'last_entry': None, 'last_exit': None
                         })
-                    
-                    annotated_frames.append(annotated)
-                    
-                except Exception as e:
-                    print(f"[APP-ERROR] Error procesando frame {frame_idx}: {str(e)}")
-                    annotated_frames.append(frame.copy())
-                    self.detections_per_frame.append([])
-                    self.video_stats_history.append({
-                        'inside': 0, 'entries': 0, 'exits': 0,
-                        'last_entry': None, 'last_exit': None
-                    })
 
                 # Actualizar progreso
                 if total_frames:
-                    progress = frame_idx / total_frames
+                    progress = min(frame_idx / total_frames, 1.0)
                     self.progress.set(progress)
                     self.progress_label.configure(text=f"{progress*100:5.1f}%")
 
@@ -754,6 +817,38 @@ class VehicleDetectorApp:
             
             print(f"\n[APP-VIDEO] Procesamiento completado - {frame_idx} frames")
             print(f"[APP-VIDEO] Vehiculos unicos: {len(self.video_vehicles_summary)}")
+            if self.pipeline:
+                perf_stats = self.pipeline.get_performance_stats()
+                gate_stats = perf_stats['motion_gate']
+                if gate_stats:
+                    print(f"[APP-VIDEO] Frames saltados por compuerta de movimiento: "
+                          f"{gate_stats['frames_skipped']}/{gate_stats['frames_checked']} ({gate_stats['skip_ratio']:.1%})")
+                size_stats = perf_stats['input_size']
+                if size_stats and size_stats['latency_ms'] is not None:
+                    print(f"[APP-VIDEO] imgsz del detector: {size_stats['imgsz']} "
+                          f"({size_stats['latency_ms']:.1f}ms/frame, presupuesto {size_stats['budget_ms']:.0f}ms)")
+                ocr_stats = perf_stats['ocr']
+                if ocr_stats['plates']:
+                    print(f"[APP-VIDEO] OCR: {ocr_stats['avg_passes']:.2f} pasadas por placa, "
+                          f"orden de tecnicas: {ocr_stats['order']}")
+                cache_stats = ocr_stats['cache']
+                if cache_stats and cache_stats['hits'] + cache_stats['misses']:
+                    print(f"[APP-VIDEO] Cache OCR: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                          f"({cache_stats['hit_ratio']:.1%})")
+                attribute_stats = perf_stats['attributes']
+                print(f"[APP-VIDEO] Atributos recalculados: {attribute_stats['runs']}, "
+                      f"congelados: {attribute_stats['frozen']}")
+                crop_stats = perf_stats['crop_cache']
+                if crop_stats and crop_stats['hits'] + crop_stats['misses']:
+                    print(f"[APP-VIDEO] Vistas de recortes reutilizadas: {crop_stats['hits']}/"
+                          f"{crop_stats['hits'] + crop_stats['misses']} ({crop_stats['hit_ratio']:.1%})")
+                    for view_name, view_stats in crop_stats['by_view'].items():
+                        print(f"[APP-VIDEO]   {view_name}: {view_stats['hits']}/"
+                              f"{view_stats['hits'] + view_stats['misses']} ({view_stats['hit_ratio']:.1%})")
+                quality_stats = perf_stats['plate_quality']
+                if quality_stats['ocr_skipped']:
+                    print(f"[APP-VIDEO] Calidad de placa: {quality_stats['ocr_skipped']} OCR evitados "
+                          f"(recorte sin mejora)")
             
             # Guardar frames procesados
             self.processed_frames = annotated_frames
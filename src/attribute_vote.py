@@ -0,0 +1,67 @@
+from collections import Counter
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+class AttributeVote:
+    def __init__(self, freeze_after=3, unknown=None):
+        """
+        Votacion de un atributo de un track (marca o color) entre re-detecciones.
+
+        El valor del track es el mas votado (un valor conocido siempre le gana
+        a `unknown`). Cuando el mismo valor sale `freeze_after` veces seguidas
+        el atributo queda congelado y ya no hace falta recalcularlo. Un
+        atributo congelado como `unknown` (ej. vehiculo sin logo visible) se
+        descongela si aparece un valor conocido.
+
+        Args:
+            freeze_after (int): Lecturas seguidas iguales para congelar
+            unknown (str): Valor que indica 'no se pudo determinar'
+        """
+        self.freeze_after = max(1, int(freeze_after))
+        self.unknown = unknown
+        self._counts = Counter()
+        self._last = None
+        self.streak = 0
+        self.value = None
+        self.frozen = False
+
+    @classmethod
+    def from_config(cls, unknown=None):
+        """Crea la votacion desde config.py (ATTRIBUTE_FREEZE_AGREEMENTS)."""
+        return cls(freeze_after=getattr(config, 'ATTRIBUTE_FREEZE_AGREEMENTS', 3), unknown=unknown)
+
+    def add(self, value):
+        """
+        Agrega una lectura del atributo.
+
+        Args:
+            value (str): Valor leido
+
+        Returns:
+            str: Valor actual del atributo
+        """
+        if self.frozen:
+            if self.value != self.unknown or value == self.unknown:
+                return self.value
+            # Congelado como desconocido y aparecio un valor real: votar de nuevo
+            self.frozen = False
+
+        self._counts[value] += 1
+        self.streak = self.streak + 1 if value == self._last else 1
+        self._last = value
+
+        known = {v: n for v, n in self._counts.items() if v != self.unknown}
+        self.value = max(known, key=known.get) if known else self.unknown
+
+        if self.streak >= self.freeze_after and value == self.value:
+            self.frozen = True
+        return self.value
+
+    def freeze(self, value):
+        """Fija el valor sin votar (ej. atributos recuperados de la BD)."""
+        self.value = value
+        self.frozen = True
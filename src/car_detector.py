@@ -1,6 +1,10 @@
 import os
-from ultralytics import YOLO
+import time
 import cv2
+import numpy as np
+from .inference import non_max_suppression
+from .model_registry import get_yolo_model
+from .input_size_tuner import InputSizeTuner
 
 try:
     import config
@@ -8,14 +12,88 @@ except ImportError:
     config = None
 
 
+class VehicleDetections:
+    """
+    Detecciones de vehiculos respaldadas por arrays numpy.
+    
+    Se comporta como la lista de diccionarios que devolvia detect_vehicles
+    (len, indice, iteracion), pero los dicts solo se construyen cuando un
+    consumidor los pide. Las etapas vectorizadas pueden leer los arrays directo.
+    
+    Attributes:
+        xyxy (np.ndarray): (N, 4) int32 con [x1, y1, x2, y2] en pixeles
+        confidence (np.ndarray): (N,) float32 con la confianza de cada caja
+        class_ids (np.ndarray): (N,) int64 con el id de clase del modelo
+        names (dict): id de clase -> nombre
+    """
+    
+    def __init__(self, xyxy, confidence, class_ids, names):
+        self.xyxy = xyxy
+        self.confidence = confidence
+        self.class_ids = class_ids
+        self.names = names
+    
+    @classmethod
+    def empty(cls, names=None):
+        """Crea un conjunto de detecciones vacio."""
+        return cls(
+            np.zeros((0, 4), dtype=np.int32),
+            np.zeros((0,), dtype=np.float32),
+            np.zeros((0,), dtype=np.int64),
+            names or {}
+        )
+    
+    def __len__(self):
+        return len(self.confidence)
+    
+    def __getitem__(self, idx):
+        x1, y1, x2, y2 = self.xyxy[idx]
+        return {
+            'bbox': [int(x1), int(y1), int(x2), int(y2)],
+            'confidence': float(self.confidence[idx]),
+            'class': self.names.get(int(self.class_ids[idx]), str(int(self.class_ids[idx])))
+        }
+    
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+    
+    def to_list(self):
+        """
+        Convierte las detecciones al formato clasico de lista de diccionarios.
+        
+        Returns:
+            list: [{'bbox': [x1, y1, x2, y2], 'confidence': float, 'class': str}, ...]
+        """
+        return list(self)
+    
+    def shifted(self, dx, dy):
+        """
+        Desplaza todas las cajas (ej. de coordenadas de un recorte al frame completo).
+        
+        Args:
+            dx (int): Desplazamiento horizontal en pixeles
+            dy (int): Desplazamiento vertical en pixeles
+            
+        Returns:
+            VehicleDetections: Nuevas detecciones con las cajas desplazadas
+        """
+        offset = np.array([dx, dy, dx, dy], dtype=np.int32)
+        return VehicleDetections(self.xyxy + offset, self.confidence, self.class_ids, self.names)
+
+
+DETECTION_MODES = ('standard', 'tiled', 'cascade')
+
+
 class CarDetector:
-    def __init__(self, model_path=None, min_confidence=0.4):
+    def __init__(self, model_path=None, min_confidence=0.4, backend=None):
         """
         Inicializa el detector de vehiculos usando YOLOv8.
         
         Args:
             model_path (str): Ruta al modelo YOLO. Si es None, usa car_detector.pt de /models
             min_confidence (float): Confianza minima para aceptar detecciones (0.0-1.0)
+            backend (str): 'ultralytics' o 'onnx'. Si es None, usa config.INFERENCE_BACKEND
         """
         if model_path is None:
             project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -31,8 +109,8 @@ class CarDetector:
         
         print(f"[DEBUG] Modelo encontrado. Tamano: {os.path.getsize(model_path) / (1024*1024):.2f} MB")
         print(f"[DEBUG] Cargando modelo YOLO: {model_path}")
-        self.model = YOLO(model_path)
-        print(f"[DEBUG] Modelo YOLO cargado. Clases: {self.model.names}")
+        self.model = get_yolo_model(model_path, backend)
+        print(f"[DEBUG] Modelo YOLO cargado ({self.model.name}). Clases: {self.model.names}")
         
         # Configuracion
         self.min_confidence = min_confidence
@@ -41,12 +119,56 @@ class CarDetector:
         # Clases de vehiculos en COCO dataset
         self.vehicle_classes = [2, 3, 5, 7]  # car, motorcycle, bus, truck
         
+        # El filtro de clases solo aplica si el modelo usa ids COCO (ej. yolov8n.pt).
+        # Los modelos propios (car_detector.pt) solo tienen clases de vehiculos.
+        self.allowed_class_ids = self._resolve_vehicle_classes(self.model.names)
+        if self.allowed_class_ids is not None:
+            print(f"[DEBUG] Filtro de clases COCO activo: {self.allowed_class_ids.tolist()}")
+        
         # Filtros de tamano (porcentaje del frame) - desde config o defaults
         self.max_bbox_ratio = getattr(config, 'CAR_MAX_BBOX_RATIO', 0.70)
         self.min_bbox_ratio = getattr(config, 'CAR_MIN_BBOX_RATIO', 0.001)
         print(f"[DEBUG] Filtro de tamano: min={self.min_bbox_ratio:.1%}, max={self.max_bbox_ratio:.0%} del frame")
         
-    def detect_vehicles(self, image):
+        # Modo de deteccion: 'standard' (frame completo) o 'tiled' (mosaico)
+        self.detection_mode = getattr(config, 'CAR_DETECTION_MODE', 'standard')
+        if self.detection_mode not in DETECTION_MODES:
+            raise ValueError(f"Modo de deteccion desconocido: {self.detection_mode} (opciones: {DETECTION_MODES})")
+        
+        # Mosaico para frames de alta resolucion
+        self.tile_size = getattr(config, 'CAR_TILE_SIZE', 640)
+        self.tile_overlap = getattr(config, 'CAR_TILE_OVERLAP', 0.2)
+        self.tile_full_frame = getattr(config, 'CAR_TILE_FULL_FRAME', True)
+        self.tile_nms_iou = getattr(config, 'CAR_TILE_NMS_IOU', 0.5)
+        # Costo de la ultima deteccion en mosaico: {'tiles', 'total_ms', 'ms_per_tile'}
+        self.last_tile_stats = None
+        if self.detection_mode == 'tiled':
+            print(f"[DEBUG] Deteccion en mosaico: tiles de {self.tile_size}px, solape {self.tile_overlap:.0%}, "
+                  f"pasada completa: {self.tile_full_frame}")
+        
+        # Ajuste automatico de imgsz por presupuesto de latencia (modo standard).
+        # Un modelo de entrada fija (INT8) no puede cambiar de tamano: sin tuner
+        self.input_tuner = InputSizeTuner.from_config()
+        fixed_imgsz = getattr(self.model, 'fixed_imgsz', None)
+        if self.input_tuner and fixed_imgsz is not None:
+            print(f"[DEBUG] CAR_AUTOTUNE_ENABLED sin efecto: el modelo tiene entrada fija de {fixed_imgsz}px")
+            self.input_tuner = None
+        
+        # Cascada: pasada gruesa a baja resolucion + refinamiento de regiones dudosas
+        self.cascade_coarse_imgsz = getattr(config, 'CAR_CASCADE_COARSE_IMGSZ', 320)
+        self.cascade_fine_imgsz = getattr(config, 'CAR_CASCADE_FINE_IMGSZ', 640)
+        self.cascade_min_confidence = getattr(config, 'CAR_CASCADE_MIN_CONFIDENCE', 0.15)
+        self.cascade_accept_confidence = getattr(config, 'CAR_CASCADE_ACCEPT_CONFIDENCE', 0.6)
+        self.cascade_small_ratio = getattr(config, 'CAR_CASCADE_SMALL_RATIO', 0.01)
+        self.cascade_region_size = getattr(config, 'CAR_CASCADE_REGION_SIZE', 320)
+        self.cascade_max_regions = getattr(config, 'CAR_CASCADE_MAX_REGIONS', 6)
+        # Resultado de la ultima cascada: {'coarse', 'accepted', 'regions', 'full_pass', 'total_ms'}
+        self.last_cascade_stats = None
+        if self.detection_mode == 'cascade':
+            print(f"[DEBUG] Deteccion en cascada: {self.cascade_coarse_imgsz}px -> {self.cascade_fine_imgsz}px, "
+                  f"banda dudosa [{self.cascade_min_confidence}, {self.cascade_accept_confidence})")
+        
+    def detect_vehicles(self, image, frame_shape=None):
         """
         Detecta vehiculos en una imagen.
         Solo retorna vehiculos con confianza >= min_confidence.
@@ -54,65 +176,349 @@ class CarDetector:
         
         Args:
             image: Imagen en formato numpy array (BGR)
+            frame_shape (tuple): Shape del frame completo cuando image es un recorte
+                                 (ROI). Los filtros de tamano se calculan sobre el
+                                 frame completo. Si es None se usa image.shape
             
         Returns:
-            list: Lista de diccionarios con informacion de cada vehiculo detectado
+            VehicleDetections: Detecciones indexables como lista de diccionarios
                   {'bbox': [x1, y1, x2, y2], 'confidence': float, 'class': str}
+                  (usar .to_list() para obtener la lista explicita)
+        """
+        return self.detect_vehicles_batch([image], frame_shape=frame_shape)[0]
+    
+    def detect_vehicles_batch(self, frames, frame_shape=None):
+        """
+        Detecta vehiculos en varios frames con una sola llamada al modelo.
+        Reparte el overhead fijo de cada inferencia (torch) entre todos los frames.
+        
+        Los frames se agrupan por tamano antes de inferir: asi el letterbox es el
+        mismo que en detect_vehicles y los resultados son identicos al camino de
+        un frame.
+        
+        Args:
+            frames (list): Lista de imagenes en formato numpy array (BGR)
+            frame_shape (tuple): Shape del frame completo si frames son recortes (ROI)
+            
+        Returns:
+            list: Una lista de detecciones por frame, en el mismo orden de entrada
+                  (mismo formato que detect_vehicles)
+        """
+        if not frames:
+            return []
+        
+        if self.detection_mode == 'tiled':
+            return [self.detect_vehicles_tiled(frame, frame_shape) for frame in frames]
+        if self.detection_mode == 'cascade':
+            return self.detect_vehicles_cascade(frames, frame_shape)
+        
+        # Agrupar indices por tamano de frame (en video todos comparten tamano)
+        groups = {}
+        for idx, frame in enumerate(frames):
+            groups.setdefault(frame.shape[:2], []).append(idx)
+        
+        imgsz = self.input_tuner.current_size if self.input_tuner else None
+        start = time.perf_counter()
+        
+        batch_detections = [None] * len(frames)
+        for indices in groups.values():
+            group_frames = [frames[i] for i in indices]
+            outputs = self.model.predict(group_frames, imgsz=imgsz)
+            for idx, output in zip(indices, outputs):
+                batch_detections[idx] = self._filter_boxes(
+                    output.xyxy, output.confidence, output.class_ids,
+                    frame_shape or frames[idx].shape, self.model.names
+                )
+        
+        if self.input_tuner:
+            self.input_tuner.record((time.perf_counter() - start) * 1000, len(frames))
+        
+        return batch_detections
+    
+    def detect_vehicles_tiled(self, image, frame_shape=None):
+        """
+        Detecta vehiculos dividiendo la imagen en tiles solapados.
+        Los vehiculos lejanos conservan su resolucion en vez de encogerse al
+        tamano de entrada de YOLO. Todos los tiles se infieren en un solo batch
+        y las cajas repetidas entre tiles se fusionan con NMS.
+        
+        Args:
+            image: Imagen en formato numpy array (BGR)
+            frame_shape (tuple): Shape del frame completo si image es un recorte (ROI)
+            
+        Returns:
+            VehicleDetections: Mismo formato que detect_vehicles
+        """
+        start = time.perf_counter()
+        img_h, img_w = image.shape[:2]
+        origins = self._tile_origins(img_w, img_h)
+        tile_w, tile_h = min(self.tile_size, img_w), min(self.tile_size, img_h)
+        
+        tiles = [image[y:y + tile_h, x:x + tile_w] for x, y in origins]
+        outputs = self.model.predict(tiles, imgsz=self.tile_size)
+        
+        # Con pasada completa, las cajas cortadas por un tile se descartan
+        full_pass = self.tile_full_frame and len(origins) > 1
+        
+        all_xyxy, all_conf, all_cls = [], [], []
+        for (x, y), output in zip(origins, outputs):
+            if len(output) == 0:
+                continue
+            keep = np.ones(len(output), dtype=bool)
+            if full_pass:
+                keep = ~self._touches_inner_edge(output.xyxy, x, y, tile_w, tile_h, img_w, img_h)
+            all_xyxy.append(output.xyxy[keep] + np.array([x, y, x, y], dtype=np.float32))
+            all_conf.append(output.confidence[keep])
+            all_cls.append(output.class_ids[keep])
+        
+        # Pasada al frame completo para vehiculos grandes que no caben en un tile
+        if full_pass:
+            output = self.model.predict([image])[0]
+            all_xyxy.append(output.xyxy)
+            all_conf.append(output.confidence)
+            all_cls.append(output.class_ids)
+        
+        if all_xyxy:
+            xyxy = np.concatenate(all_xyxy)
+            confidence = np.concatenate(all_conf)
+            class_ids = np.concatenate(all_cls)
+        else:
+            xyxy = np.zeros((0, 4), dtype=np.float32)
+            confidence = np.zeros((0,), dtype=np.float32)
+            class_ids = np.zeros((0,), dtype=np.int64)
+        
+        # NMS entre tiles: un vehiculo en la zona de solape aparece en varios tiles
+        keep = non_max_suppression(xyxy, confidence, self.tile_nms_iou, class_ids)
+        detections = self._filter_boxes(
+            xyxy[keep], confidence[keep], class_ids[keep],
+            frame_shape or image.shape, self.model.names
+        )
+        
+        total_ms = (time.perf_counter() - start) * 1000
+        self.last_tile_stats = {
+            'tiles': len(origins),
+            'total_ms': total_ms,
+            'ms_per_tile': total_ms / len(origins),
+        }
+        if getattr(config, 'DEBUG_VERBOSE', False):
+            print(f"[DEBUG] Mosaico: {len(origins)} tiles en {total_ms:.1f}ms "
+                  f"({self.last_tile_stats['ms_per_tile']:.1f}ms/tile), {len(detections)} vehiculos")
+        
+        return detections
+    
+    def detect_vehicles_cascade(self, frames, frame_shape=None):
+        """
+        Deteccion en dos pasadas (coarse-to-fine).
+        
+        1. Todos los frames a baja resolucion (CAR_CASCADE_COARSE_IMGSZ) en un batch.
+           Las cajas grandes con confianza >= CAR_CASCADE_ACCEPT_CONFIDENCE se aceptan.
+        2. Las cajas dudosas (confianza en [CAR_CASCADE_MIN_CONFIDENCE, ACCEPT)) o
+           pequenas (< CAR_CASCADE_SMALL_RATIO del frame) se recortan del frame
+           original y se vuelven a detectar a resolucion completa, todas en un batch.
+           Si hay mas de CAR_CASCADE_MAX_REGIONS regiones se repite el frame completo
+           a CAR_CASCADE_FINE_IMGSZ (mas barato que muchos recortes).
+        
+        Args:
+            frames (list): Lista de imagenes en formato numpy array (BGR)
+            frame_shape (tuple): Shape del frame completo si frames son recortes (ROI)
+            
+        Returns:
+            list: Una VehicleDetections por frame (mismo formato que detect_vehicles)
+        """
+        start = time.perf_counter()
+        coarse_outputs = self.model.predict(frames, imgsz=self.cascade_coarse_imgsz,
+                                            conf=self.cascade_min_confidence)
+        
+        # Clasificar cajas gruesas: aceptadas o regiones a refinar
+        accepted, regions, full_pass = [], [], []
+        for frame, output in zip(frames, coarse_outputs):
+            full_h, full_w = (frame_shape or frame.shape)[:2]
+            wh = output.xyxy[:, 2:] - output.xyxy[:, :2]
+            small = wh[:, 0] * wh[:, 1] < self.cascade_small_ratio * full_w * full_h
+            confident = (output.confidence >= self.cascade_accept_confidence) & ~small
+            
+            accepted.append((output.xyxy[confident], output.confidence[confident],
+                             output.class_ids[confident]))
+            uncertain = output.xyxy[~confident]
+            full_pass.append(len(uncertain) > self.cascade_max_regions)
+            regions.append([] if full_pass[-1] else
+                           [self._cascade_region(box, frame.shape) for box in uncertain])
+        
+        # Segunda pasada: recortes dudosos de todos los frames en un solo batch
+        crops, owners = [], []
+        for idx, frame in enumerate(frames):
+            for region in regions[idx]:
+                x1, y1, x2, y2 = region
+                crops.append(frame[y1:y2, x1:x2])
+                owners.append((idx, region))
+        refined = [[] for _ in frames]
+        if crops:
+            crop_imgsz = min(self.cascade_fine_imgsz,
+                             int(np.ceil(max(max(c.shape[:2]) for c in crops) / 32.0) * 32))
+            crop_outputs = self.model.predict(crops, imgsz=crop_imgsz)
+            for (idx, (x1, y1, x2, y2)), output in zip(owners, crop_outputs):
+                img_h, img_w = frames[idx].shape[:2]
+                keep = ~self._touches_inner_edge(output.xyxy, x1, y1, x2 - x1, y2 - y1, img_w, img_h)
+                offset = np.array([x1, y1, x1, y1], dtype=np.float32)
+                refined[idx].append((output.xyxy[keep] + offset, output.confidence[keep],
+                                     output.class_ids[keep]))
+        
+        # Frames con demasiadas regiones dudosas: una pasada completa a resolucion fina
+        full_indices = [idx for idx, flag in enumerate(full_pass) if flag]
+        if full_indices:
+            full_outputs = self.model.predict([frames[idx] for idx in full_indices],
+                                              imgsz=self.cascade_fine_imgsz)
+            for idx, output in zip(full_indices, full_outputs):
+                refined[idx].append((output.xyxy, output.confidence, output.class_ids))
+        
+        batch_detections = []
+        for idx, frame in enumerate(frames):
+            parts = [accepted[idx]] + refined[idx]
+            xyxy = np.concatenate([p[0] for p in parts]).astype(np.float32)
+            confidence = np.concatenate([p[1] for p in parts]).astype(np.float32)
+            class_ids = np.concatenate([p[2] for p in parts]).astype(np.int64)
+            
+            # Un vehiculo puede salir en la pasada gruesa y en un recorte vecino
+            keep = non_max_suppression(xyxy, confidence, self.tile_nms_iou, class_ids)
+            batch_detections.append(self._filter_boxes(
+                xyxy[keep], confidence[keep], class_ids[keep],
+                frame_shape or frame.shape, self.model.names
+            ))
+        
+        total_ms = (time.perf_counter() - start) * 1000
+        self.last_cascade_stats = {
+            'coarse': sum(len(o) for o in coarse_outputs),
+            'accepted': sum(len(a[1]) for a in accepted),
+            'regions': len(crops),
+            'full_pass': len(full_indices),
+            'total_ms': total_ms,
+        }
+        if getattr(config, 'DEBUG_VERBOSE', False):
+            print(f"[DEBUG] Cascada: {self.last_cascade_stats['accepted']}/{self.last_cascade_stats['coarse']} "
+                  f"aceptadas en pasada gruesa, {len(crops)} regiones refinadas, "
+                  f"{len(full_indices)} frames completos, {total_ms:.1f}ms")
+        
+        return batch_detections
+    
+    def _cascade_region(self, box, image_shape):
+        """
+        Region cuadrada del frame alrededor de una caja dudosa para la pasada fina.
+        Mide al menos CAR_CASCADE_REGION_SIZE y 1.5 veces el lado mayor de la caja.
+        
+        Returns:
+            tuple: (x1, y1, x2, y2) dentro de la imagen
+        """
+        img_h, img_w = image_shape[:2]
+        cx, cy = (box[0] + box[2]) / 2.0, (box[1] + box[3]) / 2.0
+        side = max(self.cascade_region_size, 1.5 * max(box[2] - box[0], box[3] - box[1]))
+        side_w, side_h = min(int(side), img_w), min(int(side), img_h)
+        x1 = int(np.clip(cx - side_w / 2.0, 0, img_w - side_w))
+        y1 = int(np.clip(cy - side_h / 2.0, 0, img_h - side_h))
+        return x1, y1, x1 + side_w, y1 + side_h
+    
+    def _tile_origins(self, img_w, img_h):
+        """
+        Calcula la esquina superior izquierda de cada tile.
+        El ultimo tile de cada eje se alinea al borde para no salirse del frame.
+        
+        Returns:
+            list: [(x, y), ...]
+        """
+        step = max(1, int(self.tile_size * (1.0 - self.tile_overlap)))
+        
+        def axis_starts(length):
+            if length <= self.tile_size:
+                return [0]
+            starts = list(range(0, length - self.tile_size, step))
+            starts.append(length - self.tile_size)
+            return starts
+        
+        return [(x, y) for y in axis_starts(img_h) for x in axis_starts(img_w)]
+    
+    def _touches_inner_edge(self, xyxy, x, y, tile_w, tile_h, img_w, img_h, margin=2):
+        """
+        Marca cajas cortadas por un borde interno del tile (no por el borde del frame).
+        Esos vehiculos aparecen completos en el tile vecino (si caben en el
+        solape) o en la pasada al frame completo.
+        
+        Args:
+            xyxy (np.ndarray): (N, 4) cajas en coordenadas del tile
+            x, y (int): Origen del tile en el frame
+            tile_w, tile_h (int): Tamano del tile
+            img_w, img_h (int): Tamano del frame
+            
+        Returns:
+            np.ndarray: (N,) bool
+        """
+        cut = np.zeros(len(xyxy), dtype=bool)
+        if x > 0:
+            cut |= xyxy[:, 0] <= margin
+        if y > 0:
+            cut |= xyxy[:, 1] <= margin
+        if x + tile_w < img_w:
+            cut |= xyxy[:, 2] >= tile_w - margin
+        if y + tile_h < img_h:
+            cut |= xyxy[:, 3] >= tile_h - margin
+        return cut
+    
+    def _resolve_vehicle_classes(self, names):
+        """
+        Determina que ids de clase se aceptan como vehiculo.
+        
+        Args:
+            names (dict): id de clase -> nombre del modelo cargado
+            
+        Returns:
+            np.ndarray or None: ids permitidos, o None si no se filtra por clase
+        """
+        if names.get(2) == 'car':
+            return np.array([c for c in self.vehicle_classes if c in names], dtype=np.int64)
+        return None
+    
+    def _filter_boxes(self, xyxy, confidence, class_ids, image_shape, names):
+        """
+        Aplica confianza, clase, tamano y aspect ratio con una sola mascara.
+        
+        Args:
+            xyxy (np.ndarray): (N, 4) cajas en pixeles del frame
+            confidence (np.ndarray): (N,) confianzas
+            class_ids (np.ndarray): (N,) ids de clase
+            image_shape (tuple): Shape del frame (para ratios de tamano)
+            names (dict): id de clase -> nombre
+            
+        Returns:
+            VehicleDetections: Detecciones que pasan todos los filtros
         """
-        results = self.model(image, verbose=False)
-        detections = []
+        # Truncar a enteros igual que int() sobre cada coordenada
+        xyxy = xyxy.astype(np.int32)
         
         # Obtener dimensiones de la imagen para calcular ratios
-        img_height, img_width = image.shape[:2]
+        img_height, img_width = image_shape[:2]
         img_area = img_height * img_width
         
-        for result in results:
-            boxes = result.boxes
-            for box in boxes:
-                class_id = int(box.cls[0])
-                confidence = float(box.conf[0])
-                
-                # Filtrar por confianza minima
-                if confidence < self.min_confidence:
-                    print(f"[DEBUG] Vehiculo rechazado por baja confianza: {confidence:.2f} < {self.min_confidence}")
-                    continue
-                
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
-                
-                # Calcular area del bbox
-                bbox_width = x2 - x1
-                bbox_height = y2 - y1
-                bbox_area = bbox_width * bbox_height
-                
-                # Calcular ratio respecto al frame
-                bbox_ratio = bbox_area / img_area if img_area > 0 else 0
-                
-                # Filtrar por tamano maximo (evitar falsos positivos gigantes)
-                if bbox_ratio > self.max_bbox_ratio:
-                    print(f"[DEBUG] Vehiculo rechazado por tamano excesivo: {bbox_ratio:.1%} del frame (max: {self.max_bbox_ratio:.0%})")
-                    continue
-                
-                # Filtrar por tamano minimo (evitar ruido)
-                if bbox_ratio < self.min_bbox_ratio:
-                    print(f"[DEBUG] Vehiculo rechazado por tamano muy pequeno: {bbox_ratio:.3%} del frame")
-                    continue
-                
-                # Filtrar por aspect ratio anomalo (muy ancho o muy alto)
-                aspect_ratio = bbox_width / bbox_height if bbox_height > 0 else 0
-                if aspect_ratio > 6.0 or aspect_ratio < 0.2:
-                    print(f"[DEBUG] Vehiculo rechazado por aspect ratio anomalo: {aspect_ratio:.2f}")
-                    continue
-                
-                detections.append({
-                    'bbox': [x1, y1, x2, y2],
-                    'confidence': confidence,
-                    'class': result.names[class_id]
-                })
-                
-                print(f"[DEBUG] Vehiculo detectado: {result.names[class_id]} con confianza {confidence:.2f} ({bbox_ratio:.1%} del frame)")
+        # Area y ratio de cada bbox respecto al frame
+        bbox_width = (xyxy[:, 2] - xyxy[:, 0]).astype(np.float64)
+        bbox_height = (xyxy[:, 3] - xyxy[:, 1]).astype(np.float64)
+        bbox_ratio = bbox_width * bbox_height / img_area if img_area > 0 else np.zeros_like(bbox_width)
+        aspect_ratio = np.divide(bbox_width, bbox_height,
+                                 out=np.zeros_like(bbox_width), where=bbox_height > 0)
         
-        return detections
+        conf_ok = confidence >= self.min_confidence
+        class_ok = (np.isin(class_ids, self.allowed_class_ids)
+                    if self.allowed_class_ids is not None else np.ones_like(conf_ok))
+        # Rechaza gigantes (falsos positivos) y ruido muy pequeno
+        size_ok = (bbox_ratio <= self.max_bbox_ratio) & (bbox_ratio >= self.min_bbox_ratio)
+        # Rechaza aspect ratio anomalo (muy ancho o muy alto)
+        aspect_ok = (aspect_ratio <= 6.0) & (aspect_ratio >= 0.2)
+        
+        keep = conf_ok & class_ok & size_ok & aspect_ok
+        
+        if getattr(config, 'DEBUG_VERBOSE', False):
+            print(f"[DEBUG] Vehiculos: {int(keep.sum())}/{len(keep)} aceptados "
+                  f"(rechazados - confianza: {int((~conf_ok).sum())}, clase: {int((~class_ok).sum())}, "
+                  f"tamano: {int((~size_ok).sum())}, aspect: {int((~aspect_ok).sum())})")
+        
+        return VehicleDetections(xyxy[keep], confidence[keep], class_ids[keep], names)
     
     def draw_detections(self, image, detections):
         """
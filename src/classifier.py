@@ -1,17 +1,173 @@
 import cv2
 import numpy as np
 import os
-from ultralytics import YOLO
+from functools import lru_cache
+from .model_registry import get_yolo_model
+from .crop_batcher import CropBatcher
+from .worker_pool import get_worker_pool
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+# Colores que devuelve el clasificador (indice = etiqueta de la LUT)
+COLOR_NAMES = (
+    'NEGRO', 'BLANCO', 'PLATA', 'GRIS', 'ROJO', 'ROJO_OSCURO', 'NARANJA',
+    'CAFE', 'AMARILLO', 'VERDE', 'AZUL', 'AZUL_OSCURO', 'DESCONOCIDO'
+)
+COLOR_METHODS = ('lut', 'kmeans')
+
+
+def hsv_to_color_index(hsv):
+    """
+    Reglas de color por brillo, saturacion y tono, vectorizadas.
+    Soporta 12 colores comunes en vehiculos (+ DESCONOCIDO).
+    
+    Args:
+        hsv (np.ndarray): (..., 3) pixeles HSV de OpenCV (H en 0-179)
+        
+    Returns:
+        np.ndarray: (...) indice en COLOR_NAMES por pixel
+    """
+    hsv = hsv.astype(np.int16)
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    names = COLOR_NAMES.index
+    
+    # Primero brillo y saturacion (acromaticos), luego tono para colores saturados.
+    # Rojo hace wrap around en HSV: 0-10 y 170-180
+    conditions = [
+        v < 40,
+        (s < 20) & (v > 200),
+        (s < 20) & (v > 140),
+        s < 20,
+        ((h <= 10) | (h >= 170)) & (v > 100),
+        (h <= 10) | (h >= 170),
+        (h <= 20) & (s > 100),
+        h <= 20,
+        h <= 35,
+        h <= 85,
+        (h <= 135) & (v > 100),
+        h <= 135,
+    ]
+    choices = [
+        names('NEGRO'), names('BLANCO'), names('PLATA'), names('GRIS'),
+        names('ROJO'), names('ROJO_OSCURO'), names('NARANJA'), names('CAFE'),
+        names('AMARILLO'), names('VERDE'), names('AZUL'), names('AZUL_OSCURO'),
+    ]
+    return np.select(conditions, choices, default=names('DESCONOCIDO')).astype(np.uint8)
+
+
+@lru_cache(maxsize=None)
+def build_color_lut(bins=32):
+    """
+    Tabla BGR cuantizado -> color, calculada una sola vez por proceso.
+    Cada celda se clasifica por el color de su centro.
+    
+    Args:
+        bins (int): Niveles por canal (divisor de 256; 32 = 32x32x32 celdas)
+        
+    Returns:
+        np.ndarray: (bins, bins, bins) uint8 con el indice en COLOR_NAMES
+    """
+    if 256 % bins:
+        raise ValueError(f"COLOR_LUT_BINS debe dividir a 256 (recibido {bins})")
+    step = 256 // bins
+    centers = (np.arange(bins) * step + step // 2).astype(np.uint8)
+    b, g, r = np.meshgrid(centers, centers, centers, indexing='ij')
+    bgr = np.stack([b, g, r], axis=-1).reshape(bins * bins, bins, 3)
+    hsv = cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV)
+    return hsv_to_color_index(hsv).reshape(bins, bins, bins)
+
+
+def color_roi(vehicle_image, size=60):
+    """
+    Zona central del vehiculo (30-70% vertical, 20-80% horizontal) reducida a
+    size x size. Evita neumaticos, ventanas, sombras y elementos no representativos.
+    
+    Args:
+        vehicle_image: Imagen del vehiculo en BGR
+        size (int): Lado del ROI reducido
+        
+    Returns:
+        np.ndarray or None: ROI reducido, None si el ROI es invalido
+    """
+    h, w = vehicle_image.shape[:2]
+    roi = vehicle_image[int(h*0.3):int(h*0.7), int(w*0.2):int(w*0.8)]
+    if roi.size == 0 or roi.shape[0] < 10 or roi.shape[1] < 10:
+        return None
+    return cv2.resize(roi, (size, size))
+
+
+def hsv_thumbnail(vehicle_image, size=100):
+    """
+    Vehiculo completo en HSV reducido a size x size (para la heuristica fallback).
+    
+    Args:
+        vehicle_image: Imagen del vehiculo en BGR
+        size (int): Lado de la imagen reducida
+        
+    Returns:
+        np.ndarray: Imagen HSV reducida
+    """
+    hsv = cv2.cvtColor(vehicle_image, cv2.COLOR_BGR2HSV)
+    return cv2.resize(hsv, (size, size))
+
+
+def dominant_color_lut(roi, lut):
+    """
+    Color dominante del ROI: cada pixel se etiqueta con la LUT y gana la
+    etiqueta mas frecuente (un histograma, sin iteraciones).
+    
+    Args:
+        roi (np.ndarray): ROI BGR (color_roi)
+        lut (np.ndarray): Tabla de build_color_lut
+        
+    Returns:
+        str: Nombre del color
+    """
+    step = 256 // lut.shape[0]
+    quantized = roi.reshape(-1, 3) // step
+    labels = lut[quantized[:, 0], quantized[:, 1], quantized[:, 2]]
+    counts = np.bincount(labels, minlength=len(COLOR_NAMES))
+    return COLOR_NAMES[int(np.argmax(counts))]
+
+
+def dominant_color_kmeans(roi):
+    """
+    Color dominante del ROI por K-Means (K=3): se nombra el centro del
+    cluster con mas pixeles.
+    
+    Args:
+        roi (np.ndarray): ROI BGR (color_roi)
+        
+    Returns:
+        str: Nombre del color
+    """
+    pixels = roi.reshape((-1, 3)).astype(np.float32)
+    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
+    # Semilla fija: el RNG de OpenCV es por hilo y el color no debe
+    # depender de que hilo del pool procesa el recorte
+    cv2.setRNGSeed(0)
+    _, labels, centers = cv2.kmeans(pixels, 3, None, criteria, 3, cv2.KMEANS_PP_CENTERS)
+    
+    # Cluster dominante (el que tiene mas pixeles)
+    unique, counts = np.unique(labels, return_counts=True)
+    dominant_bgr = np.clip(centers[unique[np.argmax(counts)]], 0, 255).astype(np.uint8)
+    hsv = cv2.cvtColor(dominant_bgr.reshape(1, 1, 3), cv2.COLOR_BGR2HSV)
+    return COLOR_NAMES[int(hsv_to_color_index(hsv)[0, 0])]
 
 
 class VehicleClassifier:
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, backend=None):
         """
         Inicializa el clasificador de marca y color.
         Usa YOLO para detectar logos de marcas.
         
         Args:
             model_path (str): Ruta al modelo YOLO de deteccion de logos
+            backend (str): 'ultralytics' o 'onnx'. Si es None, usa config.INFERENCE_BACKEND
         """
         # Cargar modelo YOLO de logos
         if model_path is None:
@@ -28,8 +184,16 @@ class VehicleClassifier:
         
         print(f"[DEBUG] Modelo encontrado. Tamano: {os.path.getsize(model_path) / (1024*1024):.2f} MB")
         print(f"[DEBUG] Cargando modelo YOLO de logos: {model_path}")
-        self.brand_detector = YOLO(model_path)
-        print("[DEBUG] Modelo de logos cargado exitosamente")
+        self.brand_detector = get_yolo_model(model_path, backend)
+        print(f"[DEBUG] Modelo de logos cargado exitosamente ({self.brand_detector.name})")
+        self.crop_batcher = CropBatcher.from_config('brand_detector')
+        self.worker_pool = get_worker_pool()
+        
+        # Color: tabla BGR -> color (una por proceso) o K-Means por vehiculo
+        self.color_method = getattr(config, 'COLOR_METHOD', 'lut')
+        if self.color_method not in COLOR_METHODS:
+            raise ValueError(f"COLOR_METHOD desconocido: {self.color_method} (opciones: {COLOR_METHODS})")
+        self.color_lut = build_color_lut(getattr(config, 'COLOR_LUT_BINS', 32))
         
         # Nombres de marcas (deben coincidir con el orden del modelo)
         self.brand_names = {
@@ -66,118 +230,57 @@ class VehicleClassifier:
             'CAFE': ([10, 100, 20], [20, 255, 100]),
         }
     
-    def _detect_dominant_color(self, vehicle_image):
+    def warmup(self):
+        """
+        Corre una deteccion de logos sobre una imagen vacia para que el primer
+        vehiculo real no pague la inicializacion de YOLO (una sola vez por
+        proceso: el modelo es compartido).
         """
-        Detecta el color dominante usando ROI + K-Means optimizado.
-        OPCION 2: Balance entre precision y rendimiento.
+        self.brand_detector.warmup()
+    
+    def _detect_dominant_color(self, vehicle_image, views=None):
+        """
+        Detecta el color dominante del ROI central del vehiculo.
+        COLOR_METHOD = 'lut': histograma de etiquetas por tabla BGR -> color (default).
+        COLOR_METHOD = 'kmeans': K-Means con K=3 (metodo anterior).
         
         Args:
             vehicle_image: Imagen del vehiculo en BGR
+            views (CropViews): Vistas del recorte del frame (None = calcular el ROI)
             
         Returns:
             str: Nombre del color detectado
         """
-        h, w = vehicle_image.shape[:2]
-        
-        # ROI: zona central (30-70% vertical, 20-80% horizontal)
-        # Esto evita neumaticos, ventanas, sombras y elementos no representativos
-        roi = vehicle_image[int(h*0.3):int(h*0.7), int(w*0.2):int(w*0.8)]
+        roi = views.get(color_roi) if views else color_roi(vehicle_image)
         
         # Validar ROI
-        if roi.size == 0 or roi.shape[0] < 10 or roi.shape[1] < 10:
+        if roi is None:
             print("[DEBUG-COLOR] ROI invalido, usando metodo fallback")
-            return self._detect_color_fallback(vehicle_image)
+            return self._detect_color_fallback(vehicle_image, views)
         
-        # Downsampling agresivo para rendimiento (60x60)
-        roi_small = cv2.resize(roi, (60, 60))
+        if self.color_method == 'lut':
+            return dominant_color_lut(roi, self.color_lut)
         
         try:
-            # K-Means con K=3 (rapido)
-            pixels = roi_small.reshape((-1, 3)).astype(np.float32)
-            criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 10, 1.0)
-            _, labels, centers = cv2.kmeans(pixels, 3, None, criteria, 3, cv2.KMEANS_PP_CENTERS)
-            
-            # Cluster dominante (el que tiene mas pixeles)
-            unique, counts = np.unique(labels, return_counts=True)
-            dominant_cluster = unique[np.argmax(counts)]
-            dominant_bgr = centers[dominant_cluster].astype(int)
-            
-            # Mapear BGR a nombre de color
-            color_name = self._bgr_to_color_name(dominant_bgr)
-            
-            return color_name
-            
+            return dominant_color_kmeans(roi)
         except Exception as e:
             print(f"[DEBUG-COLOR] Error en K-Means: {str(e)}, usando fallback")
-            return self._detect_color_fallback(vehicle_image)
+            return self._detect_color_fallback(vehicle_image, views)
     
-    def _bgr_to_color_name(self, bgr):
-        """
-        Mapea BGR a nombre de color usando clasificacion mejorada.
-        Soporta 12 colores comunes en vehiculos.
-        
-        Args:
-            bgr: Array numpy [B, G, R]
-            
-        Returns:
-            str: Nombre del color
-        """
-        # Convertir BGR a HSV para clasificacion
-        hsv_pixel = cv2.cvtColor(np.uint8([[bgr]]), cv2.COLOR_BGR2HSV)[0][0]
-        h, s, v = hsv_pixel
-        
-        # Clasificacion por brillo y saturacion primero
-        if v < 40:
-            return 'NEGRO'
-        elif s < 20:
-            # Colores acromaticos (blanco/gris/plata)
-            if v > 200:
-                return 'BLANCO'
-            elif v > 140:
-                return 'PLATA'
-            else:
-                return 'GRIS'
-        
-        # Clasificacion por tono (H) para colores saturados
-        # Rojo (wrap around en HSV: 0-10 y 170-180)
-        if 0 <= h <= 10 or 170 <= h <= 180:
-            return 'ROJO' if v > 100 else 'ROJO_OSCURO'
-        
-        # Naranja/Cafe
-        elif 10 < h <= 20:
-            return 'NARANJA' if s > 100 else 'CAFE'
-        
-        # Amarillo
-        elif 20 < h <= 35:
-            return 'AMARILLO'
-        
-        # Verde
-        elif 35 < h <= 85:
-            return 'VERDE'
-        
-        # Azul
-        elif 85 < h <= 135:
-            return 'AZUL' if v > 100 else 'AZUL_OSCURO'
-        
-        # Si no cae en ninguna categoria
-        return 'DESCONOCIDO'
-    
-    def _detect_color_fallback(self, vehicle_image):
+    def _detect_color_fallback(self, vehicle_image, views=None):
         """
         Metodo fallback usando heuristica HSV tradicional.
-        Usado si K-Means falla o ROI es invalido.
+        Usado si el ROI es invalido (o si K-Means falla).
         
         Args:
             vehicle_image: Imagen del vehiculo en BGR
+            views (CropViews): Vistas del recorte del frame (None = convertir aqui)
             
         Returns:
             str: Nombre del color detectado
         """
-        # Convertir a HSV
-        hsv = cv2.cvtColor(vehicle_image, cv2.COLOR_BGR2HSV)
-        
-        # Redimensionar para acelerar procesamiento
-        hsv_small = cv2.resize(hsv, (100, 100))
+        # HSV reducido para acelerar procesamiento
+        hsv_small = views.get(hsv_thumbnail) if views else hsv_thumbnail(vehicle_image)
         
         color_percentages = {}
         
@@ -213,48 +316,9 @@ class VehicleClassifier:
             }
         """
         try:
-            # Detectar logos con YOLO
-            results = self.brand_detector(vehicle_image, verbose=False)
-            
-            # Buscar el logo con mayor confianza
-            best_detection = None
-            best_conf = 0.0
-            
-            for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    conf = float(box.conf[0])
-                    if conf > best_conf:
-                        best_conf = conf
-                        best_detection = box
-            
-            # Si hay deteccion con confianza razonable
-            if best_detection is not None and best_conf > 0.3:
-                class_id = int(best_detection.cls[0])
-                
-                if class_id in self.brand_names:
-                    brand = self.brand_names[class_id]
-                    
-                    # Extraer bbox
-                    x1, y1, x2, y2 = best_detection.xyxy[0].cpu().numpy().astype(int)
-                    
-                    # Asegurar que las coordenadas esten dentro de la imagen
-                    h, w = vehicle_image.shape[:2]
-                    x1, y1 = max(0, x1), max(0, y1)
-                    x2, y2 = min(w, x2), min(h, y2)
-                    
-                    bbox = [x1, y1, x2, y2]
-                    
-                    print(f"[DEBUG] Logo detectado: {brand} (confianza: {best_conf:.2f})")
-                    return {
-                        'brand': brand,
-                        'brand_bbox': bbox
-                    }
-            
-            return {
-                'brand': "DESCONOCIDA",
-                'brand_bbox': None
-            }
+            # Detectar logos con YOLO (mismo letterbox que el camino por batch)
+            output = self.crop_batcher.predict(self.brand_detector, [vehicle_image])[0]
+            return self._select_brand(vehicle_image, output)
             
         except Exception as e:
             print(f"[ERROR] Error al detectar logo: {str(e)}")
@@ -263,18 +327,105 @@ class VehicleClassifier:
                 'brand_bbox': None
             }
     
-    def classify_color(self, vehicle_image):
+    def classify_brand_batch(self, vehicle_images, views=None):
         """
-        Clasifica el color del vehiculo.
-        Usa K-Means optimizado con ROI.
+        Detecta la marca de varios vehiculos con batches de YOLO.
+        
+        Args:
+            vehicle_images (list): Recortes de vehiculos (numpy arrays BGR)
+            views (list): CropViews por recorte (letterbox compartido con las placas)
+            
+        Returns:
+            list: Un dict {'brand', 'brand_bbox'} por vehiculo (ver classify_brand)
+        """
+        if not vehicle_images:
+            return []
+        
+        try:
+            outputs = self.crop_batcher.predict(self.brand_detector, vehicle_images, views=views)
+        except Exception as e:
+            print(f"[ERROR] Error al detectar logos por batch: {str(e)}")
+            return [self.classify_brand(img) for img in vehicle_images]
+        
+        return [self._select_brand(img, output) for img, output in zip(vehicle_images, outputs)]
+    
+    def _select_brand(self, vehicle_image, output):
+        """
+        Elige el logo de mayor confianza y lo traduce a marca.
+        
+        Args:
+            vehicle_image: Imagen del vehiculo (numpy array BGR)
+            output (DetectionArrays): Cajas del detector en coordenadas de vehicle_image
+            
+        Returns:
+            dict: {'brand': str, 'brand_bbox': list|None}
+        """
+        # Buscar el logo con mayor confianza
+        best_idx = None
+        best_conf = 0.0
+        if len(output) > 0:
+            best_idx = int(np.argmax(output.confidence))
+            best_conf = float(output.confidence[best_idx])
+        
+        # Si hay deteccion con confianza razonable
+        if best_idx is not None and best_conf > 0.3:
+            class_id = int(output.class_ids[best_idx])
+            
+            if class_id in self.brand_names:
+                brand = self.brand_names[class_id]
+                
+                # Extraer bbox
+                x1, y1, x2, y2 = output.xyxy[best_idx].astype(int)
+                
+                # Asegurar que las coordenadas esten dentro de la imagen
+                h, w = vehicle_image.shape[:2]
+                x1, y1 = max(0, x1), max(0, y1)
+                x2, y2 = min(w, x2), min(h, y2)
+                
+                bbox = [x1, y1, x2, y2]
+                
+                print(f"[DEBUG] Logo detectado: {brand} (confianza: {best_conf:.2f})")
+                return {
+                    'brand': brand,
+                    'brand_bbox': bbox
+                }
+        
+        return {
+            'brand': "DESCONOCIDA",
+            'brand_bbox': None
+        }
+    
+    def classify_color(self, vehicle_image, views=None):
+        """
+        Clasifica el color del vehiculo (ROI central, ver COLOR_METHOD).
         
         Args:
             vehicle_image: Imagen del vehiculo recortada (numpy array BGR)
+            views (CropViews): Vistas del recorte del frame (ROI/HSV ya calculados)
             
         Returns:
             str: Color del vehiculo
         """
-        return self._detect_dominant_color(vehicle_image)
+        return self._detect_dominant_color(vehicle_image, views)
+    
+    def classify_color_batch(self, vehicle_images, views=None):
+        """
+        Clasifica el color de varios vehiculos en paralelo en el pool de hilos.
+        
+        Args:
+            vehicle_images (list): Recortes de vehiculos (numpy arrays BGR)
+            views (list): CropViews por recorte (None = calcular cada ROI)
+            
+        Returns:
+            list: Color por vehiculo, en el mismo orden
+        """
+        views = views or [None] * len(vehicle_images)
+        return self.worker_pool.map(self._classify_color_item, zip(vehicle_images, views))
+    
+    def _classify_color_item(self, item):
+        """classify_color de un par (recorte, vistas) del pool."""
+        vehicle_image, views = item
+        return self.classify_color(vehicle_image, views)
     
     def classify(self, vehicle_image):
         """
@@ -297,4 +448,27 @@ class VehicleClassifier:
             'brand': brand_result['brand'],
             'brand_bbox': brand_result['brand_bbox'],
             'color': color
-        }
\ No newline at end of file
+        }
+    
+    def classify_batch(self, vehicle_images, views=None):
+        """
+        Clasifica marca y color de varios vehiculos (marca por batch de YOLO,
+        color en paralelo en el pool de hilos).
+        
+        Args:
+            vehicle_images (list): Recortes de vehiculos (numpy arrays BGR)
+            views (list): CropViews por recorte (FrameCropCache)
+            
+        Returns:
+            list: Un dict {'brand', 'brand_bbox', 'color'} por vehiculo (ver classify)
+        """
+        brand_results = self.classify_brand_batch(vehicle_images, views)
+        colors = self.classify_color_batch(vehicle_images, views)
+        return [
+            {
+                'brand': brand_result['brand'],
+                'brand_bbox': brand_result['brand_bbox'],
+                'color': color
+            }
+            for brand_result, color in zip(brand_results, colors)
+        ]
@@ -0,0 +1,108 @@
+import numpy as np
+
+from .inference import DetectionArrays, letterbox
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+class CropBatcher:
+    def __init__(self, batch_size=8, imgsz=640, sizes=None, upscale=1.0):
+        """
+        Agrupa los recortes de vehiculos de un frame para correr los detectores
+        de placas y logos una vez por batch en lugar de una vez por vehiculo.
+
+        Cada recorte se lleva con letterbox a un cuadrado fijo de imgsz, asi
+        todos los tensores del batch tienen el mismo tamano, y las cajas se
+        devuelven en coordenadas del recorte original (mismas para un
+        batch de uno que para uno de veinte).
+
+        Con `sizes` el lado se elige por recorte: el menor tamano que cubre el
+        lado mayor del recorte (x upscale), asi un recorte de 200px no se
+        infla hasta 640. Los recortes se agrupan por tamano y cada grupo va en
+        sus propios batches.
+        
+        Args:
+            batch_size (int): Recortes por llamada al modelo
+            imgsz (int): Lado del cuadrado de entrada (multiplo de 32)
+            sizes (tuple): Lados posibles por tamano de recorte (None = siempre imgsz)
+            upscale (float): Factor sobre el lado mayor del recorte al elegir el tamano
+        """
+        self.batch_size = max(1, int(batch_size))
+        self.imgsz = imgsz
+        self.sizes = tuple(sorted(sizes)) if sizes else None
+        self.upscale = upscale
+
+    @classmethod
+    def from_config(cls, model_name=None):
+        """
+        Crea el batcher desde config.py (CROP_BATCH_SIZE, CROP_BATCH_IMGSZ,
+        CROP_IMGSZ_SIZES[model_name], CROP_IMGSZ_UPSCALE).
+        
+        Args:
+            model_name (str): 'plate_detector' o 'brand_detector'
+        """
+        return cls(
+            batch_size=getattr(config, 'CROP_BATCH_SIZE', 8),
+            imgsz=getattr(config, 'CROP_BATCH_IMGSZ', 640),
+            sizes=(getattr(config, 'CROP_IMGSZ_SIZES', None) or {}).get(model_name),
+            upscale=getattr(config, 'CROP_IMGSZ_UPSCALE', 1.0),
+        )
+    
+    def select_imgsz(self, crop_shape):
+        """
+        Lado de entrada para un recorte.
+        
+        Args:
+            crop_shape (tuple): (alto, ancho, ...) del recorte
+            
+        Returns:
+            int: Menor tamano de `sizes` >= lado mayor x upscale (el mayor si ninguno alcanza)
+        """
+        if not self.sizes:
+            return self.imgsz
+        needed = max(crop_shape[:2]) * self.upscale
+        return next((size for size in self.sizes if size >= needed), self.sizes[-1])
+
+    def predict(self, backend, crops, conf=None, views=None):
+        """
+        Ejecuta un detector YOLO sobre todos los recortes en batches fijos.
+
+        Args:
+            backend: Backend de inferencia (UltralyticsBackend | OnnxBackend)
+            crops (list): Recortes numpy (BGR) de distintos tamanos
+            conf (float): Confianza minima de NMS (None = default del backend)
+            views (list): CropViews por recorte (FrameCropCache); el letterbox se
+                          comparte con los otros detectores del frame. None = calcularlo
+
+        Returns:
+            list: Un DetectionArrays por recorte, en coordenadas del recorte
+        """
+        # Agrupar por tamano de entrada (un solo grupo sin `sizes`)
+        groups = {}
+        for idx, crop in enumerate(crops):
+            groups.setdefault(self.select_imgsz(crop.shape), []).append(idx)
+        
+        outputs = [None] * len(crops)
+        for imgsz, indices in groups.items():
+            for start in range(0, len(indices), self.batch_size):
+                chunk = indices[start:start + self.batch_size]
+                letterboxed = [views[i].get(letterbox, (imgsz, imgsz)) if views else
+                               letterbox(crops[i], (imgsz, imgsz)) for i in chunk]
+                predictions = backend.predict([img for img, _, _ in letterboxed], imgsz=imgsz, conf=conf)
+                for i, (_, ratio, pad), output in zip(chunk, letterboxed, predictions):
+                    outputs[i] = self._to_crop_coords(output, ratio, pad, crops[i].shape)
+        return outputs
+
+    def _to_crop_coords(self, output, ratio, pad, crop_shape):
+        """Deshace el letterbox de las cajas de un recorte."""
+        if len(output) == 0:
+            return DetectionArrays.empty()
+        h, w = crop_shape[:2]
+        pad_x, pad_y = pad
+        xyxy = output.xyxy.astype(np.float32).copy()
+        xyxy[:, [0, 2]] = ((xyxy[:, [0, 2]] - pad_x) / ratio).clip(0, w)
+        xyxy[:, [1, 3]] = ((xyxy[:, [1, 3]] - pad_y) / ratio).clip(0, h)
+        return DetectionArrays(xyxy, output.confidence, output.class_ids)
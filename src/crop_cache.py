@@ -0,0 +1,132 @@
+try:
+    import config
+except ImportError:
+    config = None
+
+
+class CropViews:
+    def __init__(self, image, cache=None):
+        """
+        Representaciones derivadas de un recorte de vehiculo (letterbox para los
+        detectores, ROI de color, HSV reducido) calculadas una sola vez y
+        compartidas por todas las etapas de reconocimiento del frame.
+
+        Las vistas son de solo lectura: las etapas no deben modificarlas.
+
+        Args:
+            image: Recorte del vehiculo (numpy array BGR)
+            cache (FrameCropCache): Cache duena de la vista (para los contadores)
+        """
+        self.image = image
+        self._cache = cache
+        self._views = {}
+
+    def get(self, fn, *args):
+        """
+        Resultado de fn(image, *args), calculado la primera vez que se pide.
+
+        Args:
+            fn (callable): Funcion que recibe el recorte (ej. letterbox, color_roi)
+            *args: Argumentos extra de fn (hasheables)
+
+        Returns:
+            object: Lo que devuelve fn
+        """
+        key = (fn, args)
+        hit = key in self._views
+        if self._cache is not None:
+            self._cache._count(fn.__name__, hit)
+        if hit:
+            return self._views[key]
+        # Dos hilos del pool pueden calcular la misma vista a la vez: el
+        # resultado es el mismo y solo se pierde un calculo
+        value = fn(self.image, *args)
+        self._views[key] = value
+        return value
+
+
+class FrameCropCache:
+    def __init__(self):
+        """
+        Cache por frame de las vistas de cada recorte de vehiculo, indexada por
+        track. Los detectores de placas y logos comparten el mismo letterbox
+        (mismo imgsz) y el color reutiliza su ROI, en lugar de que cada etapa
+        redimensione y convierta el recorte por su cuenta. Se vacia en cada
+        frame: el recorte de un track cambia de un frame al siguiente.
+        """
+        self._views = {}  # track_id -> CropViews
+        self.hits = 0
+        self.misses = 0
+        self._by_view = {}  # nombre de la vista -> [hits, misses]
+
+    @classmethod
+    def from_config(cls):
+        """
+        Crea la cache desde config.py.
+
+        Returns:
+            FrameCropCache or None: None si CROP_CACHE_ENABLED es False
+        """
+        if not getattr(config, 'CROP_CACHE_ENABLED', True):
+            return None
+        return cls()
+
+    def new_frame(self):
+        """Descarta las vistas del frame anterior (los contadores se mantienen)."""
+        self._views.clear()
+
+    def views(self, track_id, image):
+        """
+        Vistas del recorte de un track en el frame actual.
+
+        Args:
+            track_id: ID del track (o indice del vehiculo en una imagen)
+            image: Recorte del vehiculo (numpy array BGR)
+
+        Returns:
+            CropViews: Las mismas vistas para todas las etapas del frame
+        """
+        views = self._views.get(track_id)
+        if views is None or views.image is not image:
+            views = CropViews(image, cache=self)
+            self._views[track_id] = views
+        return views
+
+    def _count(self, view_name, hit):
+        """Suma un acierto o un fallo al total y al tipo de vista."""
+        counts = self._by_view.setdefault(view_name, [0, 0])
+        if hit:
+            self.hits += 1
+            counts[0] += 1
+        else:
+            self.misses += 1
+            counts[1] += 1
+
+    @staticmethod
+    def _ratio(hits, misses):
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / lookups if lookups else 0.0,
+        }
+
+    def get_stats(self):
+        """
+        Contadores de la cache, totales y por tipo de vista.
+
+        Returns:
+            dict: {'hits': int, 'misses': int, 'hit_ratio': float,
+                   'by_view': {nombre: {'hits', 'misses', 'hit_ratio'}}}
+                  (nombre = funcion de la vista: letterbox, color_roi, hsv_thumbnail)
+        """
+        stats = self._ratio(self.hits, self.misses)
+        stats['by_view'] = {name: self._ratio(*counts) for name, counts in self._by_view.items()}
+        return stats
+
+    def clear(self):
+        """Vacia la cache y los contadores (nuevo video)."""
+        self._views.clear()
+        self.hits = 0
+        self.misses = 0
+        self._by_view.clear()
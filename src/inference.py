@@ -0,0 +1,379 @@
+import ast
+import os
+
+import cv2
+import numpy as np
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+# Valores por defecto de ultralytics para predict()
+DEFAULT_CONF_THRESHOLD = 0.25
+DEFAULT_IOU_THRESHOLD = 0.7
+DEFAULT_MAX_DETECTIONS = 300
+LETTERBOX_COLOR = (114, 114, 114)
+
+BACKENDS = ('ultralytics', 'onnx')
+
+
+class DetectionArrays:
+    """
+    Salida cruda de un modelo YOLO para una imagen, en coordenadas de esa imagen.
+
+    Attributes:
+        xyxy (np.ndarray): (N, 4) float32 con [x1, y1, x2, y2]
+        confidence (np.ndarray): (N,) float32
+        class_ids (np.ndarray): (N,) int64
+    """
+
+    def __init__(self, xyxy, confidence, class_ids):
+        self.xyxy = xyxy
+        self.confidence = confidence
+        self.class_ids = class_ids
+
+    @classmethod
+    def empty(cls):
+        return cls(
+            np.zeros((0, 4), dtype=np.float32),
+            np.zeros((0,), dtype=np.float32),
+            np.zeros((0,), dtype=np.int64)
+        )
+
+    def __len__(self):
+        return len(self.confidence)
+
+
+def non_max_suppression(xyxy, scores, iou_threshold, class_ids=None, max_detections=DEFAULT_MAX_DETECTIONS):
+    """
+    NMS greedy vectorizado (por clase si se pasan class_ids).
+
+    Args:
+        xyxy (np.ndarray): (N, 4) cajas
+        scores (np.ndarray): (N,) confianzas
+        iou_threshold (float): IoU maximo entre cajas conservadas
+        class_ids (np.ndarray): (N,) clases; cajas de distinta clase no se suprimen
+        max_detections (int): Maximo de cajas a conservar
+
+    Returns:
+        np.ndarray: Indices conservados, ordenados por confianza descendente
+    """
+    if len(scores) == 0:
+        return np.zeros((0,), dtype=np.int64)
+
+    boxes = xyxy.astype(np.float32)
+    if class_ids is not None:
+        # Desplazar cada clase a una zona distinta para que no se solapen
+        boxes = boxes + (class_ids.astype(np.float32) * 7680.0)[:, None]
+
+    areas = (boxes[:, 2] - boxes[:, 0]).clip(0) * (boxes[:, 3] - boxes[:, 1]).clip(0)
+    order = np.argsort(-scores, kind='stable')
+    keep = []
+
+    while order.size > 0 and len(keep) < max_detections:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        inter_w = (np.minimum(boxes[i, 2], boxes[rest, 2]) - np.maximum(boxes[i, 0], boxes[rest, 0])).clip(0)
+        inter_h = (np.minimum(boxes[i, 3], boxes[rest, 3]) - np.maximum(boxes[i, 1], boxes[rest, 1])).clip(0)
+        inter = inter_w * inter_h
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
+        order = rest[iou <= iou_threshold]
+
+    return np.array(keep, dtype=np.int64)
+
+
+def letterbox(image, new_shape, color=LETTERBOX_COLOR):
+    """
+    Redimensiona manteniendo aspect ratio y rellena hasta new_shape (igual que ultralytics).
+
+    Args:
+        image: Imagen numpy (BGR)
+        new_shape (tuple): (alto, ancho) destino
+
+    Returns:
+        tuple: (imagen, ratio, (pad_x, pad_y))
+    """
+    h, w = image.shape[:2]
+    ratio = min(new_shape[0] / h, new_shape[1] / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+
+    pad_w = (new_shape[1] - new_w) / 2.0
+    pad_h = (new_shape[0] - new_h) / 2.0
+
+    if (w, h) != (new_w, new_h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    top, bottom = int(round(pad_h - 0.1)), int(round(pad_h + 0.1))
+    left, right = int(round(pad_w - 0.1)), int(round(pad_w + 0.1))
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=color)
+    return image, ratio, (left, top)
+
+
+def letterbox_shape(image_shape, imgsz, stride=32, rect=True):
+    """
+    Calcula el tamano de entrada del modelo para una imagen.
+
+    Args:
+        image_shape (tuple): Shape de la imagen
+        imgsz (int): Lado mayor de la entrada
+        stride (int): Stride del modelo
+        rect (bool): True = relleno minimo (multiplo de stride), False = cuadrado
+
+    Returns:
+        tuple: (alto, ancho)
+    """
+    if not rect:
+        return imgsz, imgsz
+    h, w = image_shape[:2]
+    ratio = min(imgsz / h, imgsz / w)
+    new_h, new_w = int(round(h * ratio)), int(round(w * ratio))
+    return (int(np.ceil(new_h / stride) * stride), int(np.ceil(new_w / stride) * stride))
+
+
+class UltralyticsBackend:
+    name = 'ultralytics'
+
+    def __init__(self, model_path):
+        """
+        Backend PyTorch (modo eager) via ultralytics.
+
+        Args:
+            model_path (str): Ruta al modelo .pt
+        """
+        from ultralytics import YOLO
+
+        self.model_path = model_path
+        self.model = YOLO(model_path)
+        self.names = self.model.names
+
+    def predict(self, images, imgsz=None, conf=None):
+        """
+        Ejecuta el modelo sobre una lista de imagenes en una sola llamada.
+
+        Args:
+            images (list): Imagenes numpy (BGR)
+            imgsz (int): Tamano de entrada (None = el del modelo)
+            conf (float): Confianza minima de NMS (None = default de ultralytics)
+
+        Returns:
+            list: Un DetectionArrays por imagen
+        """
+        kwargs = {}
+        if imgsz is not None:
+            kwargs['imgsz'] = imgsz
+        if conf is not None:
+            kwargs['conf'] = conf
+
+        results = self.model(list(images), verbose=False, **kwargs)
+        outputs = []
+        for result in results:
+            boxes = result.boxes
+            if len(boxes) == 0:
+                outputs.append(DetectionArrays.empty())
+                continue
+            outputs.append(DetectionArrays(
+                boxes.xyxy.cpu().numpy().astype(np.float32),
+                boxes.conf.cpu().numpy().astype(np.float32),
+                boxes.cls.cpu().numpy().astype(np.int64)
+            ))
+        return outputs
+
+
+def export_onnx(model_path, imgsz=None):
+    """
+    Exporta un modelo .pt a ONNX una sola vez y lo cachea junto al .pt.
+    Se reexporta si el .pt es mas nuevo que el .onnx.
+
+    Args:
+        model_path (str): Ruta al modelo .pt
+        imgsz (int): Tamano de exportacion (None = el de entrenamiento)
+
+    Returns:
+        str: Ruta al archivo .onnx
+    """
+    onnx_path = os.path.splitext(model_path)[0] + '.onnx'
+
+    if os.path.exists(onnx_path) and os.path.getmtime(onnx_path) >= os.path.getmtime(model_path):
+        print(f"[INFERENCE] Usando ONNX cacheado: {onnx_path}")
+        return onnx_path
+
+    from ultralytics import YOLO
+
+    print(f"[INFERENCE] Exportando {model_path} a ONNX (solo la primera vez)...")
+    kwargs = {'format': 'onnx', 'dynamic': True}
+    if imgsz is not None:
+        kwargs['imgsz'] = imgsz
+    exported = YOLO(model_path).export(**kwargs)
+
+    if os.path.abspath(exported) != os.path.abspath(onnx_path):
+        os.replace(exported, onnx_path)
+    print(f"[INFERENCE] ONNX exportado: {onnx_path}")
+    return onnx_path
+
+
+class OnnxBackend:
+    name = 'onnx'
+
+    def __init__(self, model_path, num_threads=0):
+        """
+        Backend onnxruntime en CPU con pre y post-procesado propios (letterbox + NMS).
+
+        Args:
+            model_path (str): Ruta al modelo .pt (se exporta) o directamente a un .onnx
+            num_threads (int): Hilos intra-op de onnxruntime (0 = automatico)
+        """
+        import onnxruntime as ort
+
+        self.model_path = model_path
+        if model_path.endswith('.onnx'):
+            self.onnx_path = model_path
+        else:
+            self.onnx_path = export_onnx(model_path)
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(self.onnx_path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+        # Metadatos que ultralytics guarda en el ONNX
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names = ast.literal_eval(metadata['names']) if 'names' in metadata else {}
+        self.stride = int(ast.literal_eval(metadata.get('stride', '32')))
+        default_imgsz = ast.literal_eval(metadata.get('imgsz', '[640, 640]'))
+        self.default_imgsz = max(default_imgsz) if isinstance(default_imgsz, (list, tuple)) else int(default_imgsz)
+
+        # Si el ONNX no es dinamico solo acepta su tamano y batch fijos
+        input_shape = self.session.get_inputs()[0].shape
+        self.dynamic = not all(isinstance(d, int) for d in input_shape)
+        self.fixed_batch = None if self.dynamic else input_shape[0]
+        # Lado de entrada fijo (None = acepta cualquier imgsz)
+        self.fixed_imgsz = None if self.dynamic else int(max(input_shape[2:]))
+        self._ignored_imgsz = set()
+
+    def _preprocess(self, images, imgsz):
+        """Letterbox + BGR->RGB + CHW + normalizacion a [0, 1]."""
+        same_shape = len({img.shape[:2] for img in images}) == 1
+        if self.dynamic:
+            shape = letterbox_shape(images[0].shape, imgsz, self.stride, rect=same_shape)
+        else:
+            shape = (self.default_imgsz, self.default_imgsz)
+
+        batch = []
+        meta = []
+        for image in images:
+            img, ratio, pad = letterbox(image, shape)
+            batch.append(img[:, :, ::-1].transpose(2, 0, 1))
+            meta.append((ratio, pad, image.shape[:2]))
+
+        blob = np.ascontiguousarray(np.stack(batch)).astype(np.float32) / 255.0
+        return blob, meta
+
+    def _postprocess(self, prediction, meta, conf):
+        """Decodifica la salida (4 + nc, N) de YOLOv8, aplica NMS y desescala."""
+        ratio, (pad_x, pad_y), (h, w) = meta
+
+        prediction = prediction.T  # (N, 4 + nc)
+        class_scores = prediction[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(class_ids)), class_ids]
+
+        mask = scores > conf
+        if not mask.any():
+            return DetectionArrays.empty()
+
+        boxes = prediction[mask, :4]
+        scores = scores[mask]
+        class_ids = class_ids[mask]
+
+        xyxy = np.empty_like(boxes)
+        xyxy[:, 0] = boxes[:, 0] - boxes[:, 2] / 2
+        xyxy[:, 1] = boxes[:, 1] - boxes[:, 3] / 2
+        xyxy[:, 2] = boxes[:, 0] + boxes[:, 2] / 2
+        xyxy[:, 3] = boxes[:, 1] + boxes[:, 3] / 2
+
+        keep = non_max_suppression(xyxy, scores, DEFAULT_IOU_THRESHOLD, class_ids)
+        xyxy, scores, class_ids = xyxy[keep], scores[keep], class_ids[keep]
+
+        # Deshacer letterbox
+        xyxy[:, [0, 2]] = ((xyxy[:, [0, 2]] - pad_x) / ratio).clip(0, w)
+        xyxy[:, [1, 3]] = ((xyxy[:, [1, 3]] - pad_y) / ratio).clip(0, h)
+
+        return DetectionArrays(xyxy.astype(np.float32), scores.astype(np.float32), class_ids.astype(np.int64))
+
+    def predict(self, images, imgsz=None, conf=None):
+        """
+        Ejecuta el modelo sobre una lista de imagenes.
+
+        Args:
+            images (list): Imagenes numpy (BGR)
+            imgsz (int): Tamano de entrada (None = el de exportacion). Un modelo
+                         de tamano fijo lo ignora (se avisa una vez por tamano)
+            conf (float): Confianza minima antes de NMS
+
+        Returns:
+            list: Un DetectionArrays por imagen
+        """
+        images = list(images)
+        if not images:
+            return []
+        if (self.fixed_imgsz is not None and imgsz is not None and imgsz != self.fixed_imgsz
+                and imgsz not in self._ignored_imgsz):
+            self._ignored_imgsz.add(imgsz)
+            print(f"[INFERENCE-WARNING] {os.path.basename(self.onnx_path)} tiene entrada fija de "
+                  f"{self.fixed_imgsz}px: se ignora imgsz={imgsz}")
+        imgsz = imgsz or self.default_imgsz
+        conf = DEFAULT_CONF_THRESHOLD if conf is None else conf
+
+        # Modelos con batch fijo: correr de a fixed_batch imagenes
+        chunk = self.fixed_batch or len(images)
+        outputs = []
+        for start in range(0, len(images), chunk):
+            group = images[start:start + chunk]
+            blob, meta = self._preprocess(group, imgsz)
+            prediction = self.session.run(None, {self.input_name: blob})[0]
+            outputs.extend(self._postprocess(prediction[i], meta[i], conf) for i in range(len(group)))
+        return outputs
+
+
+def quantized_model_path(model_path):
+    """Ruta del modelo INT8 generado por tools/quantize_models.py (models/<modelo>.int8.onnx)."""
+    return os.path.splitext(model_path)[0] + '.int8.onnx'
+
+
+def load_yolo_backend(model_path, backend=None):
+    """
+    Crea el backend de inferencia para un modelo YOLO.
+    Si el modelo esta activado en config.QUANTIZED_MODELS y existe su version
+    INT8, se usa esa (onnxruntime) sin importar el backend pedido.
+
+    Args:
+        model_path (str): Ruta al modelo .pt
+        backend (str): 'ultralytics' o 'onnx' (None = config.INFERENCE_BACKEND)
+
+    Returns:
+        UltralyticsBackend | OnnxBackend
+    """
+    model_name = os.path.splitext(os.path.basename(model_path))[0]
+    if getattr(config, 'QUANTIZED_MODELS', {}).get(model_name):
+        int8_path = quantized_model_path(model_path)
+        if os.path.exists(int8_path):
+            print(f"[INFERENCE] Usando modelo cuantizado INT8: {int8_path}")
+            model = OnnxBackend(int8_path, num_threads=getattr(config, 'ONNX_NUM_THREADS', 0))
+            if model.fixed_imgsz is not None:
+                print(f"[INFERENCE-WARNING] {os.path.basename(int8_path)} tiene entrada fija de "
+                      f"{model.fixed_imgsz}px: la cascada, el autoajuste de imgsz y CROP_IMGSZ_SIZES "
+                      f"no tienen efecto sobre este modelo")
+            return model
+        print(f"[INFERENCE-WARNING] {int8_path} no existe (ejecutar tools/quantize_models.py), usando FP32")
+
+    backend = backend or getattr(config, 'INFERENCE_BACKEND', 'ultralytics')
+
+    if backend == 'onnx':
+        return OnnxBackend(model_path, num_threads=getattr(config, 'ONNX_NUM_THREADS', 0))
+    if backend == 'ultralytics':
+        return UltralyticsBackend(model_path)
+    raise ValueError(f"Backend de inferencia desconocido: {backend} (opciones: {BACKENDS})")
@@ -0,0 +1,115 @@
+from collections import deque
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+class InputSizeTuner:
+    def __init__(self, budget_ms=40.0, initial_size=640, min_size=256, max_size=1280,
+                 step=32, window=30, headroom=0.25):
+        """
+        Ajusta el tamano de entrada (imgsz) del detector para cumplir un
+        presupuesto de latencia por frame medido en el equipo real.
+
+        Promedia la latencia de las ultimas `window` detecciones. Si supera el
+        presupuesto baja el tamano un paso; si queda por debajo del presupuesto
+        con margen (`headroom`) lo sube un paso. Tras cada cambio la ventana se
+        vacia para medir solo el tamano nuevo.
+
+        Args:
+            budget_ms (float): Latencia objetivo por frame en milisegundos
+            initial_size (int): Tamano de entrada inicial
+            min_size (int): Tamano minimo permitido
+            max_size (int): Tamano maximo permitido
+            step (int): Paso de ajuste (stride del modelo)
+            window (int): Mediciones por ventana antes de decidir
+            headroom (float): Fraccion del presupuesto que debe sobrar para subir
+        """
+        self.budget_ms = budget_ms
+        self.step = step
+        self.min_size = self._align(min_size)
+        self.max_size = max(self.min_size, self._align(max_size))
+        self.current_size = min(max(self._align(initial_size), self.min_size), self.max_size)
+        self.headroom = headroom
+
+        self._latencies = deque(maxlen=window)
+        # Latencia media por frame de la ventana actual
+        self.measured_latency_ms = None
+        self.adjustments = 0
+
+        print(f"[AUTOTUNE-INIT] Presupuesto {budget_ms:.0f}ms/frame, imgsz inicial {self.current_size} "
+              f"(rango {self.min_size}-{self.max_size}, paso {step})")
+
+    @classmethod
+    def from_config(cls):
+        """
+        Crea el ajustador desde config.py.
+
+        Returns:
+            InputSizeTuner or None: None si CAR_AUTOTUNE_ENABLED es False
+        """
+        if not getattr(config, 'CAR_AUTOTUNE_ENABLED', False):
+            return None
+        return cls(
+            budget_ms=getattr(config, 'CAR_AUTOTUNE_BUDGET_MS', 40.0),
+            initial_size=getattr(config, 'CAR_AUTOTUNE_INITIAL_IMGSZ', 640),
+            min_size=getattr(config, 'CAR_AUTOTUNE_MIN_IMGSZ', 256),
+            max_size=getattr(config, 'CAR_AUTOTUNE_MAX_IMGSZ', 1280),
+            window=getattr(config, 'CAR_AUTOTUNE_WINDOW', 30),
+        )
+
+    def _align(self, size):
+        """Redondea al multiplo del paso mas cercano (minimo un paso)."""
+        return max(self.step, int(round(size / float(self.step))) * self.step)
+
+    def record(self, elapsed_ms, frames=1):
+        """
+        Registra la latencia de una llamada al detector y ajusta el tamano si
+        la ventana esta completa.
+
+        Args:
+            elapsed_ms (float): Duracion total de la llamada
+            frames (int): Frames procesados en la llamada (batch)
+
+        Returns:
+            int: Tamano de entrada a usar en la proxima deteccion
+        """
+        if frames <= 0:
+            return self.current_size
+
+        per_frame = elapsed_ms / frames
+        self._latencies.extend([per_frame] * frames)
+        self.measured_latency_ms = sum(self._latencies) / len(self._latencies)
+        if len(self._latencies) < self._latencies.maxlen:
+            return self.current_size
+
+        new_size = self.current_size
+        if self.measured_latency_ms > self.budget_ms:
+            new_size = max(self.min_size, self.current_size - self.step)
+        elif self.measured_latency_ms < self.budget_ms * (1.0 - self.headroom):
+            new_size = min(self.max_size, self.current_size + self.step)
+
+        if new_size != self.current_size:
+            print(f"[AUTOTUNE] {self.measured_latency_ms:.1f}ms/frame (presupuesto {self.budget_ms:.0f}ms): "
+                  f"imgsz {self.current_size} -> {new_size}")
+            self.current_size = new_size
+            self.adjustments += 1
+            self._latencies.clear()
+
+        return self.current_size
+
+    def get_stats(self):
+        """
+        Estado actual del ajuste.
+
+        Returns:
+            dict: {'imgsz': int, 'latency_ms': float|None, 'budget_ms': float, 'adjustments': int}
+        """
+        return {
+            'imgsz': self.current_size,
+            'latency_ms': self.measured_latency_ms,
+            'budget_ms': self.budget_ms,
+            'adjustments': self.adjustments,
+        }
@@ -0,0 +1,84 @@
+import threading
+import time
+import traceback
+
+
+class BackgroundModel:
+    # Estados posibles (para la UI)
+    PENDING = 'pending'
+    LOADING = 'loading'
+    READY = 'ready'
+    ERROR = 'error'
+
+    def __init__(self, name, factory, warmup=True):
+        """
+        Construye un modelo en un hilo propio para que la aplicacion arranque
+        sin esperarlo. Varios BackgroundModel cargan en paralelo.
+
+        Args:
+            name (str): Nombre para logs y para el estado de la UI
+            factory (callable): Funcion sin argumentos que crea el modelo
+            warmup (bool): Llamar model.warmup() (si existe) antes de marcarlo listo,
+                           asi la primera inferencia real no paga la inicializacion
+        """
+        self.name = name
+        self.factory = factory
+        self.warmup = warmup
+        self.status = self.PENDING
+        self.model = None
+        self.error = None
+        self.load_seconds = None
+        self._done = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Lanza la carga en un hilo daemon (no hace nada si ya se lanzo)."""
+        if self._thread is None:
+            self.status = self.LOADING
+            self._thread = threading.Thread(target=self._load, name=f"load-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def _load(self):
+        """Crea (y calienta) el modelo; guarda el error si falla."""
+        start = time.perf_counter()
+        try:
+            model = self.factory()
+            if self.warmup and hasattr(model, 'warmup'):
+                model.warmup()
+            self.model = model
+            self.status = self.READY
+            self.load_seconds = time.perf_counter() - start
+            print(f"[MODEL-LOADER] {self.name} listo en {self.load_seconds:.1f}s")
+        except Exception as e:
+            self.error = e
+            self.status = self.ERROR
+            print(f"[MODEL-LOADER] Error cargando {self.name}: {str(e)}\n{traceback.format_exc()}")
+        finally:
+            self._done.set()
+
+    @property
+    def ready(self):
+        """True si el modelo ya se puede usar."""
+        return self.status == self.READY
+
+    def wait(self, timeout=None):
+        """
+        Espera a que termine la carga.
+
+        Args:
+            timeout (float): Segundos maximos de espera (None = sin limite)
+
+        Returns:
+            object: El modelo cargado
+
+        Raises:
+            TimeoutError: Si no termino dentro del timeout
+            RuntimeError: Si la carga fallo
+        """
+        self.start()
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"{self.name} sigue cargando")
+        if self.status == self.ERROR:
+            raise RuntimeError(f"No se pudo cargar {self.name}: {self.error}")
+        return self.model
@@ -0,0 +1,144 @@
+import os
+import threading
+
+import numpy as np
+
+from .inference import load_yolo_backend
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+class SharedModel:
+    def __init__(self, model, name, locked_methods, warmup_fn=None):
+        """
+        Modelo compartido entre pipelines. Los metodos de inferencia se
+        serializan con un lock (ultralytics y EasyOCR guardan estado interno
+        entre llamadas y no son seguros con hilos concurrentes); el resto de
+        los atributos se delegan tal cual al modelo.
+
+        Args:
+            model: Backend YOLO o easyocr.Reader
+            name (str): Nombre para logs
+            locked_methods (tuple): Metodos que se ejecutan bajo el lock (si existen)
+            warmup_fn (callable): Recibe el SharedModel y hace una inferencia de prueba
+        """
+        self._model = model
+        self._name = name
+        self._lock = threading.Lock()
+        self._warmup_fn = warmup_fn
+        self._warmed_up = False
+        for method_name in locked_methods:
+            if hasattr(model, method_name):
+                setattr(self, method_name, self._locked(getattr(model, method_name)))
+
+    def _locked(self, method):
+        """Envuelve un metodo del modelo para que corra bajo el lock."""
+        def call(*args, **kwargs):
+            with self._lock:
+                return method(*args, **kwargs)
+        return call
+
+    def __getattr__(self, attr):
+        return getattr(self._model, attr)
+
+    def warmup(self):
+        """Inferencia sobre una entrada vacia la primera vez (no hace nada despues)."""
+        if self._warmed_up or self._warmup_fn is None:
+            return
+        self._warmup_fn(self)
+        self._warmed_up = True
+        print(f"[MODEL-REGISTRY] {self._name} calentado")
+
+
+_models = {}
+_registry_lock = threading.Lock()
+_key_locks = {}
+
+
+def _get_or_create(key, create):
+    """
+    Devuelve el modelo de la clave o lo crea una sola vez. Dos pipelines que
+    piden la misma clave a la vez esperan la misma carga; claves distintas
+    cargan en paralelo.
+    """
+    with _registry_lock:
+        if key in _models:
+            return _models[key]
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        with _registry_lock:
+            if key in _models:
+                return _models[key]
+        model = create()
+        with _registry_lock:
+            _models[key] = model
+        return model
+
+
+def _warmup_yolo(model):
+    model.predict([np.zeros((64, 64, 3), dtype=np.uint8)])
+
+
+def _warmup_reader(reader):
+    reader.readtext(np.zeros((32, 96), dtype=np.uint8), detail=1)
+
+
+def get_yolo_model(model_path, backend=None):
+    """
+    Backend YOLO compartido por todo el proceso, indexado por ruta y backend.
+    La primera llamada carga los pesos y hace la inferencia de calentamiento.
+
+    Args:
+        model_path (str): Ruta al modelo .pt
+        backend (str): 'ultralytics' o 'onnx' (None = config.INFERENCE_BACKEND)
+
+    Returns:
+        SharedModel: Backend con predict() seguro entre hilos
+    """
+    backend = backend or getattr(config, 'INFERENCE_BACKEND', 'ultralytics')
+    key = ('yolo', os.path.abspath(model_path), backend)
+
+    def create():
+        model = SharedModel(load_yolo_backend(model_path, backend), os.path.basename(model_path),
+                            ('predict',), warmup_fn=_warmup_yolo)
+        if getattr(config, 'MODEL_WARMUP_ENABLED', True):
+            model.warmup()
+        return model
+
+    return _get_or_create(key, create)
+
+
+def get_ocr_reader(languages=('es', 'en'), gpu=False):
+    """
+    easyocr.Reader compartido por todo el proceso, indexado por idiomas y GPU.
+
+    Args:
+        languages (tuple): Idiomas del reader
+        gpu (bool): Usar GPU
+
+    Returns:
+        SharedModel: Reader con readtext/readtext_batched seguros entre hilos
+    """
+    key = ('easyocr', tuple(languages), bool(gpu))
+
+    def create():
+        import easyocr
+
+        print("[MODEL-REGISTRY] Inicializando EasyOCR (puede tardar en primera ejecucion)...")
+        reader = SharedModel(easyocr.Reader(list(languages), gpu=gpu), 'easyocr',
+                             ('readtext', 'readtext_batched'), warmup_fn=_warmup_reader)
+        if getattr(config, 'MODEL_WARMUP_ENABLED', True):
+            reader.warmup()
+        return reader
+
+    return _get_or_create(key, create)
+
+
+def loaded_models():
+    """Claves de los modelos cargados (para logs y diagnostico)."""
+    with _registry_lock:
+        return list(_models)
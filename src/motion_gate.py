@@ -0,0 +1,161 @@
+import cv2
+import numpy as np
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+class MotionGate:
+    def __init__(self, method='diff', scale_width=160, pixel_threshold=25,
+                 min_motion_ratio=0.002, max_skip_frames=30):
+        """
+        Compuerta de movimiento barata que decide si vale la pena correr YOLO.
+        Trabaja sobre una version reducida del frame en escala de grises.
+
+        Args:
+            method (str): 'diff' (diferencia con el frame anterior) o 'mog2'
+                          (sustractor de fondo de OpenCV)
+            scale_width (int): Ancho del frame reducido para el analisis
+            pixel_threshold (int): Diferencia minima de gris para contar un pixel como movimiento
+            min_motion_ratio (float): Fraccion minima de pixeles en movimiento (0.0-1.0)
+            max_skip_frames (int): Forzar deteccion tras N frames saltados seguidos
+                                   (por si un vehiculo aparece sin moverse)
+        """
+        self.method = method
+        self.scale_width = scale_width
+        self.pixel_threshold = pixel_threshold
+        self.min_motion_ratio = min_motion_ratio
+        self.max_skip_frames = max_skip_frames
+
+        self._previous = None
+        self._subtractor = None
+        self._consecutive_skips = 0
+
+        # Estadisticas de ahorro
+        self.frames_checked = 0
+        self.frames_skipped = 0
+
+        print(f"[MOTION-INIT] MotionGate ({method}) - ancho: {scale_width}px, "
+              f"umbral: {min_motion_ratio:.2%} de pixeles, forzar cada {max_skip_frames} frames")
+
+    @classmethod
+    def from_config(cls):
+        """
+        Crea la compuerta desde config.py.
+
+        Returns:
+            MotionGate or None: None si MOTION_GATE_ENABLED es False
+        """
+        if not getattr(config, 'MOTION_GATE_ENABLED', False):
+            return None
+        return cls(
+            method=getattr(config, 'MOTION_GATE_METHOD', 'diff'),
+            scale_width=getattr(config, 'MOTION_GATE_SCALE_WIDTH', 160),
+            pixel_threshold=getattr(config, 'MOTION_GATE_PIXEL_THRESHOLD', 25),
+            min_motion_ratio=getattr(config, 'MOTION_GATE_MIN_RATIO', 0.002),
+            max_skip_frames=getattr(config, 'MOTION_GATE_MAX_SKIP_FRAMES', 30),
+        )
+
+    def _preprocess(self, frame):
+        """Reduce el frame y lo pasa a gris suavizado."""
+        h, w = frame.shape[:2]
+        scale = self.scale_width / float(w)
+        small = cv2.resize(frame, (self.scale_width, max(1, int(h * scale))),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def detect_motion(self, frame):
+        """
+        Indica si hay movimiento respecto al estado anterior y actualiza la referencia.
+
+        Args:
+            frame: Frame de video (numpy array BGR)
+
+        Returns:
+            bool: True si la fraccion de pixeles en movimiento supera el umbral
+        """
+        gray = self._preprocess(frame)
+
+        if self.method == 'mog2':
+            if self._subtractor is None:
+                self._subtractor = cv2.createBackgroundSubtractorMOG2(
+                    history=200, varThreshold=self.pixel_threshold, detectShadows=False
+                )
+                self._subtractor.apply(gray)
+                return True
+            motion_mask = self._subtractor.apply(gray) > 0
+        else:
+            if self._previous is None or self._previous.shape != gray.shape:
+                self._previous = gray
+                return True
+            motion_mask = cv2.absdiff(gray, self._previous) > self.pixel_threshold
+            self._previous = gray
+
+        return float(np.count_nonzero(motion_mask)) / motion_mask.size >= self.min_motion_ratio
+
+    def should_detect(self, frame, has_active_tracks):
+        """
+        Decide si se debe correr el detector en este frame.
+
+        Args:
+            frame: Frame de video (numpy array BGR)
+            has_active_tracks (bool): Si el tracker tiene tracks vivos
+
+        Returns:
+            bool: True si hay que detectar, False si se puede saltar
+        """
+        return self.should_detect_batch([frame], has_active_tracks)
+
+    def should_detect_batch(self, frames, has_active_tracks):
+        """
+        Decide para un grupo de frames consecutivos (deteccion por batch).
+        Se detecta el batch completo si cualquiera de los frames tiene movimiento.
+
+        Args:
+            frames (list): Frames de video consecutivos
+            has_active_tracks (bool): Si el tracker tiene tracks vivos
+
+        Returns:
+            bool: True si hay que detectar, False si se puede saltar
+        """
+        # Analizar todos los frames para mantener la referencia al dia
+        motion = [self.detect_motion(frame) for frame in frames]
+        self.frames_checked += len(frames)
+
+        detect = (
+            has_active_tracks or
+            any(motion) or
+            self._consecutive_skips + len(frames) > self.max_skip_frames
+        )
+
+        if detect:
+            self._consecutive_skips = 0
+        else:
+            self._consecutive_skips += len(frames)
+            self.frames_skipped += len(frames)
+
+        return detect
+
+    def get_stats(self):
+        """
+        Estadisticas de frames saltados.
+
+        Returns:
+            dict: {'frames_checked': int, 'frames_skipped': int, 'skip_ratio': float}
+        """
+        return {
+            'frames_checked': self.frames_checked,
+            'frames_skipped': self.frames_skipped,
+            'skip_ratio': self.frames_skipped / self.frames_checked if self.frames_checked else 0.0
+        }
+
+    def reset(self):
+        """Limpia la referencia de fondo y las estadisticas (nuevo video)."""
+        self._previous = None
+        self._subtractor = None
+        self._consecutive_skips = 0
+        self.frames_checked = 0
+        self.frames_skipped = 0
@@ -0,0 +1,138 @@
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+def dhash(image, hash_size=(32, 8), dead_zone=4):
+    """
+    Hash perceptual por diferencias (dHash) de una imagen.
+    Se reduce a (ancho + 1) x alto en gris y cada bit indica si un pixel es
+    mas claro que su vecino izquierdo por mas de dead_zone niveles. Recortes
+    casi identicos (mismo vehiculo quieto, ruido de camara) dan hashes a pocos
+    bits de distancia.
+
+    El hash es apaisado como la placa: con 32 columnas un solo caracter
+    distinto cambia ~10 bits. La zona muerta evita que el fondo liso de la
+    placa cambie de bit con el ruido del sensor.
+
+    Args:
+        image: Imagen numpy (BGR o gris)
+        hash_size (tuple): (ancho, alto) del hash en bits
+        dead_zone (int): Diferencia minima de gris para marcar un bit
+
+    Returns:
+        int: Hash de ancho * alto bits
+    """
+    width, height = hash_size
+    gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (width + 1, height), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = ((small[:, 1:] - small[:, :-1]) > dead_zone).flatten()
+    return int(np.packbits(bits).tobytes().hex(), 16)
+
+
+class PlateOCRCache:
+    def __init__(self, max_size=256, max_distance=5, hash_size=(32, 8)):
+        """
+        Cache LRU de resultados de OCR indexada por el dHash del recorte de la placa.
+        Un recorte reutiliza el resultado de otro si sus hashes difieren en
+        max_distance bits o menos (distancia de Hamming).
+
+        Args:
+            max_size (int): Entradas maximas (se descarta la menos usada)
+            max_distance (int): Distancia de Hamming maxima para considerar hit
+            hash_size (tuple): (ancho, alto) del dHash en bits
+        """
+        self.max_size = max_size
+        self.max_distance = max_distance
+        self.hash_size = hash_size
+        self._entries = OrderedDict()  # hash -> resultado
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls):
+        """
+        Crea la cache desde config.py.
+
+        Returns:
+            PlateOCRCache or None: None si OCR_CACHE_ENABLED es False
+        """
+        if not getattr(config, 'OCR_CACHE_ENABLED', True):
+            return None
+        return cls(
+            max_size=getattr(config, 'OCR_CACHE_SIZE', 256),
+            max_distance=getattr(config, 'OCR_CACHE_MAX_DISTANCE', 5),
+            hash_size=tuple(getattr(config, 'OCR_CACHE_HASH_SIZE', (32, 8))),
+        )
+
+    def hash(self, plate_image):
+        """dHash del recorte de la placa con el tamano configurado."""
+        return dhash(plate_image, self.hash_size)
+
+    def get(self, plate_hash):
+        """
+        Busca un resultado para el hash (exacto o dentro de la tolerancia).
+
+        Args:
+            plate_hash (int): dHash del recorte de la placa
+
+        Returns:
+            dict or None: Resultado cacheado (copia) o None si es miss
+        """
+        key = plate_hash if plate_hash in self._entries else self._nearest(plate_hash)
+        if key is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(self._entries[key])
+
+    def _nearest(self, plate_hash):
+        """Entrada mas cercana dentro de max_distance, o None."""
+        best_key, best_distance = None, self.max_distance + 1
+        for key in self._entries:
+            distance = bin(key ^ plate_hash).count('1')
+            if distance < best_distance:
+                best_key, best_distance = key, distance
+        return best_key
+
+    def put(self, plate_hash, result):
+        """
+        Guarda el resultado de OCR de un recorte.
+
+        Args:
+            plate_hash (int): dHash del recorte de la placa
+            result (dict): {'text': str, 'confidence': float}
+        """
+        self._entries[plate_hash] = dict(result)
+        self._entries.move_to_end(plate_hash)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_stats(self):
+        """
+        Contadores de la cache.
+
+        Returns:
+            dict: {'hits': int, 'misses': int, 'hit_ratio': float, 'size': int}
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+        }
+
+    def clear(self):
+        """Vacia la cache y los contadores (nuevo video)."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -1,12 +1,19 @@
 import cv2
 import config
 from datetime import datetime
-from .car_detector import CarDetector
+from .car_detector import CarDetector, VehicleDetections
 from .plate_recognizer import PlateRecognizer
+from .plate_consensus import PlateConsensus
+from .plate_quality import PlateCropBuffer
+from .attribute_vote import AttributeVote
 from .classifier import VehicleClassifier
 from .tracker import VehicleTracker
 from .database import DatabaseManager
 from .event_detector import EventDetector
+from .roi import DetectionROI
+from .motion_gate import MotionGate
+from .crop_cache import FrameCropCache
+from .model_loader import BackgroundModel
 
 
 class VehicleDetectionPipeline:
@@ -31,9 +38,28 @@ class VehicleDetectionPipeline:
         
         # Modulos principales (FASE 1)
         print("\n[PIPELINE-INIT] Cargando modulos principales...")
+        # El detector de vehiculos carga primero (la vista previa y el tracking
+        # arrancan con el); OCR y marcas cargan en paralelo en background
         self.car_detector = CarDetector(min_confidence=car_min_confidence)
-        self.plate_recognizer = PlateRecognizer()
-        self.vehicle_classifier = VehicleClassifier()
+        self._model_loaders = {
+            'plate_recognizer': BackgroundModel('plate_recognizer', PlateRecognizer),
+            'vehicle_classifier': BackgroundModel('vehicle_classifier', VehicleClassifier),
+        }
+        for loader in self._model_loaders.values():
+            loader.start()
+        if not getattr(config, 'MODEL_BACKGROUND_LOADING', True):
+            self.wait_until_ready()
+        else:
+            print("[PIPELINE-INIT] OCR y clasificador de marcas cargando en background")
+        
+        # Region de interes para el detector de vehiculos (None = frame completo)
+        self.detection_roi = DetectionROI.from_config()
+        
+        # Compuerta de movimiento: salta YOLO en frames estaticos sin tracks activos
+        self.motion_gate = MotionGate.from_config()
+        
+        # Vistas de cada recorte (letterbox, ROI de color) compartidas por las etapas del frame
+        self.crop_cache = FrameCropCache.from_config()
         
         # Tracker (FASE 2A)
         print("\n[PIPELINE-INIT] Inicializando sistema de tracking...")
@@ -88,6 +114,30 @@ class VehicleDetectionPipeline:
             self.redetection_interval = getattr(config, 'REDETECTION_INTERVAL_VIDEO', 5)
 
         print(f"[PIPELINE-INIT] Modo: {mode}, Intervalo re-deteccion: {self.redetection_interval} frames")
+        
+        # CarDetector corre 1 de cada N frames; en el resto el tracker predice (Kalman)
+        self.detection_interval = max(1, int(getattr(config, 'DETECTION_FRAME_INTERVAL', 1)))
+        print(f"[PIPELINE-INIT] Detector de vehiculos cada {self.detection_interval} frame(s)")
+        
+        # Deteccion de placas: 'per_vehicle' (YOLO por recorte) o 'full_frame' (una pasada)
+        self.plate_detection_mode = getattr(config, 'PLATE_DETECTION_MODE', 'per_vehicle')
+        print(f"[PIPELINE-INIT] Deteccion de placas: {self.plate_detection_mode}")
+        
+        # Consenso de placa por track (votacion entre lecturas OCR)
+        self.plate_consensus_enabled = getattr(config, 'PLATE_CONSENSUS_ENABLED', True)
+        self.plate_consensus = {}  # track_id -> PlateConsensus
+        self._ocr_skipped = 0
+        
+        # Calidad de recorte de placa: OCR solo si mejora al mejor recorte del track
+        self.plate_quality_enabled = getattr(config, 'PLATE_QUALITY_ENABLED', True)
+        self.plate_crop_buffers = {}  # track_id -> PlateCropBuffer
+        self._ocr_low_quality = 0
+        
+        # Atributos por track: cada uno (placa, marca, color) se recalcula solo si
+        # falta o vencio su intervalo; marca y color se congelan tras K lecturas iguales
+        self.attribute_votes = {}  # track_id -> {'brand': AttributeVote, 'color': AttributeVote}
+        self.frozen_refresh_factor = max(1, int(getattr(config, 'ATTRIBUTE_FROZEN_REFRESH_FACTOR', 4)))
+        self._attribute_runs = {name: 0 for name in ('plate', 'brand', 'color')}
         self.known_vehicles = {}  # track_id -> vehicle_info (cache)
         
         # Mapeo placa -> track_id para re-identificacion
@@ -126,6 +176,16 @@ class VehicleDetectionPipeline:
         self.frame_count = 0
         self.known_vehicles = {}
         self.plate_to_track = {}
+        self.plate_consensus = {}
+        self._ocr_skipped = 0
+        self.plate_crop_buffers = {}
+        self._ocr_low_quality = 0
+        self.attribute_votes = {}
+        self._attribute_runs = {name: 0 for name in self._attribute_runs}
+        if self.plate_recognizer and self.plate_recognizer.ocr_cache:
+            self.plate_recognizer.ocr_cache.clear()
+        if self.crop_cache:
+            self.crop_cache.clear()
         
         # Reset estadisticas temporales de video
         self._video_stats = {
@@ -140,8 +200,51 @@ class VehicleDetectionPipeline:
         if self.enable_events and self.event_detector:
             self.event_detector.reset_history()
         
+        # Reset compuerta de movimiento (nuevo fondo)
+        if self.motion_gate:
+            self.motion_gate.reset()
+        
         print("[PIPELINE-RESET] Pipeline reseteado - IDs comenzaran desde 1\n")
     
+    @property
+    def plate_recognizer(self):
+        """PlateRecognizer (None mientras carga en background)."""
+        return self._model_loaders['plate_recognizer'].model
+    
+    @property
+    def vehicle_classifier(self):
+        """VehicleClassifier (None mientras carga en background)."""
+        return self._model_loaders['vehicle_classifier'].model
+    
+    @property
+    def models_ready(self):
+        """True cuando OCR y clasificador de marcas ya estan cargados."""
+        return all(loader.ready for loader in self._model_loaders.values())
+    
+    def get_model_status(self):
+        """
+        Estado de carga de cada modelo (para la UI).
+        
+        Returns:
+            dict: {nombre: 'pending'|'loading'|'ready'|'error'}
+        """
+        status = {'car_detector': BackgroundModel.READY}
+        status.update({name: loader.status for name, loader in self._model_loaders.items()})
+        return status
+    
+    def wait_until_ready(self, timeout=None):
+        """
+        Bloquea hasta que OCR y clasificador de marcas esten cargados.
+        
+        Args:
+            timeout (float): Segundos maximos por modelo (None = sin limite)
+            
+        Raises:
+            RuntimeError: Si algun modelo no se pudo cargar
+        """
+        for loader in self._model_loaders.values():
+            loader.wait(timeout)
+    
     def get_video_stats(self):
         """
         Obtiene estadisticas temporales del video en proceso.
@@ -272,20 +375,34 @@ class VehicleDetectionPipeline:
             
             # 3. Procesar cada vehiculo detectado
             print(f"[PIPELINE-IMAGE] Paso 3: Procesando {len(vehicle_detections)} detecciones...")
+            if not self.models_ready:
+                print("[PIPELINE-IMAGE] Esperando modelos de OCR y marcas...")
+                self.wait_until_ready()
+            
+            # Recortar vehiculos de la imagen original
+            vehicle_crops = []
+            for detection in vehicle_detections:
+                x1, y1, x2, y2 = detection['bbox']
+                vehicle_crops.append(image[y1:y2, x1:x2])
+            crop_views = self._crop_views(range(len(vehicle_crops)), vehicle_crops)
+            
+            # 4. Reconocer placas (dict con texto y bbox) de todos los vehiculos por batch
+            print(f"[PIPELINE-IMAGE] Reconociendo placas de {len(vehicle_crops)} vehiculos...")
+            plate_results = self._recognize_plates_batch(
+                vehicle_crops, frame=image, vehicle_boxes=[d['bbox'] for d in vehicle_detections],
+                views=crop_views
+            )
+            
+            # 5. Clasificar marca y color de todos los vehiculos por batch
+            print(f"[PIPELINE-IMAGE] Clasificando marca y color de {len(vehicle_crops)} vehiculos...")
+            classifications = self._classify_batch(vehicle_crops, views=crop_views)
+            
             for idx, detection in enumerate(vehicle_detections):
                 try:
-                    x1, y1, x2, y2 = detection['bbox']
-                    
-                    # Recortar vehiculo de la imagen original
-                    vehicle_crop = image[y1:y2, x1:x2]
-                    
-                    # 4. Reconocer placa (retorna dict con texto y bbox)
-                    print(f"[PIPELINE-IMAGE] Vehiculo {idx+1}: Reconociendo placa...")
-                    plate_result = self.plate_recognizer.recognize_plate(vehicle_crop)
-                    
-                    # 5. Clasificar marca y color
-                    print(f"[PIPELINE-IMAGE] Vehiculo {idx+1}: Clasificando marca y color...")
-                    classification = self.vehicle_classifier.classify(vehicle_crop)
+                    plate_result = plate_results[idx]
+                    classification = classifications[idx]
+                    if plate_result is None or classification is None:
+                        continue
                     
                     # Determinar estado de la placa
                     plate_text = plate_result['text']
@@ -336,12 +453,132 @@ class VehicleDetectionPipeline:
                 'detections': []
             }
     
-    def process_video_frame(self, frame):
+    def _detect_vehicles_batch(self, frames):
+        """
+        Detecta vehiculos en uno o varios frames de video respetando la ROI.
+        Si hay ROI configurada, YOLO solo ve el recorte y las cajas se mapean de
+        vuelta a coordenadas del frame completo.
+        
+        Args:
+            frames (list): Frames de video (numpy arrays BGR, mismo tamano)
+            
+        Returns:
+            list: Detecciones por frame en coordenadas del frame completo
+        """
+        if self.detection_roi is None:
+            return self.car_detector.detect_vehicles_batch(frames)
+        
+        crops = []
+        offsets = []
+        for frame in frames:
+            crop, offset = self.detection_roi.crop(frame)
+            crops.append(crop)
+            offsets.append(offset)
+        
+        valid = [idx for idx, crop in enumerate(crops) if crop is not None]
+        batch_detections = [VehicleDetections.empty() for _ in frames]
+        if not valid:
+            return batch_detections
+        
+        # Los filtros de tamano se evaluan contra el frame completo, no contra la ROI
+        crop_detections = self.car_detector.detect_vehicles_batch(
+            [crops[idx] for idx in valid], frame_shape=frames[valid[0]].shape
+        )
+        for idx, detections in zip(valid, crop_detections):
+            batch_detections[idx] = detections.shifted(*offsets[idx])
+        
+        return batch_detections
+    
+    def process_video_batch(self, frames):
+        """
+        Procesa varios frames consecutivos de video.
+        La deteccion de vehiculos se hace en un solo batch; tracking, eventos y
+        dibujo se siguen ejecutando frame por frame y en orden.
+        
+        Args:
+            frames (list): Frames de video consecutivos (numpy arrays BGR)
+            
+        Returns:
+            list: Un resultado por frame (mismo formato que process_video_frame)
+                  mas 'video_stats': copia de get_video_stats() justo despues
+                  de ese frame (no al final del batch)
+        """
+        # Escena estatica sin tracks: saltar deteccion, tracking y dibujo de todo el batch
+        static = False
+        if self.motion_gate:
+            try:
+                static = not self.motion_gate.should_detect_batch(frames, bool(self.tracker.tracks))
+            except Exception as e:
+                print(f"[PIPELINE-ERROR] Error en compuerta de movimiento: {str(e)}")
+        if static:
+            results = []
+            for frame in frames:
+                self.frame_count += 1
+                results.append(self._with_video_stats(self._skip_static_frame(frame)))
+            return results
+        
+        # Solo se detectan los frames que tocan segun detection_interval;
+        # en el resto el tracker predice las cajas
+        detect_indices = [
+            idx for idx in range(len(frames))
+            if self._is_detection_frame(self.frame_count + idx + 1)
+        ]
+        batch_detections = [None] * len(frames)
+        
+        try:
+            if detect_indices:
+                detected = self._detect_vehicles_batch([frames[idx] for idx in detect_indices])
+                for idx, detections in zip(detect_indices, detected):
+                    batch_detections[idx] = detections
+        except Exception as e:
+            print(f"[PIPELINE-ERROR] Error en deteccion por batch: {str(e)}")
+            # Fallback: detectar frame por frame
+            batch_detections = [None] * len(frames)
+        
+        # La compuerta ya se evaluo para todo el batch: el fallback frame por
+        # frame no la vuelve a evaluar (no se cuentan dos veces los frames).
+        # Un error en un frame no afecta al resto del batch
+        results = []
+        for frame, detections in zip(frames, batch_detections):
+            try:
+                result = self.process_video_frame(frame, vehicle_detections=detections,
+                                                  motion_checked=self.motion_gate is not None)
+            except Exception as e:
+                print(f"[PIPELINE-ERROR] Error procesando frame {self.frame_count} del batch: {str(e)}")
+                result = {'annotated_image': frame.copy(), 'detections': [], 'tracks': [], 'events': []}
+            results.append(self._with_video_stats(result))
+        return results
+    
+    def _with_video_stats(self, result):
+        """Agrega al resultado de un frame la foto de get_video_stats() en ese momento."""
+        result['video_stats'] = self.get_video_stats()
+        return result
+    
+    def _is_detection_frame(self, frame_number):
+        """
+        Indica si el detector corre en este frame (1 de cada detection_interval).
+        
+        Args:
+            frame_number (int): Numero de frame (empieza en 1)
+            
+        Returns:
+            bool: True si se ejecuta CarDetector, False si solo predice el tracker
+        """
+        return (frame_number - 1) % self.detection_interval == 0
+    
+    def process_video_frame(self, frame, vehicle_detections=None, motion_checked=False):
         """
         Procesa un frame de video con tracking, BD y eventos.
         
         Args:
             frame: Frame de video (numpy array BGR)
+            vehicle_detections (list): Detecciones ya calculadas para este frame
+                                       (ej. por process_video_batch). Si es None
+                                       se ejecuta el detector sobre el frame, o
+                                       solo se predicen las cajas si no es un
+                                       frame de deteccion (detection_interval).
+            motion_checked (bool): La compuerta de movimiento ya se evaluo para
+                                   este frame (ej. process_video_batch)
             
         Returns:
             dict: {
@@ -361,11 +598,23 @@ class VehicleDetectionPipeline:
             print(f"\n[PIPELINE-VIDEO] Procesando frame {self.frame_count}...")
         
         try:
-            # 1. Detectar vehiculos
-            vehicle_detections = self.car_detector.detect_vehicles(frame)
+            run_detector = vehicle_detections is not None or self._is_detection_frame(self.frame_count)
             
-            # 2. Tracking - asignar IDs
-            tracks = self.tracker.update(vehicle_detections)
+            # 0. Compuerta de movimiento (una sola vez por frame: el camino por batch ya la evaluo)
+            if (vehicle_detections is None and not motion_checked and run_detector and self.motion_gate and
+                    not self.motion_gate.should_detect(frame, bool(self.tracker.tracks))):
+                return self._skip_static_frame(frame)
+            
+            if run_detector:
+                # 1. Detectar vehiculos (si no vienen precalculadas del batch)
+                if vehicle_detections is None:
+                    vehicle_detections = self._detect_vehicles_batch([frame])[0]
+                
+                # 2. Tracking - asignar IDs
+                tracks = self.tracker.update(vehicle_detections)
+            else:
+                # 1-2. Frame sin detector: el Kalman predice las cajas de cada track
+                tracks = self.tracker.predict()
             
             # NUEVO: Filtrar tracks que no fueron detectados recientemente
             # Solo mostrar vehiculos que fueron vistos recientemente
@@ -373,7 +622,11 @@ class VehicleDetectionPipeline:
             tracks = [t for t in tracks if t.get('time_since_update', 0) <= max_frames_without_detection]
             
             # 3. Para cada track, clasificar si es nuevo o actualizar bbox
-            for track in tracks:
+            # 3a. Recolectar los vehiculos que necesitan placa/marca en este frame
+            # (mientras OCR/marcas cargan en background solo se trackea; los tracks
+            # se registran como nuevos cuando los modelos esten listos)
+            pending = []
+            for track in (tracks if self.models_ready else []):
                 track_id = track['id']
                 
                 try:
@@ -390,122 +643,65 @@ class VehicleDetectionPipeline:
                     if track_id not in self.known_vehicles:
                         # Vehiculo nuevo, clasificar
                         print(f"[PIPELINE-VIDEO] Nuevo vehiculo detectado - Track ID: {track_id}")
-                        
-                        plate_info = self.plate_recognizer.recognize_plate(vehicle_crop)
-                        classification = self.vehicle_classifier.classify(vehicle_crop)
-                        
-                        # Generar placa final (con ID temporal si no tiene placa)
-                        plate_text = plate_info['text']
-                        temp_prefix = getattr(config, 'TEMP_PLATE_PREFIX', 'TEMP_')
-                        
-                        # Verificar si es placa real (no temporal)
-                        is_real_plate = plate_text not in ["SIN PLACA", "NO DETECTADA"]
-                        
-                        # NUEVO: Intentar recuperar datos existentes por placa
-                        recovered_data = None
-                        if is_real_plate:
-                            # Primero intentar desde cache (mismo video/sesion)
-                            recovered_data = self._recover_vehicle_from_cache(plate_text)
-                            
-                            # Si no esta en cache, intentar desde BD (modo camara)
-                            if not recovered_data and self.mode == 'camera':
-                                recovered_data = self._recover_vehicle_from_db(plate_text)
-                        
-                        if recovered_data:
-                            # Usar datos recuperados (mantener atributos originales)
-                            print(f"[PIPELINE-VIDEO] Re-identificado vehiculo por placa: {plate_text}")
-                            if recovered_data.get('from_db'):
-                                print(f"[PIPELINE-VIDEO]   -> Recuperado de BD")
-                            elif recovered_data.get('from_cache'):
-                                print(f"[PIPELINE-VIDEO]   -> Recuperado de cache (track anterior: {recovered_data.get('old_track_id')})")
-                            
-                            vehicle_data = {
-                                'plate': recovered_data['plate'],
-                                'plate_bbox': [int(x) for x in plate_info['bbox']] if plate_info['bbox'] else None,
-                                'brand': recovered_data['brand'],
-                                'brand_bbox': [int(x) for x in classification['brand_bbox']] if classification['brand_bbox'] else None,
-                                'color': recovered_data['color'],
-                                'last_redetection_frame': self.frame_count,
-                                'reidentified': True
-                            }
-                            
-                            print(f"[PIPELINE-VIDEO]   -> Marca: {vehicle_data['brand']}, Color: {vehicle_data['color']}")
-                        else:
-                            # Vehiculo completamente nuevo
-                            if not is_real_plate:
-                                # Generar ID temporal
-                                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                                plate_text = f"{temp_prefix}{timestamp}_{track_id}"
-                                print(f"[PIPELINE-VIDEO] Placa no legible, usando ID temporal: {plate_text}")
-                            
-                            vehicle_data = {
-                                'plate': plate_text,
-                                'plate_bbox': [int(x) for x in plate_info['bbox']] if plate_info['bbox'] else None,
-                                'brand': classification['brand'],
-                                'brand_bbox': [int(x) for x in classification['brand_bbox']] if classification['brand_bbox'] else None,
-                                'color': classification['color'],
-                                'last_redetection_frame': self.frame_count,
-                                'reidentified': False
-                            }
-                        
-                        self.known_vehicles[track_id] = vehicle_data
-                        
-                        # Actualizar mapeo placa -> track_id
-                        if is_real_plate or recovered_data:
-                            self.plate_to_track[vehicle_data['plate']] = track_id
-                    
+                        pending.append({'track_id': track_id, 'crop': vehicle_crop,
+                                        'bbox': [x1, y1, x2, y2], 'needs': {'plate', 'brand', 'color'},
+                                        'skip_ocr': False, 'min_quality': None})
                     else:
-                        # Vehiculo existente - Re-detectar bbox cada N frames o si falta info
-                        vehicle_data = self.known_vehicles[track_id]
-                        last_redetection = vehicle_data.get('last_redetection_frame', 0)
-                        frames_since_redetection = self.frame_count - last_redetection
-                        
-                        # Usar intervalo segun modo (camera/video)
-                        needs_redetection = (
-                            vehicle_data.get('plate_bbox') is None or
-                            vehicle_data.get('brand_bbox') is None or
-                            frames_since_redetection >= self.redetection_interval
-                        )
-                        
-                        if needs_redetection:
-                            # Re-detectar solo placa y logo (marca/color ya conocidos)
-                            plate_info = self.plate_recognizer.recognize_plate(vehicle_crop)
-                            classification = self.vehicle_classifier.classify(vehicle_crop)
-                            
-                            # Actualizar bbox manteniendo placa/marca/color originales
-                            if plate_info['bbox'] is not None:
-                                vehicle_data['plate_bbox'] = [int(x) for x in plate_info['bbox']]
-                                
-                                # Actualizar texto de placa si se detecto una real
-                                plate_text = plate_info['text']
-                                temp_prefix = getattr(config, 'TEMP_PLATE_PREFIX', 'TEMP_')
-                                
-                                # Si placa actual es temporal Y se detecto una real, actualizar
-                                if (vehicle_data['plate'].startswith(temp_prefix) and 
-                                    plate_text not in ["SIN PLACA", "NO DETECTADA"]):
-                                    
-                                    # Verificar si esta placa ya existe (re-identificacion)
-                                    recovered = self._recover_vehicle_from_cache(plate_text)
-                                    if not recovered and self.mode == 'camera':
-                                        recovered = self._recover_vehicle_from_db(plate_text)
-                                    
-                                    if recovered:
-                                        # Actualizar con datos recuperados
-                                        vehicle_data['plate'] = recovered['plate']
-                                        vehicle_data['brand'] = recovered['brand']
-                                        vehicle_data['color'] = recovered['color']
-                                        vehicle_data['reidentified'] = True
-                                        print(f"[PIPELINE-VIDEO] Placa real detectada y re-identificada para track {track_id}: {plate_text}")
-                                    else:
-                                        # Solo actualizar placa, mantener marca/color actuales
-                                        vehicle_data['plate'] = plate_text
-                                        self.plate_to_track[plate_text] = track_id
-                                        print(f"[PIPELINE-VIDEO] Placa real detectada para track {track_id}: {plate_text}")
-                            
-                            if classification['brand_bbox'] is not None:
-                                vehicle_data['brand_bbox'] = [int(x) for x in classification['brand_bbox']]
-                            
-                            vehicle_data['last_redetection_frame'] = self.frame_count
+                        # Vehiculo existente - recalcular solo los atributos que faltan o vencieron
+                        # (sin OCR si la placa del track ya esta confirmada por consenso
+                        # o si el recorte no mejora al mejor ya leido)
+                        needs = self._stale_attributes(track_id)
+                        if needs:
+                            pending.append({'track_id': track_id, 'crop': vehicle_crop,
+                                            'bbox': [x1, y1, x2, y2], 'needs': needs,
+                                            'skip_ocr': self._plate_frozen(track_id),
+                                            'min_quality': self._plate_min_quality(track_id)})
+                
+                except Exception as e:
+                    print(f"[PIPELINE-ERROR] Error procesando track {track_id}: {str(e)}")
+                    continue
+            
+            # 3b. Placas (YOLO + OCR), marcas y colores de los pendientes del frame por batch,
+            # cada uno solo para los vehiculos que lo necesitan (todas las etapas
+            # comparten las vistas del recorte de cada track)
+            crop_views = self._crop_views([item['track_id'] for item in pending],
+                                          [item['crop'] for item in pending])
+            views_by_track = {item['track_id']: views
+                              for item, views in zip(pending, crop_views or [])}
+            plate_items = [item for item in pending if 'plate' in item['needs']]
+            plate_infos = self._recognize_plates_batch(
+                [item['crop'] for item in plate_items], frame=frame,
+                vehicle_boxes=[item['bbox'] for item in plate_items],
+                skip_ocr=[item['skip_ocr'] for item in plate_items],
+                min_quality=[item['min_quality'] for item in plate_items],
+                views=[views_by_track[item['track_id']] for item in plate_items] if crop_views else None
+            )
+            plate_info_by_track = {item['track_id']: info for item, info in zip(plate_items, plate_infos)}
+            self._attribute_runs['plate'] += len(plate_items)
+            classifications = self._classify_attributes(
+                [item['crop'] for item in pending],
+                need_brand=['brand' in item['needs'] for item in pending],
+                need_color=['color' in item['needs'] for item in pending],
+                views=crop_views
+            )
+            
+            # 3c. Aplicar resultados a cada track
+            for item, classification in zip(pending, classifications):
+                track_id = item['track_id']
+                plate_info = plate_info_by_track.get(track_id)
+                if track_id not in self.known_vehicles and (classification is None or plate_info is None):
+                    # Un track nuevo necesita todo para registrarse: se reintenta el proximo frame
+                    continue
+                
+                try:
+                    if plate_info is not None:
+                        self._record_plate_quality(track_id, plate_info, item['min_quality'])
+                    if track_id not in self.known_vehicles:
+                        self._register_new_vehicle(track_id, plate_info, classification)
+                    else:
+                        # Aplicar lo que se pudo recalcular: marca y color se votan
+                        # aunque la placa haya fallado en este frame (y viceversa)
+                        self._apply_redetection(track_id, plate_info, classification or {})
                 
                 except Exception as e:
                     print(f"[PIPELINE-ERROR] Error procesando track {track_id}: {str(e)}")
@@ -663,6 +859,551 @@ class VehicleDetectionPipeline:
                 'events': []
             }
     
+    def _stale_attributes(self, track_id):
+        """
+        Atributos de un vehiculo conocido que hay que recalcular en este frame.
+        
+        - plate (bbox + OCR): cada frame si falta el bbox, si no cada
+          redetection_interval (x ATTRIBUTE_FROZEN_REFRESH_FACTOR si la placa
+          ya esta confirmada por consenso)
+        - brand (logo + bbox): igual que la placa, congelado por votacion
+        - color: cada redetection_interval hasta quedar congelado; despues nunca
+        
+        Args:
+            track_id (int): ID del track
+            
+        Returns:
+            set: Subconjunto de {'plate', 'brand', 'color'} (vacio = nada que hacer)
+        """
+        vehicle_data = self.known_vehicles[track_id]
+        votes = self.attribute_votes.get(track_id, {})
+        brand_frozen = 'brand' in votes and votes['brand'].frozen
+        color_frozen = 'color' in votes and votes['color'].frozen
+        
+        needs = set()
+        if self._attribute_due(vehicle_data.get('plate_frame', 0),
+                               vehicle_data.get('plate_bbox') is None, self._plate_frozen(track_id)):
+            needs.add('plate')
+        if self._attribute_due(vehicle_data.get('brand_frame', 0),
+                               vehicle_data.get('brand_bbox') is None, brand_frozen):
+            needs.add('brand')
+        if not color_frozen and self._attribute_due(vehicle_data.get('color_frame', 0), False, False):
+            needs.add('color')
+        return needs
+    
+    def _attribute_due(self, last_frame, missing, frozen):
+        """
+        Indica si vencio el intervalo de un atributo.
+        
+        Args:
+            last_frame (int): Frame en que se calculo por ultima vez
+            missing (bool): El atributo falta (ej. bbox None): se reintenta cada frame
+            frozen (bool): El atributo esta congelado: intervalo x frozen_refresh_factor
+            
+        Returns:
+            bool: True si hay que recalcularlo
+        """
+        if frozen:
+            interval = self.redetection_interval * self.frozen_refresh_factor
+        elif missing:
+            interval = 1
+        else:
+            interval = self.redetection_interval
+        return self.frame_count - last_frame >= interval
+    
+    def _crop_views(self, keys, vehicle_crops):
+        """
+        Vistas de los recortes del frame en la cache por frame.
+        
+        Args:
+            keys (iterable): Track ID (o indice) de cada recorte
+            vehicle_crops (list): Recortes de vehiculos
+            
+        Returns:
+            list or None: CropViews por recorte; None si CROP_CACHE_ENABLED es False
+        """
+        if not self.crop_cache:
+            return None
+        self.crop_cache.new_frame()
+        return [self.crop_cache.views(key, crop) for key, crop in zip(keys, vehicle_crops)]
+    
+    def _recognize_plates_batch(self, vehicle_crops, frame=None, vehicle_boxes=None, skip_ocr=None,
+                                min_quality=None, views=None):
+        """
+        Reconoce las placas de todos los vehiculos pendientes del frame en un batch.
+        Si el batch falla se reintenta vehiculo por vehiculo.
+        
+        Args:
+            vehicle_crops (list): Recortes de vehiculos
+            frame: Frame completo (necesario en PLATE_DETECTION_MODE = 'full_frame')
+            vehicle_boxes (list): [x1, y1, x2, y2] de cada recorte en el frame
+            skip_ocr (list): bool por recorte; True = solo bbox de placa, sin OCR
+            min_quality (list): float|None por recorte; calidad minima de la placa para OCR
+            views (list): CropViews por recorte (ver _crop_views)
+            
+        Returns:
+            list: Resultado de recognize_plate por recorte (None si fallo ese vehiculo)
+        """
+        if not vehicle_crops:
+            return []
+        
+        try:
+            plate_regions = None
+            if self.plate_detection_mode == 'full_frame' and frame is not None:
+                plate_regions = self._detect_plates_full_frame(frame, vehicle_boxes, vehicle_crops)
+            if skip_ocr:
+                self._ocr_skipped += sum(1 for skip in skip_ocr if skip)
+            return self.plate_recognizer.recognize_plates_batch(
+                vehicle_crops, plate_regions=plate_regions, skip_ocr=skip_ocr,
+                min_quality=min_quality, views=views
+            )
+        except Exception as e:
+            print(f"[PIPELINE-ERROR] Error en OCR por batch: {str(e)}")
+        
+        plate_infos = []
+        for vehicle_crop in vehicle_crops:
+            try:
+                plate_infos.append(self.plate_recognizer.recognize_plate(vehicle_crop))
+            except Exception as e:
+                print(f"[PIPELINE-ERROR] Error en OCR de vehiculo: {str(e)}")
+                plate_infos.append(None)
+        return plate_infos
+    
+    def _detect_plates_full_frame(self, frame, vehicle_boxes, vehicle_crops):
+        """
+        Una sola deteccion de placas sobre el frame (o la ROI de deteccion)
+        asignada a los vehiculos que las contienen.
+        
+        Args:
+            frame: Frame completo
+            vehicle_boxes (list): [x1, y1, x2, y2] de cada vehiculo
+            vehicle_crops (list): Recorte de cada vehiculo
+            
+        Returns:
+            list: (plate_image, bbox relativo al vehiculo) por vehiculo
+        """
+        search_image, offset = frame, (0, 0)
+        if self.detection_roi:
+            roi_crop, roi_offset = self.detection_roi.crop(frame)
+            if roi_crop is not None:
+                search_image, offset = roi_crop, roi_offset
+        
+        return self.plate_recognizer.detect_plate_regions_full_frame(
+            search_image, vehicle_boxes, vehicle_crops, offset=offset
+        )
+    
+    def _classify_batch(self, vehicle_crops, views=None):
+        """
+        Clasifica marca (YOLO por batch) y color de todos los vehiculos pendientes.
+        Si el batch falla se reintenta vehiculo por vehiculo.
+        
+        Args:
+            vehicle_crops (list): Recortes de vehiculos
+            views (list): CropViews por recorte (ver _crop_views)
+            
+        Returns:
+            list: Resultado de classify por recorte (None si fallo ese vehiculo)
+        """
+        if not vehicle_crops:
+            return []
+        
+        try:
+            return self.vehicle_classifier.classify_batch(vehicle_crops, views)
+        except Exception as e:
+            print(f"[PIPELINE-ERROR] Error en clasificacion por batch: {str(e)}")
+        
+        classifications = []
+        for vehicle_crop in vehicle_crops:
+            try:
+                classifications.append(self.vehicle_classifier.classify(vehicle_crop))
+            except Exception as e:
+                print(f"[PIPELINE-ERROR] Error clasificando vehiculo: {str(e)}")
+                classifications.append(None)
+        return classifications
+    
+    def _classify_attributes(self, vehicle_crops, need_brand, need_color, views=None):
+        """
+        Marca (YOLO por batch) y color solo de los recortes que los necesitan.
+        Si el batch falla se reintenta vehiculo por vehiculo.
+        
+        Args:
+            vehicle_crops (list): Recortes de vehiculos
+            need_brand (list): bool por recorte; True = detectar logo
+            need_color (list): bool por recorte; True = clasificar color
+            views (list): CropViews por recorte (ver _crop_views)
+            
+        Returns:
+            list: dict por recorte solo con las claves calculadas
+                  ('brand', 'brand_bbox' y/o 'color'); None si fallo ese vehiculo
+        """
+        if not vehicle_crops:
+            return []
+        
+        try:
+            classifications = [{} for _ in vehicle_crops]
+            brand_idx = [i for i, need in enumerate(need_brand) if need]
+            color_idx = [i for i, need in enumerate(need_color) if need]
+            brands = self.vehicle_classifier.classify_brand_batch(
+                [vehicle_crops[i] for i in brand_idx], [views[i] for i in brand_idx] if views else None
+            )
+            colors = self.vehicle_classifier.classify_color_batch(
+                [vehicle_crops[i] for i in color_idx], [views[i] for i in color_idx] if views else None
+            )
+            for i, brand_result in zip(brand_idx, brands):
+                classifications[i].update(brand_result)
+            for i, color in zip(color_idx, colors):
+                classifications[i]['color'] = color
+            self._attribute_runs['brand'] += len(brand_idx)
+            self._attribute_runs['color'] += len(color_idx)
+            return classifications
+        except Exception as e:
+            print(f"[PIPELINE-ERROR] Error en clasificacion por batch: {str(e)}")
+        
+        classifications = []
+        for vehicle_crop in vehicle_crops:
+            try:
+                classifications.append(self.vehicle_classifier.classify(vehicle_crop))
+            except Exception as e:
+                print(f"[PIPELINE-ERROR] Error clasificando vehiculo: {str(e)}")
+                classifications.append(None)
+        return classifications
+    
+    def _register_new_vehicle(self, track_id, plate_info, classification):
+        """
+        Registra un track nuevo en known_vehicles (re-identificando por placa si se puede).
+        
+        Args:
+            track_id (int): ID del track
+            plate_info (dict): Resultado de recognize_plate
+            classification (dict): Resultado de classify
+        """
+        plate_text = plate_info['text']
+        temp_prefix = getattr(config, 'TEMP_PLATE_PREFIX', 'TEMP_')
+        
+        # Verificar si es placa real (no temporal)
+        is_real_plate = plate_text not in ["SIN PLACA", "NO DETECTADA"]
+        
+        # NUEVO: Intentar recuperar datos existentes por placa
+        recovered_data = None
+        if is_real_plate:
+            # Primero intentar desde cache (mismo video/sesion)
+            recovered_data = self._recover_vehicle_from_cache(plate_text)
+            
+            # Si no esta en cache, intentar desde BD (modo camara)
+            if not recovered_data and self.mode == 'camera':
+                recovered_data = self._recover_vehicle_from_db(plate_text)
+        
+        if recovered_data:
+            # Usar datos recuperados (mantener atributos originales)
+            print(f"[PIPELINE-VIDEO] Re-identificado vehiculo por placa: {plate_text}")
+            if recovered_data.get('from_db'):
+                print(f"[PIPELINE-VIDEO]   -> Recuperado de BD")
+            elif recovered_data.get('from_cache'):
+                print(f"[PIPELINE-VIDEO]   -> Recuperado de cache (track anterior: {recovered_data.get('old_track_id')})")
+            
+            vehicle_data = {
+                'plate': recovered_data['plate'],
+                'plate_bbox': [int(x) for x in plate_info['bbox']] if plate_info['bbox'] else None,
+                'brand': recovered_data['brand'],
+                'brand_bbox': [int(x) for x in classification['brand_bbox']] if classification['brand_bbox'] else None,
+                'color': recovered_data['color'],
+                'plate_frame': self.frame_count,
+                'brand_frame': self.frame_count,
+                'color_frame': self.frame_count,
+                'reidentified': True
+            }
+            
+            print(f"[PIPELINE-VIDEO]   -> Marca: {vehicle_data['brand']}, Color: {vehicle_data['color']}")
+        else:
+            # Vehiculo completamente nuevo
+            if not is_real_plate:
+                # Generar ID temporal
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                plate_text = f"{temp_prefix}{timestamp}_{track_id}"
+                print(f"[PIPELINE-VIDEO] Placa no legible, usando ID temporal: {plate_text}")
+            
+            vehicle_data = {
+                'plate': plate_text,
+                'plate_bbox': [int(x) for x in plate_info['bbox']] if plate_info['bbox'] else None,
+                'brand': classification['brand'],
+                'brand_bbox': [int(x) for x in classification['brand_bbox']] if classification['brand_bbox'] else None,
+                'color': classification['color'],
+                'plate_frame': self.frame_count,
+                'brand_frame': self.frame_count,
+                'color_frame': self.frame_count,
+                'reidentified': False
+            }
+        
+        self.known_vehicles[track_id] = vehicle_data
+        
+        # Votacion de marca y color: los datos recuperados quedan fijos
+        votes = {
+            'brand': AttributeVote.from_config(unknown='DESCONOCIDA'),
+            'color': AttributeVote.from_config(unknown='DESCONOCIDO')
+        }
+        if recovered_data:
+            votes['brand'].freeze(vehicle_data['brand'])
+            votes['color'].freeze(vehicle_data['color'])
+        else:
+            votes['brand'].add(vehicle_data['brand'])
+            votes['color'].add(vehicle_data['color'])
+        self.attribute_votes[track_id] = votes
+        
+        # Actualizar mapeo placa -> track_id
+        if is_real_plate or recovered_data:
+            self.plate_to_track[vehicle_data['plate']] = track_id
+        
+        # Primera lectura del consenso de placa
+        if is_real_plate:
+            self._vote_plate(track_id, plate_info)
+    
+    def _apply_redetection(self, track_id, plate_info, classification):
+        """
+        Actualiza los atributos recalculados de un vehiculo conocido. Los bbox
+        se reemplazan; placa, marca y color se votan (salvo que aparezca la
+        placa real de un temporal).
+        
+        Args:
+            track_id (int): ID del track
+            plate_info (dict): Resultado de recognize_plate (None si no se recalculo)
+            classification (dict): Claves recalculadas de classify ('brand',
+                                   'brand_bbox' y/o 'color')
+        """
+        vehicle_data = self.known_vehicles[track_id]
+        
+        if plate_info is not None:
+            vehicle_data['plate_frame'] = self.frame_count
+        
+        # Actualizar bbox manteniendo placa/marca/color originales
+        if plate_info is not None and plate_info['bbox'] is not None:
+            vehicle_data['plate_bbox'] = [int(x) for x in plate_info['bbox']]
+            
+            # Actualizar texto de placa si se detecto una real
+            plate_text = plate_info['text']
+            temp_prefix = getattr(config, 'TEMP_PLATE_PREFIX', 'TEMP_')
+            
+            # Si placa actual es temporal Y se detecto una real, actualizar
+            if (vehicle_data['plate'].startswith(temp_prefix) and 
+                plate_text not in ["SIN PLACA", "NO DETECTADA"]):
+                
+                # Verificar si esta placa ya existe (re-identificacion)
+                recovered = self._recover_vehicle_from_cache(plate_text)
+                if not recovered and self.mode == 'camera':
+                    recovered = self._recover_vehicle_from_db(plate_text)
+                
+                if recovered:
+                    # Actualizar con datos recuperados
+                    vehicle_data['plate'] = recovered['plate']
+                    vehicle_data['brand'] = recovered['brand']
+                    vehicle_data['color'] = recovered['color']
+                    vehicle_data['reidentified'] = True
+                    votes = self.attribute_votes.get(track_id)
+                    if votes:
+                        votes['brand'].freeze(recovered['brand'])
+                        votes['color'].freeze(recovered['color'])
+                    print(f"[PIPELINE-VIDEO] Placa real detectada y re-identificada para track {track_id}: {plate_text}")
+                else:
+                    # Solo actualizar placa, mantener marca/color actuales
+                    vehicle_data['plate'] = plate_text
+                    self.plate_to_track[plate_text] = track_id
+                    print(f"[PIPELINE-VIDEO] Placa real detectada para track {track_id}: {plate_text}")
+            
+            # Cada lectura real suma al consenso de placa del track
+            if plate_text not in ["SIN PLACA", "NO DETECTADA"]:
+                self._vote_plate(track_id, plate_info)
+        
+        if 'brand' in classification:
+            vehicle_data['brand_frame'] = self.frame_count
+            if classification['brand_bbox'] is not None:
+                vehicle_data['brand_bbox'] = [int(x) for x in classification['brand_bbox']]
+            self._vote_attribute(track_id, 'brand', classification['brand'])
+        
+        if 'color' in classification:
+            vehicle_data['color_frame'] = self.frame_count
+            self._vote_attribute(track_id, 'color', classification['color'])
+    
+    def _vote_attribute(self, track_id, name, value):
+        """
+        Suma una lectura de marca o color a la votacion del track y actualiza el
+        atributo si cambia el mas votado (no despues de un evento, igual que la placa).
+        
+        Args:
+            track_id (int): ID del track
+            name (str): 'brand' o 'color'
+            value (str): Valor leido
+        """
+        votes = self.attribute_votes.get(track_id)
+        if not votes:
+            return
+        
+        vote = votes[name]
+        was_frozen = vote.frozen
+        new_value = vote.add(value)
+        vehicle_data = self.known_vehicles[track_id]
+        
+        if new_value != vehicle_data[name] and not self._has_event(track_id):
+            print(f"[PIPELINE-VIDEO] {name} del track {track_id}: {vehicle_data[name]} -> {new_value}")
+            vehicle_data[name] = new_value
+        
+        if vote.frozen and not was_frozen:
+            print(f"[PIPELINE-VIDEO] {name} {new_value} confirmado para track {track_id}")
+    
+    def _has_event(self, track_id):
+        """Indica si el track ya genero un evento (entrada/salida registrada con sus datos)."""
+        return (self.event_detector is not None and
+                self.event_detector.track_history.get(track_id, {}).get('crossed', False))
+    
+    def _plate_frozen(self, track_id):
+        """Indica si la placa del track ya esta confirmada por consenso (sin mas OCR)."""
+        consensus = self.plate_consensus.get(track_id)
+        return consensus is not None and consensus.frozen
+    
+    def _plate_min_quality(self, track_id):
+        """Calidad minima del proximo recorte de placa del track para correr OCR (None = siempre)."""
+        if not self.plate_quality_enabled:
+            return None
+        buffer = self.plate_crop_buffers.get(track_id)
+        return buffer.min_quality() if buffer else None
+    
+    def _record_plate_quality(self, track_id, plate_info, min_quality):
+        """
+        Guarda en el buffer del track el recorte de placa que paso por OCR y dio
+        una lectura valida. Una lectura fallida ('SIN PLACA') no sube el umbral:
+        si no, un recorte nitido sin texto legible bloquearia las relecturas que
+        necesita el consenso de placa.
+        
+        Args:
+            track_id (int): ID del track
+            plate_info (dict): Resultado de recognize_plate (text, confidence, quality)
+            min_quality (float): Umbral usado en esta lectura (None = sin umbral)
+        """
+        quality = plate_info.get('quality')
+        if not self.plate_quality_enabled or quality is None:
+            return
+        
+        if min_quality is not None and quality < min_quality:
+            self._ocr_low_quality += 1
+            return
+        
+        if plate_info['text'] in ["SIN PLACA", "NO DETECTADA"]:
+            return
+        
+        buffer = self.plate_crop_buffers.get(track_id)
+        if buffer is None:
+            buffer = self.plate_crop_buffers[track_id] = PlateCropBuffer.from_config()
+        buffer.add(quality, plate_info['text'], plate_info['confidence'])
+    
+    def _vote_plate(self, track_id, plate_info):
+        """
+        Suma una lectura OCR al consenso del track y actualiza su placa si el
+        consenso cambia. La placa no se cambia si el vehiculo ya genero un evento
+        (entrada/salida registrada con esa placa).
+        
+        Un resultado de la cache de OCR no es una lectura independiente (es el
+        mismo recorte leido antes): solo cuenta como primera lectura del track,
+        asi un vehiculo quieto no congela la placa con una sola lectura real.
+        
+        Args:
+            track_id (int): ID del track
+            plate_info (dict): Resultado de recognize_plate (text, confidence)
+        """
+        if not self.plate_consensus_enabled:
+            return
+        
+        consensus = self.plate_consensus.get(track_id)
+        if plate_info.get('cached') and consensus is not None and consensus.reads:
+            return
+        if consensus is None:
+            consensus = self.plate_consensus[track_id] = PlateConsensus.from_config()
+        
+        was_frozen = consensus.frozen
+        plate_text = consensus.add(plate_info['text'], plate_info.get('confidence', 0.0))
+        vehicle_data = self.known_vehicles[track_id]
+        old_plate = vehicle_data['plate']
+        
+        if plate_text != old_plate and not self._has_event(track_id):
+            if self.plate_to_track.get(old_plate) == track_id:
+                del self.plate_to_track[old_plate]
+            vehicle_data['plate'] = plate_text
+            self.plate_to_track[plate_text] = track_id
+            print(f"[PIPELINE-VIDEO] Consenso de placa para track {track_id}: {old_plate} -> {plate_text}")
+        
+        if consensus.frozen and not was_frozen:
+            print(f"[PIPELINE-VIDEO] Placa {plate_text} confirmada para track {track_id} "
+                  f"({consensus.reads} lecturas), sin mas OCR")
+    
+    def _skip_static_frame(self, frame):
+        """
+        Resultado para un frame saltado por la compuerta de movimiento.
+        No hay tracks activos, asi que solo se dibuja la linea virtual.
+        
+        Args:
+            frame: Frame de video (numpy array BGR)
+            
+        Returns:
+            dict: Mismo formato que process_video_frame, sin detecciones
+        """
+        # Siempre una imagen propia: la UI dibuja sobre el resultado
+        annotated = None
+        if self.enable_events and self.event_detector:
+            try:
+                annotated = self.event_detector.draw_line(frame)  # devuelve una copia
+            except Exception as e:
+                print(f"[PIPELINE-WARNING] Error dibujando linea: {str(e)}")
+        if annotated is None:
+            annotated = frame.copy()
+        
+        if self.frame_count % getattr(config, 'DEBUG_LOG_INTERVAL', 30) == 0:
+            stats = self.motion_gate.get_stats()
+            print(f"[MOTION] Frame {self.frame_count}: escena estatica, "
+                  f"frames saltados: {stats['frames_skipped']}/{stats['frames_checked']} ({stats['skip_ratio']:.1%})")
+        
+        return {
+            'annotated_image': annotated,
+            'detections': [],
+            'tracks': [],
+            'events': []
+        }
+    
+    def get_performance_stats(self):
+        """
+        Estadisticas de las optimizaciones de rendimiento activas.
+        
+        Returns:
+            dict: {
+                'motion_gate': dict|None,  # frames_checked, frames_skipped, skip_ratio
+                'input_size': dict|None,   # imgsz, latency_ms, budget_ms, adjustments
+                'ocr': dict|None,          # plates, avg_passes, order, techniques, cache
+                'plate_consensus': dict,   # tracks, frozen, ocr_skipped
+                'plate_quality': dict,     # tracks, ocr_skipped (recorte sin mejora)
+                'attributes': dict,        # runs {plate, brand, color}, frozen {brand, color}
+                'crop_cache': dict|None    # hits, misses, hit_ratio y by_view (vistas reutilizadas)
+            }
+        """
+        input_tuner = self.car_detector.input_tuner
+        return {
+            'motion_gate': self.motion_gate.get_stats() if self.motion_gate else None,
+            'input_size': input_tuner.get_stats() if input_tuner else None,
+            'ocr': self.plate_recognizer.get_ocr_stats() if self.plate_recognizer else None,
+            'plate_consensus': {
+                'tracks': len(self.plate_consensus),
+                'frozen': sum(1 for c in self.plate_consensus.values() if c.frozen),
+                'ocr_skipped': self._ocr_skipped
+            },
+            'plate_quality': {
+                'tracks': len(self.plate_crop_buffers),
+                'ocr_skipped': self._ocr_low_quality
+            },
+            'attributes': {
+                'runs': dict(self._attribute_runs),
+                'frozen': {
+                    name: sum(1 for votes in self.attribute_votes.values() if votes[name].frozen)
+                    for name in ('brand', 'color')
+                }
+            },
+            'crop_cache': self.crop_cache.get_stats() if self.crop_cache else None
+        }
+    
     def _draw_results(self, image, detections):
         """
         Dibuja los resultados de deteccion en la imagen.
@@ -0,0 +1,85 @@
+from collections import defaultdict, deque
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+class PlateConsensus:
+    def __init__(self, stable_reads=3, max_reads=20):
+        """
+        Acumula las lecturas OCR de la placa de un track y vota caracter por
+        caracter, ponderando cada lectura por su confianza.
+
+        La votacion elige primero la longitud (suma de confianzas por longitud)
+        y luego, entre las lecturas de esa longitud, el caracter con mas peso
+        en cada posicion. Asi una placa leida como 'ABC123', 'A8C123' y
+        'ABC123' converge a 'ABC123' aunque ninguna lectura sea perfecta.
+
+        Cuando el consenso no cambia durante `stable_reads` lecturas seguidas
+        el track queda congelado y no necesita mas OCR.
+
+        Args:
+            stable_reads (int): Lecturas consecutivas sin cambios para congelar
+            max_reads (int): Lecturas recientes que se conservan para votar
+        """
+        self.stable_reads = stable_reads
+        self._reads = deque(maxlen=max_reads)
+        self.text = None
+        self.stable_count = 0
+        self.frozen = False
+
+    @classmethod
+    def from_config(cls):
+        """Crea el acumulador desde config.py (PLATE_CONSENSUS_STABLE_READS)."""
+        return cls(stable_reads=getattr(config, 'PLATE_CONSENSUS_STABLE_READS', 3))
+
+    def add(self, text, confidence):
+        """
+        Agrega una lectura y recalcula el consenso.
+
+        Args:
+            text (str): Placa leida (ya normalizada y validada)
+            confidence (float): Confianza del OCR (0.0-1.0)
+
+        Returns:
+            str: Placa de consenso
+        """
+        if self.frozen:
+            return self.text
+
+        # Peso minimo para que una lectura con confianza 0 igual cuente
+        self._reads.append((text, max(float(confidence), 1e-3)))
+        consensus = self._vote()
+
+        if consensus == self.text:
+            self.stable_count += 1
+        else:
+            self.text = consensus
+            self.stable_count = 1
+
+        if self.stable_count >= self.stable_reads:
+            self.frozen = True
+        return self.text
+
+    def _vote(self):
+        """Votacion ponderada: primero la longitud, luego cada posicion."""
+        length_weight = defaultdict(float)
+        for text, weight in self._reads:
+            length_weight[len(text)] += weight
+        length = max(length_weight, key=length_weight.get)
+
+        same_length = [(text, weight) for text, weight in self._reads if len(text) == length]
+        chars = []
+        for position in range(length):
+            char_weight = defaultdict(float)
+            for text, weight in same_length:
+                char_weight[text[position]] += weight
+            chars.append(max(char_weight, key=char_weight.get))
+        return ''.join(chars)
+
+    @property
+    def reads(self):
+        """Cantidad de lecturas acumuladas."""
+        return len(self._reads)
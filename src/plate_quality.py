@@ -0,0 +1,112 @@
+import cv2
+import numpy as np
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+def plate_quality_score(plate_image, ref_height=40, ref_sharpness=0.6, ref_contrast=50.0):
+    """
+    Puntaje barato de calidad de un recorte de placa para decidir si vale la
+    pena correr OCR sobre el.
+
+    Combina tres factores en [0, 1] y los multiplica (cualquiera malo hunde
+    el puntaje):
+    - Nitidez: varianza del Laplaciano sobre el recorte llevado a ref_height
+      de alto (asi no depende del tamano), dividida por la varianza del gris
+      (asi no depende del contraste). El desenfoque por movimiento la baja.
+    - Tamano: alto en pixeles del recorte original respecto a ref_height.
+    - Contraste: desvio estandar del gris.
+
+    Args:
+        plate_image: Recorte de la placa (numpy array BGR o gris)
+        ref_height (int): Alto a partir del cual el tamano deja de sumar
+        ref_sharpness (float): Varianza relativa del Laplaciano que da nitidez 1.0
+        ref_contrast (float): Desvio estandar que da contraste 1.0
+
+    Returns:
+        float: Puntaje de calidad (0.0-1.0)
+    """
+    if plate_image is None or plate_image.size == 0:
+        return 0.0
+
+    gray = plate_image if plate_image.ndim == 2 else cv2.cvtColor(plate_image, cv2.COLOR_BGR2GRAY)
+    h, w = gray.shape[:2]
+
+    scale = ref_height / float(h)
+    interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+    normalized = cv2.resize(gray, (max(1, int(round(w * scale))), ref_height), interpolation=interpolation)
+    gray_var = normalized.var()
+    if gray_var < 1e-6:
+        return 0.0
+    laplacian_var = cv2.Laplacian(normalized, cv2.CV_64F).var()
+
+    sharpness = min(1.0, laplacian_var / gray_var / ref_sharpness)
+    size = min(1.0, h / float(ref_height))
+    contrast = min(1.0, float(np.std(gray)) / ref_contrast)
+    return float(sharpness * size * contrast)
+
+
+class PlateCropBuffer:
+    def __init__(self, size=3, margin=0.15, max_threshold=0.95):
+        """
+        Mejores recortes de placa ya leidos por OCR de un track.
+
+        Un recorte nuevo solo se manda a OCR si su calidad supera a la mejor
+        del buffer por `margin` (relativo). Asi un vehiculo que se acerca a la
+        camara se relee cuando la placa mejora, y los frames movidos o lejanos
+        no gastan OCR. El umbral se limita a `max_threshold`: el puntaje llega
+        como maximo a 1.0, y sin tope un recorte perfecto dejaria al track sin
+        volver a leerse.
+
+        Args:
+            size (int): Recortes que se conservan (los de mayor calidad)
+            margin (float): Mejora relativa minima sobre el mejor para releer
+            max_threshold (float): Tope del umbral (menor que 1.0)
+        """
+        self.size = max(1, int(size))
+        self.margin = margin
+        self.max_threshold = max_threshold
+        self.entries = []  # [{'quality', 'text', 'confidence'}] de mayor a menor calidad
+
+    @classmethod
+    def from_config(cls):
+        """
+        Crea el buffer desde config.py (PLATE_QUALITY_BUFFER_SIZE, PLATE_QUALITY_MARGIN,
+        PLATE_QUALITY_MAX_THRESHOLD).
+        """
+        return cls(
+            size=getattr(config, 'PLATE_QUALITY_BUFFER_SIZE', 3),
+            margin=getattr(config, 'PLATE_QUALITY_MARGIN', 0.15),
+            max_threshold=getattr(config, 'PLATE_QUALITY_MAX_THRESHOLD', 0.95),
+        )
+
+    @property
+    def best_quality(self):
+        """Calidad del mejor recorte leido (None si aun no hay)."""
+        return self.entries[0]['quality'] if self.entries else None
+
+    def min_quality(self):
+        """
+        Calidad que debe tener el proximo recorte para correr OCR.
+
+        Returns:
+            float or None: None si el buffer esta vacio (siempre se lee)
+        """
+        best = self.best_quality
+        return None if best is None else min(best * (1.0 + self.margin), self.max_threshold)
+
+    def add(self, quality, text, confidence):
+        """
+        Guarda un recorte con lectura valida (los recortes sin texto no suben el umbral).
+
+        Args:
+            quality (float): Puntaje de plate_quality_score
+            text (str): Texto leido
+            confidence (float): Confianza del OCR
+        """
+        self.entries.append({'quality': quality, 'text': text, 'confidence': confidence})
+        self.entries.sort(key=lambda entry: entry['quality'], reverse=True)
+        del self.entries[self.size:]
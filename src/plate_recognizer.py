@@ -1,18 +1,71 @@
-import easyocr
 import cv2
 import numpy as np
 import os
-from ultralytics import YOLO
+from functools import partial
+from .inference import DetectionArrays
+from .model_registry import get_ocr_reader, get_yolo_model
+from .crop_batcher import CropBatcher
+from .ocr_cache import PlateOCRCache
+from .plate_quality import plate_quality_score
+from .worker_pool import get_worker_pool
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+# Tecnicas de preprocesado para OCR (orden inicial de la cascada)
+OCR_TECHNIQUES = ('otsu', 'adaptive', 'adaptive_inv', 'enhanced')
+
+# Fondo de la placa en la imagen de cada tecnica (relleno del OCR por batch):
+# blanco salvo en la binarizacion inversa, donde el fondo queda negro
+OCR_PAD_VALUES = {'adaptive_inv': 0}
+OCR_PAD_DEFAULT = 255
+
+
+def assign_plates_to_vehicles(plate_xyxy, vehicle_xyxy, min_overlap=0.8):
+    """
+    Asigna cada placa detectada en el frame al vehiculo que la contiene.
+    Una placa esta contenida si al menos min_overlap de su area cae dentro del
+    bbox del vehiculo; si varios vehiculos la contienen (solapados) gana el mas
+    chico, que es el que la rodea mas de cerca.
+    
+    Args:
+        plate_xyxy (np.ndarray): (P, 4) cajas de placas en coordenadas del frame
+        vehicle_xyxy (np.ndarray): (V, 4) cajas de vehiculos en coordenadas del frame
+        min_overlap (float): Fraccion minima del area de la placa dentro del vehiculo
+        
+    Returns:
+        np.ndarray: (P,) indice del vehiculo de cada placa, -1 si no tiene
+    """
+    plate_xyxy = np.asarray(plate_xyxy, dtype=np.float32).reshape(-1, 4)
+    vehicle_xyxy = np.asarray(vehicle_xyxy, dtype=np.float32).reshape(-1, 4)
+    if len(plate_xyxy) == 0 or len(vehicle_xyxy) == 0:
+        return np.full(len(plate_xyxy), -1, dtype=np.int64)
+    
+    # Interseccion (P, V) de cada placa con cada vehiculo
+    top_left = np.maximum(plate_xyxy[:, None, :2], vehicle_xyxy[None, :, :2])
+    bottom_right = np.minimum(plate_xyxy[:, None, 2:], vehicle_xyxy[None, :, 2:])
+    inter = np.prod((bottom_right - top_left).clip(0), axis=2)
+    plate_area = np.prod(plate_xyxy[:, 2:] - plate_xyxy[:, :2], axis=1).clip(1e-6)
+    contained = inter / plate_area[:, None] >= min_overlap
+    
+    vehicle_area = np.prod(vehicle_xyxy[:, 2:] - vehicle_xyxy[:, :2], axis=1)
+    owner = np.argmin(np.where(contained, vehicle_area[None, :], np.inf), axis=1)
+    owner[~contained.any(axis=1)] = -1
+    return owner
 
 
 class PlateRecognizer:
-    def __init__(self, plate_detector_path=None):
+    def __init__(self, plate_detector_path=None, backend=None):
         """
         Inicializa el reconocedor de placas.
         Usa YOLO para detectar la placa y EasyOCR para leer el texto.
         
         Args:
             plate_detector_path (str): Ruta al modelo YOLO de deteccion de placas
+            backend (str): 'ultralytics' o 'onnx'. Si es None, usa config.INFERENCE_BACKEND
         """
         # Cargar modelo YOLO de deteccion de placas
         if plate_detector_path is None:
@@ -29,18 +82,45 @@ class PlateRecognizer:
         
         print(f"[DEBUG] Modelo encontrado. Tamano: {os.path.getsize(plate_detector_path) / (1024*1024):.2f} MB")
         print(f"[DEBUG] Cargando modelo YOLO de placas: {plate_detector_path}")
-        self.plate_detector = YOLO(plate_detector_path)
-        print("[DEBUG] Modelo YOLO de placas cargado")
-        
-        # Inicializar EasyOCR
-        print("[DEBUG] Inicializando EasyOCR (puede tardar en primera ejecucion)...")
-        self.reader = easyocr.Reader(['es', 'en'], gpu=False)
+        self.plate_detector = get_yolo_model(plate_detector_path, backend)
+        print(f"[DEBUG] Modelo YOLO de placas cargado ({self.plate_detector.name})")
+        self.crop_batcher = CropBatcher.from_config('plate_detector')
+        # Tamano de entrada para la deteccion de placas en el frame completo
+        self.full_frame_imgsz = getattr(config, 'PLATE_FULL_FRAME_IMGSZ', 1280)
+        
+        # Inicializar EasyOCR (compartido entre pipelines)
+        self.reader = get_ocr_reader(('es', 'en'), gpu=False)
         print("[DEBUG] EasyOCR inicializado correctamente")
         
         # Configuracion de validacion (umbrales mas permisivos)
         self.min_confidence = 0.2  # Confianza minima del OCR (reducido)
         self.min_plate_length = 4  # Longitud minima de caracteres (reducido)
         self.max_plate_length = 12  # Longitud maxima de caracteres (aumentado)
+        
+        # Cascada de OCR: cortar al primer resultado valido con esta confianza
+        self.early_exit = getattr(config, 'OCR_EARLY_EXIT_ENABLED', True)
+        self.early_exit_confidence = getattr(config, 'OCR_EARLY_EXIT_CONFIDENCE', 0.6)
+        # Estadisticas por tecnica: veces ejecutada y veces que dio la placa final
+        self.technique_stats = {name: {'runs': 0, 'wins': 0} for name in OCR_TECHNIQUES}
+        self.ocr_plates = 0
+        self.ocr_passes = 0
+        
+        # Cache de resultados de OCR por hash perceptual del recorte de la placa
+        self.ocr_cache = PlateOCRCache.from_config()
+        
+        # Preprocesado en el pool de hilos: por placa, o por (placa, tecnica)
+        # con OCR_PARALLEL_TECHNIQUES
+        self.worker_pool = get_worker_pool()
+        self.parallel_techniques = getattr(config, 'OCR_PARALLEL_TECHNIQUES', False)
+    
+    def warmup(self):
+        """
+        Corre una deteccion y una lectura sobre imagenes vacias para que la
+        primera placa real no pague la inicializacion de YOLO y EasyOCR
+        (una sola vez por proceso: los modelos son compartidos).
+        """
+        self.plate_detector.warmup()
+        self.reader.warmup()
     
     def detect_plate_region_yolo_with_bbox(self, vehicle_image):
         """
@@ -52,52 +132,104 @@ class PlateRecognizer:
         Returns:
             tuple: (plate_image, bbox) donde bbox es [x1, y1, x2, y2] o None
         """
-        # Detectar placas con YOLO
-        results = self.plate_detector(vehicle_image, verbose=False)
+        # Detectar placas con YOLO (mismo letterbox que el camino por batch: el
+        # bbox no depende de cuantos vehiculos haya en el frame)
+        output = self.crop_batcher.predict(self.plate_detector, [vehicle_image])[0]
+        return self._select_plate(vehicle_image, output)
+    
+    def detect_plate_regions_batch(self, vehicle_images, views=None):
+        """
+        Detecta la region de la placa en varios vehiculos con batches de YOLO.
         
-        for result in results:
-            boxes = result.boxes
-            if len(boxes) == 0:
-                continue
+        Args:
+            vehicle_images (list): Recortes de vehiculos (numpy arrays BGR)
+            views (list): CropViews por recorte (letterbox compartido con los logos)
             
-            # Tomar la placa con mayor confianza
-            best_box = None
-            best_conf = 0
-            
-            for box in boxes:
-                conf = float(box.conf[0])
-                if conf > best_conf:
-                    best_conf = conf
-                    best_box = box
-            
-            # Umbral de confianza mas permisivo
-            if best_box is not None and best_conf > 0.25:
-                x1, y1, x2, y2 = best_box.xyxy[0].cpu().numpy().astype(int)
-                
-                # Asegurar que las coordenadas estan dentro de la imagen
-                h, w = vehicle_image.shape[:2]
-                x1, y1 = max(0, x1), max(0, y1)
-                x2, y2 = min(w, x2), min(h, y2)
-                
-                # Validar dimensiones minimas
-                plate_w = x2 - x1
-                plate_h = y2 - y1
-                
-                if plate_w < 40 or plate_h < 15:
-                    print(f"[DEBUG] Placa YOLO muy pequena: {plate_w}x{plate_h}")
-                    return None, None
-                
-                # Validar aspect ratio
-                aspect_ratio = plate_w / float(plate_h)
-                if not (1.8 <= aspect_ratio <= 5.0):
-                    print(f"[DEBUG] Aspect ratio invalido: {aspect_ratio:.2f}")
-                    return None, None
-                
-                # Recortar placa
-                plate_image = vehicle_image[y1:y2, x1:x2]
-                bbox = [x1, y1, x2, y2]
-                print(f"[DEBUG] Placa detectada con YOLO (conf: {best_conf:.2f})")
-                return plate_image, bbox
+        Returns:
+            list: Un (plate_image, bbox) por vehiculo (ver detect_plate_region_yolo_with_bbox)
+        """
+        outputs = self.crop_batcher.predict(self.plate_detector, vehicle_images, views=views)
+        return [self._select_plate(img, output) for img, output in zip(vehicle_images, outputs)]
+    
+    def detect_plate_regions_full_frame(self, image, vehicle_boxes, vehicle_images, offset=(0, 0)):
+        """
+        Detecta placas con una sola pasada de YOLO sobre el frame (o la ROI) y
+        asigna cada placa al vehiculo que la contiene. Los bbox se devuelven
+        relativos al recorte de cada vehiculo, igual que en el modo por vehiculo.
+        
+        Args:
+            image: Frame completo o recorte de la ROI (numpy array BGR)
+            vehicle_boxes (list): [x1, y1, x2, y2] de cada vehiculo en coordenadas del frame
+            vehicle_images (list): Recorte de cada vehiculo (mismo orden)
+            offset (tuple): (x, y) de image dentro del frame (ROI)
+            
+        Returns:
+            list: Un (plate_image, bbox) por vehiculo (ver detect_plate_region_yolo_with_bbox)
+        """
+        if not vehicle_images:
+            return []
+        
+        output = self.plate_detector.predict([image], imgsz=self.full_frame_imgsz)[0]
+        plate_xyxy = output.xyxy + np.array([offset[0], offset[1], offset[0], offset[1]], dtype=np.float32)
+        vehicle_xyxy = np.array(vehicle_boxes, dtype=np.float32).reshape(-1, 4)
+        owners = assign_plates_to_vehicles(plate_xyxy, vehicle_xyxy)
+        
+        regions = []
+        for idx, vehicle_image in enumerate(vehicle_images):
+            mine = owners == idx
+            # Pasar las placas del vehiculo a coordenadas de su recorte
+            origin = np.array([vehicle_xyxy[idx, 0], vehicle_xyxy[idx, 1]] * 2, dtype=np.float32)
+            vehicle_output = DetectionArrays(plate_xyxy[mine] - origin, output.confidence[mine],
+                                             output.class_ids[mine])
+            regions.append(self._select_plate(vehicle_image, vehicle_output))
+        return regions
+    
+    def _select_plate(self, vehicle_image, output):
+        """
+        Elige la placa de mayor confianza y valida tamano y aspect ratio.
+        
+        Args:
+            vehicle_image: Imagen del vehiculo (numpy array BGR)
+            output (DetectionArrays): Cajas del detector en coordenadas de vehicle_image
+            
+        Returns:
+            tuple: (plate_image, bbox) donde bbox es [x1, y1, x2, y2] o None
+        """
+        if len(output) == 0:
+            return None, None
+        
+        # Tomar la placa con mayor confianza
+        best_idx = int(np.argmax(output.confidence))
+        best_conf = float(output.confidence[best_idx])
+        
+        # Umbral de confianza mas permisivo
+        if best_conf > 0.25:
+            x1, y1, x2, y2 = output.xyxy[best_idx].astype(int)
+            
+            # Asegurar que las coordenadas estan dentro de la imagen
+            h, w = vehicle_image.shape[:2]
+            x1, y1 = max(0, x1), max(0, y1)
+            x2, y2 = min(w, x2), min(h, y2)
+            
+            # Validar dimensiones minimas
+            plate_w = x2 - x1
+            plate_h = y2 - y1
+            
+            if plate_w < 40 or plate_h < 15:
+                print(f"[DEBUG] Placa YOLO muy pequena: {plate_w}x{plate_h}")
+                return None, None
+            
+            # Validar aspect ratio
+            aspect_ratio = plate_w / float(plate_h)
+            if not (1.8 <= aspect_ratio <= 5.0):
+                print(f"[DEBUG] Aspect ratio invalido: {aspect_ratio:.2f}")
+                return None, None
+            
+            # Recortar placa
+            plate_image = vehicle_image[y1:y2, x1:x2]
+            bbox = [x1, y1, x2, y2]
+            print(f"[DEBUG] Placa detectada con YOLO (conf: {best_conf:.2f})")
+            return plate_image, bbox
         
         return None, None
     
@@ -148,17 +280,189 @@ class PlateRecognizer:
         Returns:
             dict: {
                 'text': str,  # Texto de la placa
-                'bbox': [x1, y1, x2, y2] or None  # Coordenadas relativas a vehicle_image
+                'bbox': [x1, y1, x2, y2] or None,  # Coordenadas relativas a vehicle_image
+                'confidence': float,  # Confianza del OCR (0.0 si no hay placa)
+                'quality': float or None,  # plate_quality_score del recorte de la placa
+                'cached': bool  # True si el texto sale de la cache de OCR (no es una lectura nueva)
             }
         """
-        # Detectar placa con YOLO
-        plate_image, plate_bbox = self.detect_plate_region_yolo_with_bbox(vehicle_image)
+        return self.recognize_plates_batch([vehicle_image])[0]
+    
+    def recognize_plates_batch(self, vehicle_images, plate_regions=None, skip_ocr=None, min_quality=None,
+                               views=None):
+        """
+        Reconoce las placas de varios vehiculos (ej. todos los pendientes de un frame).
+        
+        La cascada de tecnicas avanza por rondas: en cada ronda todas las placas
+        que aun no tienen una lectura confiable se pasan juntas por el
+        reconocedor por batch de EasyOCR (readtext_batched) con la misma tecnica.
+        
+        Args:
+            vehicle_images (list): Recortes de vehiculos (numpy arrays BGR)
+            plate_regions (list): (plate_image, bbox) ya detectados por vehiculo
+                                  (ej. detect_plate_regions_full_frame). Si es None
+                                  se detectan sobre cada recorte
+            skip_ocr (list): bool por vehiculo; True = solo detectar el bbox de la
+                             placa (ej. tracks con placa ya confirmada)
+            min_quality (list): float|None por vehiculo; el OCR solo corre si el
+                                recorte de la placa alcanza esa calidad
+                                (ej. mejor recorte ya leido del track + margen)
+            views (list): CropViews por vehiculo (FrameCropCache) para la deteccion
+            
+        Returns:
+            list: Un dict {'text': str, 'bbox': [...]|None, 'confidence': float,
+                  'quality': float|None, 'cached': bool} por imagen, en el mismo orden
+        """
+        results = [{'text': "SIN PLACA", 'bbox': None, 'confidence': 0.0, 'quality': None, 'cached': False}
+                   for _ in vehicle_images]
+        
+        # Detectar placa con YOLO en todos los vehiculos (por batch)
+        regions = plate_regions
+        if regions is None:
+            regions = self.detect_plate_regions_batch(vehicle_images, views) if vehicle_images else []
+        detected = []
+        for idx, (plate_image, plate_bbox) in enumerate(regions):
+            
+            # Si no se detecto ninguna region valida, queda sin placa
+            if plate_image is None or plate_image.size == 0:
+                print("[DEBUG] No se detecto region de placa")
+                continue
+            
+            results[idx]['bbox'] = plate_bbox
+            if skip_ocr and skip_ocr[idx]:
+                continue
+            detected.append((idx, plate_image))
+        
+        # Calidad y hash de cada recorte (en paralelo en el pool)
+        plates = []
+        for (idx, plate_image), (quality, plate_hash) in zip(
+                detected, self.worker_pool.map(self._score_plate, [img for _, img in detected])):
+            
+            # Recorte movido, chico o sin contraste respecto al mejor ya leido: sin OCR
+            results[idx]['quality'] = quality
+            if min_quality and min_quality[idx] is not None and quality < min_quality[idx]:
+                continue
+            
+            # Recorte casi identico a uno ya leido (vehiculo quieto): reusar el OCR
+            if plate_hash is not None:
+                cached = self.ocr_cache.get(plate_hash)
+                if cached is not None:
+                    results[idx]['text'] = cached['text']
+                    results[idx]['confidence'] = cached['confidence']
+                    results[idx]['cached'] = True
+                    continue
+            
+            plates.append({
+                'index': idx,
+                'image': plate_image,
+                'hash': plate_hash,
+                'all_results': [],
+                'valid_results': [],
+                'techniques_run': []
+            })
+        
+        # Mejora de cada placa en el pool (las tecnicas se calculan por ronda,
+        # asi la salida temprana tambien evita su preprocesado)
+        for plate, enhanced in zip(plates, self.worker_pool.map(self._enhance_plate, [p['image'] for p in plates])):
+            plate['enhanced'] = enhanced
+            plate['techniques'] = {}
+        
+        # Con OCR_PARALLEL_TECHNIQUES cada (placa, tecnica) es una tarea del
+        # pool: una sola placa tambien reparte sus 4 tecnicas entre hilos
+        if self.parallel_techniques:
+            tasks = [(plate, name) for plate in plates for name in OCR_TECHNIQUES]
+            for (plate, name), processed_img in zip(tasks, self.worker_pool.map(self._technique_task, tasks)):
+                plate['techniques'][name] = processed_img
+        
+        # Probar OCR tecnica por tecnica, empezando por la que mas gana
+        pending = plates
+        for technique_name in self.technique_order():
+            if not pending:
+                break
+            
+            processed = self.worker_pool.map(partial(self._technique_image, technique_name), pending)
+            for plate, candidates in zip(pending, self._read_text_batch(technique_name, processed)):
+                plate['techniques_run'].append(technique_name)
+                plate['all_results'].extend(candidates)
+                plate['valid_results'].extend(
+                    r for r in candidates
+                    if self.validate_plate_text(r['text'], r['confidence'])
+                )
+            
+            # Salida temprana: las placas ya legibles no corren el resto
+            if self.early_exit:
+                pending = [
+                    p for p in pending
+                    if not any(r['confidence'] >= self.early_exit_confidence for r in p['valid_results'])
+                ]
+        
+        for plate in plates:
+            self._record_technique_stats(plate['techniques_run'], plate['valid_results'])
+            all_results = plate['all_results']
+            valid_results = plate['valid_results']
+            
+            if plate['hash'] is not None:
+                best = max(valid_results, key=lambda x: x['confidence']) if valid_results else None
+                self.ocr_cache.put(plate['hash'], {
+                    'text': best['text'] if best else "SIN PLACA",
+                    'confidence': float(best['confidence']) if best else 0.0
+                })
+            
+            # Si no hay resultados del OCR
+            if not all_results:
+                print("[DEBUG] OCR no encontro texto")
+                continue
+            
+            # Si no hay resultados validos
+            if not valid_results:
+                print(f"[DEBUG] Ningun resultado paso validacion. Mejor intento: {all_results[0]['text']} (conf: {all_results[0]['confidence']:.2f})")
+                continue
+            
+            # Ordenar por confianza y tomar el mejor
+            best_result = max(valid_results, key=lambda x: x['confidence'])
+            results[plate['index']]['text'] = best_result['text']
+            results[plate['index']]['confidence'] = float(best_result['confidence'])
+            
+            print(f"[DEBUG] Placa reconocida: {best_result['text']} (conf: {best_result['confidence']:.2f}, "
+                  f"tecnica: {best_result['technique']}, pasadas OCR: {len(plate['techniques_run'])})")
+        
+        return results
+    
+    def _score_plate(self, plate_image):
+        """
+        Calidad y hash perceptual del recorte crudo de la placa (se hashea el
+        crudo: nitidez y CLAHE amplifican el ruido).
         
-        # Si no se detecto ninguna region valida, retornar sin placa
-        if plate_image is None or plate_image.size == 0:
-            print("[DEBUG] No se detecto region de placa")
-            return {'text': "SIN PLACA", 'bbox': None}
+        Args:
+            plate_image: Recorte de la placa (numpy array BGR)
+            
+        Returns:
+            tuple: (quality, plate_hash o None si la cache esta deshabilitada)
+        """
+        plate_hash = self.ocr_cache.hash(plate_image) if self.ocr_cache else None
+        return plate_quality_score(plate_image), plate_hash
+    
+    def _technique_image(self, technique_name, plate):
+        """Imagen de una tecnica para la placa (precalculada o calculada en esta ronda)."""
+        if technique_name in plate['techniques']:
+            return plate['techniques'][technique_name]
+        return self._apply_technique(technique_name, plate['enhanced'])
+    
+    def _technique_task(self, task):
+        """Tarea del pool para OCR_PARALLEL_TECHNIQUES: task = (placa, tecnica)."""
+        plate, technique_name = task
+        return self._apply_technique(technique_name, plate['enhanced'])
+    
+    def _enhance_plate(self, plate_image):
+        """
+        Escala, pasa a gris, aplica nitidez y CLAHE al recorte de la placa.
         
+        Args:
+            plate_image: Recorte de la placa (numpy array BGR)
+            
+        Returns:
+            numpy.ndarray: Imagen en gris mejorada (base de todas las tecnicas)
+        """
         # Redimensionar placa si es muy pequena (mejora OCR)
         h, w = plate_image.shape[:2]
         if h < 50 or w < 150:
@@ -178,75 +482,153 @@ class PlateRecognizer:
         
         # Aumentar contraste con CLAHE
         clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
-        plate_enhanced = clahe.apply(plate_sharp)
-        
-        # Intentar multiples tecnicas de binarizacion
-        techniques = []
+        return clahe.apply(plate_sharp)
+    
+    def _apply_technique(self, technique_name, plate_enhanced):
+        """
+        Aplica una tecnica de binarizacion (solo se calcula si la cascada llega a ella).
         
+        Args:
+            technique_name (str): Una de OCR_TECHNIQUES
+            plate_enhanced: Imagen en gris mejorada
+            
+        Returns:
+            numpy.ndarray: Imagen para el OCR
+        """
         # Tecnica 1: Otsu
-        _, otsu = cv2.threshold(plate_enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        techniques.append(('otsu', otsu))
+        if technique_name == 'otsu':
+            _, otsu = cv2.threshold(plate_enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            return otsu
         
         # Tecnica 2: Threshold adaptativo
-        adaptive = cv2.adaptiveThreshold(
-            plate_enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-            cv2.THRESH_BINARY, 11, 2
-        )
-        techniques.append(('adaptive', adaptive))
+        if technique_name == 'adaptive':
+            return cv2.adaptiveThreshold(
+                plate_enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
+                cv2.THRESH_BINARY, 11, 2
+            )
         
         # Tecnica 3: Threshold adaptativo inverso
-        adaptive_inv = cv2.adaptiveThreshold(
-            plate_enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-            cv2.THRESH_BINARY_INV, 11, 2
-        )
-        techniques.append(('adaptive_inv', adaptive_inv))
+        if technique_name == 'adaptive_inv':
+            return cv2.adaptiveThreshold(
+                plate_enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
+                cv2.THRESH_BINARY_INV, 11, 2
+            )
         
         # Tecnica 4: Imagen mejorada directamente
-        techniques.append(('enhanced', plate_enhanced))
-        
-        # Probar OCR con cada tecnica
-        all_results = []
-        
-        for technique_name, processed_img in techniques:
-            try:
-                results = self.reader.readtext(processed_img, detail=1)
-                for result in results:
-                    bbox_ocr, text, conf = result
-                    
-                    # Limpiar texto
-                    text = ''.join(c for c in text if c.isalnum() or c == ' ')
-                    text = text.upper().strip().replace(' ', '')
-                    
-                    if text:  # Solo agregar si hay texto
-                        all_results.append({
-                            'text': text,
-                            'confidence': conf,
-                            'technique': technique_name
-                        })
-            except Exception as e:
-                print(f"[DEBUG] Error en tecnica {technique_name}: {str(e)}")
-                continue
+        return plate_enhanced
+    
+    def _read_text(self, technique_name, processed_img):
+        """
+        Ejecuta EasyOCR sobre una imagen preprocesada y limpia los textos.
         
-        # Si no hay resultados del OCR
-        if not all_results:
-            print("[DEBUG] OCR no encontro texto")
-            return {'text': "SIN PLACA", 'bbox': plate_bbox}
+        Returns:
+            list: [{'text': str, 'confidence': float, 'technique': str}, ...]
+        """
+        try:
+            results = self.reader.readtext(processed_img, detail=1)
+        except Exception as e:
+            print(f"[DEBUG] Error en tecnica {technique_name}: {str(e)}")
+            return []
+        return self._clean_ocr_results(technique_name, results)
+    
+    def _read_text_batch(self, technique_name, processed_images):
+        """
+        Ejecuta EasyOCR sobre varias placas con readtext_batched (una sola pasada
+        del detector de texto para todas). readtext_batched exige imagenes del
+        mismo tamano: cada placa se rellena con el color de fondo de la tecnica
+        (como un letterbox) hasta el tamano mayor del grupo, sin deformar los
+        caracteres ni copiar trazos del borde al relleno.
         
-        # Filtrar resultados validos
-        valid_results = [
-            r for r in all_results 
-            if self.validate_plate_text(r['text'], r['confidence'])
+        Args:
+            technique_name (str): Tecnica aplicada a las imagenes
+            processed_images (list): Imagenes en gris preprocesadas
+            
+        Returns:
+            list: Una lista de candidatos por imagen (formato de _read_text)
+        """
+        if len(processed_images) == 1:
+            return [self._read_text(technique_name, processed_images[0])]
+        
+        max_h = max(img.shape[0] for img in processed_images)
+        max_w = max(img.shape[1] for img in processed_images)
+        pad_value = OCR_PAD_VALUES.get(technique_name, OCR_PAD_DEFAULT)
+        padded = [
+            cv2.copyMakeBorder(img, 0, max_h - img.shape[0], 0, max_w - img.shape[1],
+                               cv2.BORDER_CONSTANT, value=pad_value)
+            for img in processed_images
         ]
         
-        # Si no hay resultados validos
-        if not valid_results:
-            print(f"[DEBUG] Ningun resultado paso validacion. Mejor intento: {all_results[0]['text']} (conf: {all_results[0]['confidence']:.2f})")
-            return {'text': "SIN PLACA", 'bbox': plate_bbox}
+        try:
+            batch_results = self.reader.readtext_batched(padded, detail=1)
+        except Exception as e:
+            print(f"[DEBUG] Error en OCR por batch ({technique_name}): {str(e)}, leyendo de a una")
+            return [self._read_text(technique_name, img) for img in processed_images]
+        
+        return [self._clean_ocr_results(technique_name, results) for results in batch_results]
+    
+    def _clean_ocr_results(self, technique_name, results):
+        """
+        Normaliza la salida de EasyOCR (alfanumerico, mayusculas, sin espacios).
+        
+        Returns:
+            list: [{'text': str, 'confidence': float, 'technique': str}, ...]
+        """
+        candidates = []
+        for bbox_ocr, text, conf in results:
+            # Limpiar texto
+            text = ''.join(c for c in text if c.isalnum() or c == ' ')
+            text = text.upper().strip().replace(' ', '')
+            
+            if text:  # Solo agregar si hay texto
+                candidates.append({
+                    'text': text,
+                    'confidence': conf,
+                    'technique': technique_name
+                })
+        return candidates
+    
+    def technique_order(self):
+        """
+        Orden de la cascada de OCR: tecnicas con mayor tasa de victorias primero.
+        La tasa se suaviza ((wins + 1) / (runs + 2)) para que una tecnica poco
+        probada no quede primera ni ultima por azar. Empates respetan OCR_TECHNIQUES.
         
-        # Ordenar por confianza y tomar el mejor
-        best_result = max(valid_results, key=lambda x: x['confidence'])
-        text = best_result['text']
+        Returns:
+            list: Nombres de tecnica en orden de ejecucion
+        """
+        def win_rate(name):
+            stats = self.technique_stats[name]
+            return (stats['wins'] + 1.0) / (stats['runs'] + 2.0)
         
-        print(f"[DEBUG] Placa reconocida: {text} (conf: {best_result['confidence']:.2f}, tecnica: {best_result['technique']})")
+        return sorted(OCR_TECHNIQUES, key=lambda name: -win_rate(name))
+    
+    def _record_technique_stats(self, techniques_run, valid_results):
+        """Suma las ejecuciones de cada tecnica y la victoria de la que dio la mejor lectura."""
+        self.ocr_plates += 1
+        self.ocr_passes += len(techniques_run)
+        for name in techniques_run:
+            self.technique_stats[name]['runs'] += 1
+        if valid_results:
+            winner = max(valid_results, key=lambda x: x['confidence'])['technique']
+            self.technique_stats[winner]['wins'] += 1
+    
+    def get_ocr_stats(self):
+        """
+        Estadisticas de la cascada de OCR.
         
-        return {'text': text, 'bbox': plate_bbox}
\ No newline at end of file
+        Returns:
+            dict: {
+                'plates': int,            # Placas procesadas por OCR
+                'avg_passes': float,      # readtext por placa (4 = sin salida temprana)
+                'order': list,            # Orden actual de tecnicas
+                'techniques': {nombre: {'runs': int, 'wins': int}},
+                'cache': dict|None        # hits, misses, hit_ratio, size
+            }
+        """
+        return {
+            'plates': self.ocr_plates,
+            'avg_passes': self.ocr_passes / self.ocr_plates if self.ocr_plates else 0.0,
+            'order': self.technique_order(),
+            'techniques': {name: dict(stats) for name, stats in self.technique_stats.items()},
+            'cache': self.ocr_cache.get_stats() if self.ocr_cache else None,
+        }
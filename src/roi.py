@@ -0,0 +1,107 @@
+import cv2
+import numpy as np
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+# Color de relleno fuera del poligono (mismo gris que el letterbox de YOLO)
+ROI_FILL_VALUE = 114
+
+
+class DetectionROI:
+    def __init__(self, region):
+        """
+        Region de interes donde se ejecuta el detector de vehiculos.
+
+        Args:
+            region: Rectangulo (x1, y1, x2, y2) en pixeles, donde x2/y2 pueden ser
+                    None para llegar al borde del frame; o poligono como lista de
+                    puntos [(x, y), ...]. El poligono se recorta a su rectangulo
+                    contenedor y lo que queda fuera se rellena con gris.
+        """
+        self.polygon = None
+
+        if len(region) == 4 and not isinstance(region[0], (list, tuple)):
+            self.rect = tuple(region)
+        else:
+            points = np.array(region, dtype=np.int32).reshape(-1, 2)
+            if len(points) < 3:
+                raise ValueError(f"Poligono de ROI invalido (minimo 3 puntos): {region}")
+            self.polygon = points
+            x1, y1 = points.min(axis=0)
+            x2, y2 = points.max(axis=0)
+            self.rect = (int(x1), int(y1), int(x2), int(y2))
+
+        # Mascara del poligono cacheada por tamano de frame
+        self._mask_cache = {}
+
+        kind = 'poligono' if self.polygon is not None else 'rectangulo'
+        print(f"[ROI-INIT] ROI de deteccion ({kind}): {self.rect}")
+
+    @classmethod
+    def from_config(cls):
+        """
+        Crea la ROI desde config.DETECTION_ROI.
+
+        Returns:
+            DetectionROI or None: None si no hay ROI configurada (frame completo)
+        """
+        region = getattr(config, 'DETECTION_ROI', None)
+        if not region:
+            return None
+        return cls(region)
+
+    def _bounds(self, frame_shape):
+        """
+        Calcula el rectangulo de recorte limitado al frame.
+
+        Args:
+            frame_shape (tuple): Shape del frame
+
+        Returns:
+            tuple: (x1, y1, x2, y2) dentro del frame
+        """
+        h, w = frame_shape[:2]
+        x1, y1, x2, y2 = self.rect
+        x2 = w if x2 is None else x2
+        y2 = h if y2 is None else y2
+        x1, y1 = max(0, int(x1)), max(0, int(y1))
+        x2, y2 = min(w, int(x2)), min(h, int(y2))
+        return x1, y1, x2, y2
+
+    def _polygon_mask(self, frame_shape, bounds):
+        """Mascara booleana del poligono en coordenadas del recorte (cacheada)."""
+        key = frame_shape[:2]
+        if key not in self._mask_cache:
+            x1, y1, x2, y2 = bounds
+            mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+            cv2.fillPoly(mask, [self.polygon - np.array([x1, y1], dtype=np.int32)], 1)
+            self._mask_cache[key] = mask.astype(bool)
+        return self._mask_cache[key]
+
+    def crop(self, frame):
+        """
+        Recorta el frame a la ROI.
+
+        Args:
+            frame: Frame completo (numpy array BGR)
+
+        Returns:
+            tuple: (crop, (offset_x, offset_y)). crop es None si la ROI queda
+                   fuera del frame.
+        """
+        bounds = self._bounds(frame.shape)
+        x1, y1, x2, y2 = bounds
+        if x2 <= x1 or y2 <= y1:
+            return None, (x1, y1)
+
+        crop = frame[y1:y2, x1:x2]
+
+        if self.polygon is not None:
+            crop = crop.copy()
+            crop[~self._polygon_mask(frame.shape, bounds)] = ROI_FILL_VALUE
+
+        return crop, (x1, y1)
@@ -1,6 +1,12 @@
 from __future__ import annotations
 from typing import List, Dict, Any
 import numpy as np
+from filterpy.kalman import KalmanFilter
+
+try:
+    import lap
+except ImportError:
+    lap = None
 
 try:
     import config
@@ -12,6 +18,58 @@ except Exception:
     DEFAULT_MAX_AGE, DEFAULT_MIN_HITS, DEFAULT_IOU_THRESHOLD = 30, 3, 0.3
 
 
+def _bbox_to_z(bbox: List[float]) -> np.ndarray:
+    """[x1, y1, x2, y2] -> [cx, cy, area, aspect] (vector de medicion del Kalman)."""
+    w = max(1.0, float(bbox[2]) - float(bbox[0]))
+    h = max(1.0, float(bbox[3]) - float(bbox[1]))
+    return np.array(
+        [[float(bbox[0]) + w / 2.0], [float(bbox[1]) + h / 2.0], [w * h], [w / h]]
+    )
+
+
+def _x_to_bbox(x: np.ndarray) -> List[float]:
+    """Estado del Kalman [cx, cy, area, aspect, ...] -> [x1, y1, x2, y2]."""
+    area = max(1.0, float(x[2, 0]))
+    aspect = max(1e-3, float(x[3, 0]))
+    w = np.sqrt(area * aspect)
+    h = area / w
+    cx, cy = float(x[0, 0]), float(x[1, 0])
+    return [cx - w / 2.0, cy - h / 2.0, cx + w / 2.0, cy + h / 2.0]
+
+
+def iou_matrix(bboxes_a: np.ndarray, bboxes_b: np.ndarray) -> np.ndarray:
+    """
+    IoU de todas las cajas de bboxes_a (N, 4) contra todas las de bboxes_b (M, 4)
+    en una sola operacion con broadcasting. Devuelve una matriz (N, M).
+    """
+    a = bboxes_a[:, None, :]
+    b = bboxes_b[None, :, :]
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0.0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0.0, None)
+    inter_area = inter_w * inter_h
+
+    area_a = np.clip(a[..., 2] - a[..., 0], 0.0, None) * np.clip(a[..., 3] - a[..., 1], 0.0, None)
+    area_b = np.clip(b[..., 2] - b[..., 0], 0.0, None) * np.clip(b[..., 3] - b[..., 1], 0.0, None)
+
+    denom = area_a + area_b - inter_area
+    return np.divide(inter_area, denom, out=np.zeros_like(inter_area), where=denom > 0.0)
+
+
+def linear_assignment(cost: np.ndarray) -> np.ndarray:
+    """
+    Asignacion optima (hungaro) de filas a columnas minimizando el costo total.
+    Usa lap.lapjv si esta instalado y si no scipy. Devuelve pares (fila, columna) (K, 2).
+    """
+    if lap is not None:
+        _, x, _ = lap.lapjv(cost, extend_cost=True)
+        return np.array([[row, col] for row, col in enumerate(x) if col >= 0], dtype=np.int64).reshape(-1, 2)
+
+    from scipy.optimize import linear_sum_assignment
+
+    rows, cols = linear_sum_assignment(cost)
+    return np.stack([rows, cols], axis=1).astype(np.int64)
+
+
 class _Track:
     def __init__(self, bbox: List[float], track_id: int):
         self.id = track_id
@@ -21,7 +79,31 @@ class _Track:
         self.age = 0
         self.time_since_update = 0
 
+        # Kalman de velocidad constante (estilo SORT):
+        # estado [cx, cy, area, aspect, vx, vy, v_area], aspect constante
+        self.kf = KalmanFilter(dim_x=7, dim_z=4)
+        self.kf.F = np.eye(7)
+        self.kf.F[0, 4] = self.kf.F[1, 5] = self.kf.F[2, 6] = 1.0
+        self.kf.H = np.eye(4, 7)
+        self.kf.R[2:, 2:] *= 10.0
+        self.kf.P[4:, 4:] *= 1000.0  # velocidad inicial desconocida
+        self.kf.P *= 10.0
+        self.kf.Q[-1, -1] *= 0.01
+        self.kf.Q[4:, 4:] *= 0.01
+        self.kf.x[:4] = _bbox_to_z(bbox)
+
+    def predict(self) -> List[float]:
+        """Avanza el estado un frame y deja en bbox la caja predicha."""
+        # Evitar area negativa si el vehiculo se aleja rapido
+        if self.kf.x[2, 0] + self.kf.x[6, 0] <= 0:
+            self.kf.x[6, 0] = 0.0
+        self.kf.predict()
+        self.bbox = _x_to_bbox(self.kf.x)
+        return self.bbox
+
     def update(self, bbox: List[float]) -> None:
+        # La caja visible es la deteccion; el Kalman aprende la velocidad
+        self.kf.update(_bbox_to_z(bbox))
         self.bbox = bbox
         self.hits += 1
         self.hit_streak += 1
@@ -80,43 +162,49 @@ class VehicleTracker:
         if not self.tracks or not detections:
             return [], list(range(len(self.tracks))), list(range(len(detections)))
 
-        iou_matrix = np.zeros((len(self.tracks), len(detections)), dtype=np.float32)
-        for t_idx, track in enumerate(self.tracks):
-            for d_idx, det in enumerate(detections):
-                iou_matrix[t_idx, d_idx] = self._iou(track.bbox, det["bbox"])
-
-        matches = []
-        matched_tracks = set()
-        matched_dets = set()
-
-        while True:
-            t_idx, d_idx = np.unravel_index(np.argmax(iou_matrix), iou_matrix.shape)
-            max_iou = iou_matrix[t_idx, d_idx]
-            if max_iou < self.iou_threshold:
-                break
-
-            if t_idx in matched_tracks or d_idx in matched_dets:
-                iou_matrix[t_idx, d_idx] = -1
-                continue
-
-            matches.append((t_idx, d_idx))
-            matched_tracks.add(t_idx)
-            matched_dets.add(d_idx)
-            iou_matrix[t_idx, :] = -1
-            iou_matrix[:, d_idx] = -1
+        track_boxes = np.array([track.bbox for track in self.tracks], dtype=np.float32)
+        det_boxes = np.array([det["bbox"] for det in detections], dtype=np.float32)
+        ious = iou_matrix(track_boxes, det_boxes)
+
+        candidates = ious >= self.iou_threshold
+        if candidates.sum(axis=1).max() <= 1 and candidates.sum(axis=0).max() <= 1:
+            # Cada track y cada deteccion tienen a lo sumo un candidato (caso
+            # comun con autos separados): la asignacion es directa
+            pairs = np.argwhere(candidates)
+        else:
+            # Asignacion optima maximizando el IoU total; se descartan los
+            # pares que quedaron por debajo del umbral
+            pairs = linear_assignment(-ious)
+            pairs = pairs[ious[pairs[:, 0], pairs[:, 1]] >= self.iou_threshold]
+
+        matches = [(int(t_idx), int(d_idx)) for t_idx, d_idx in pairs]
+        matched_tracks = {t_idx for t_idx, _ in matches}
+        matched_dets = {d_idx for _, d_idx in matches}
 
         unmatched_tracks = [i for i in range(len(self.tracks)) if i not in matched_tracks]
         unmatched_dets = [i for i in range(len(detections)) if i not in matched_dets]
         return matches, unmatched_tracks, unmatched_dets
 
+    def predict(self) -> List[Dict[str, Any]]:
+        """
+        Avanza todos los tracks un frame con el modelo de movimiento, sin detecciones.
+        Se usa en los frames donde no corre el detector: no cuenta como frame perdido
+        (time_since_update solo avanza con update).
+        """
+        for track in self.tracks:
+            track.age += 1
+            track.predict()
+        return self._outputs()
+
     def update(self, detections: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         self.frame_count += 1
         detections = detections or []
 
-        # Envejecer todos los tracks antes de asociar
+        # Envejecer y predecir todos los tracks antes de asociar
         for track in self.tracks:
             track.age += 1
             track.time_since_update += 1
+            track.predict()
 
         matches, unmatched_tracks, unmatched_dets = self._associate(detections)
 
@@ -139,6 +227,9 @@ class VehicleTracker:
             track for track in self.tracks if track.time_since_update <= self.max_age
         ]
 
+        return self._outputs()
+
+    def _outputs(self) -> List[Dict[str, Any]]:
         # Devolver solo tracks confirmados (min_hits) o recién actualizados en arranque
         output = []
         for track in self.tracks:
@@ -0,0 +1,112 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import config
+except ImportError:
+    config = None
+
+
+class WorkerPool:
+    def __init__(self, workers=1):
+        """
+        Pool de hilos para el trabajo por vehiculo que no pasa por los modelos
+        (preprocesado de placas, calidad, hash, color). OpenCV libera el GIL,
+        asi que varios recortes se procesan en paralelo de verdad.
+
+        `map` devuelve los resultados en el orden de entrada, igual que la
+        version en serie, asi que el resultado no depende de los hilos.
+
+        Args:
+            workers (int): Hilos del pool (1 = todo en el hilo que llama)
+        """
+        self.workers = max(1, int(workers))
+        self._executor = None
+        if self.workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='vehicle-worker')
+
+    @classmethod
+    def from_config(cls):
+        """
+        Crea el pool desde config.py (WORKER_THREADS; None = min(4, nucleos - 1)).
+
+        Returns:
+            WorkerPool: Pool con los hilos configurados
+        """
+        workers = getattr(config, 'WORKER_THREADS', None)
+        if workers is None:
+            workers = min(4, (os.cpu_count() or 1) - 1)
+        return cls(workers)
+
+    def map(self, fn, items):
+        """
+        Aplica fn a cada elemento (en paralelo si hay mas de un hilo).
+
+        Args:
+            fn (callable): Funcion de un argumento
+            items (iterable): Elementos a procesar
+
+        Returns:
+            list: fn(item) por elemento, en el mismo orden
+        """
+        items = list(items)
+        if self._executor is None or len(items) < 2:
+            return [fn(item) for item in items]
+        return list(self._executor.map(fn, items))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    """
+    Pool compartido por todo el proceso (reconocedor de placas y clasificador).
+    Al crearlo se reparte la CPU con torch (ver configure_torch_threads).
+
+    Returns:
+        WorkerPool: Pool unico del proceso
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool.from_config()
+            configure_torch_threads(_pool.workers)
+            print(f"[WORKERS] Pool de {_pool.workers} hilo(s) para preprocesado por vehiculo")
+        return _pool
+
+
+def configure_torch_threads(workers):
+    """
+    Reparte los nucleos entre torch y el pool. TORCH_NUM_THREADS en config.py
+    fija el valor a mano; sin valor, torch queda con nucleos - workers hilos,
+    pero nunca menos de la mitad de los nucleos.
+
+    El piso existe porque el pool casi no se solapa con YOLO/EasyOCR (las
+    pasadas por batch corren en el hilo que llama, antes o despues del
+    preprocesado): lo que se comparte es la CPU con la UI y con el otro modelo
+    que carga en segundo plano, y bajar torch a 1 hilo en una maquina de 4
+    nucleos haria mas lenta la inferencia que la sobresuscripcion que evita.
+
+    Args:
+        workers (int): Hilos del pool
+
+    Returns:
+        int or None: Hilos asignados a torch (None si no se cambio)
+    """
+    threads = getattr(config, 'TORCH_NUM_THREADS', None)
+    if threads is None:
+        if workers <= 1:
+            return None
+        cores = os.cpu_count() or 1
+        threads = max(cores // 2, cores - workers, 1)
+
+    try:
+        import torch
+    except ImportError:
+        return None
+
+    torch.set_num_threads(int(threads))
+    print(f"[WORKERS] torch limitado a {threads} hilo(s) (pool de {workers})")
+    return int(threads)
@@ -0,0 +1,219 @@
+"""
+Cuantizacion INT8 post-entrenamiento (estatica) de los detectores YOLO.
+
+Flujo por modelo:
+1. Exporta el .pt a un ONNX FP32 de tamano fijo (models/<modelo>.fp32.onnx)
+2. Calibra las activaciones con una carpeta de frames de muestra y genera
+   models/<modelo>.int8.onnx (onnxruntime quantize_static, formato QDQ)
+3. Compara INT8 vs FP32 sobre un set de imagenes separado: latencia,
+   concordancia de cajas y, si hay etiquetas YOLO (images/ + labels/), mAP50
+4. Indica si el modelo pasa la compuerta de precision (--max-drop) y guarda
+   el reporte en models/quantization_report.json
+
+El pipeline usa el modelo INT8 si se activa en config.QUANTIZED_MODELS.
+
+Uso:
+    python tools/quantize_models.py --calib data/calib_frames --holdout data/holdout \
+        [--models car_detector plate_detector brand_detector] [--imgsz 640] [--max-drop 0.02]
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from src.inference import OnnxBackend, letterbox, quantized_model_path
+from benchmarks.metrics import agreement, load_yolo_labels, map50
+
+MODELS = ['car_detector', 'plate_detector', 'brand_detector']
+IMAGE_EXTENSIONS = ('*.jpg', '*.jpeg', '*.png', '*.bmp')
+
+
+def list_images(folder, limit=None):
+    """Rutas de imagenes en folder (o folder/images si existe)."""
+    if os.path.isdir(os.path.join(folder, 'images')):
+        folder = os.path.join(folder, 'images')
+    paths = sorted(p for ext in IMAGE_EXTENSIONS for p in glob.glob(os.path.join(folder, ext)))
+    return paths[:limit] if limit else paths
+
+
+def export_static_fp32(model_path, imgsz):
+    """
+    Exporta el .pt a ONNX FP32 con entrada fija (requerido para calibrar).
+    Se exporta en un directorio temporal para no pisar el ONNX dinamico cacheado.
+
+    Returns:
+        str: Ruta a models/<modelo>.fp32.onnx
+    """
+    from ultralytics import YOLO
+
+    fp32_path = os.path.splitext(model_path)[0] + '.fp32.onnx'
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_model = os.path.join(tmp_dir, os.path.basename(model_path))
+        shutil.copy(model_path, tmp_model)
+        exported = YOLO(tmp_model).export(format='onnx', imgsz=imgsz, dynamic=False)
+        shutil.move(exported, fp32_path)
+    return fp32_path
+
+
+class YoloCalibrationReader:
+    """Entrega los frames de calibracion con el mismo preprocesado que OnnxBackend."""
+
+    def __init__(self, image_paths, input_name, imgsz):
+        self.image_paths = list(image_paths)
+        self.input_name = input_name
+        self.imgsz = imgsz
+        self._index = 0
+
+    def get_next(self):
+        while self._index < len(self.image_paths):
+            image = cv2.imread(self.image_paths[self._index])
+            self._index += 1
+            if image is None:
+                continue
+            img, _, _ = letterbox(image, (self.imgsz, self.imgsz))
+            blob = img[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+            return {self.input_name: np.ascontiguousarray(blob)}
+        return None
+
+    def rewind(self):
+        self._index = 0
+
+
+def detection_head_nodes(onnx_path):
+    """Nodos del ultimo modulo (cabeza Detect/DFL), sensibles a la cuantizacion."""
+    import onnx
+
+    graph = onnx.load(onnx_path).graph
+    indices = [int(n.name.split('/')[1].split('.')[1]) for n in graph.node
+               if n.name.startswith('/model.') and n.name.split('/')[1].split('.')[1].isdigit()]
+    if not indices:
+        return []
+    head_prefix = f"/model.{max(indices)}/"
+    return [n.name for n in graph.node if n.name.startswith(head_prefix)]
+
+
+def quantize(fp32_path, int8_path, calib_paths, imgsz, exclude_head):
+    """Calibracion estatica INT8 (QDQ, pesos por canal)."""
+    import onnxruntime as ort
+    from onnxruntime.quantization import (CalibrationDataReader, QuantFormat, QuantType,
+                                          quantize_static)
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    class _Reader(YoloCalibrationReader, CalibrationDataReader):
+        pass
+
+    prepared_path = fp32_path.replace('.fp32.onnx', '.fp32-prep.onnx')
+    quant_pre_process(fp32_path, prepared_path, skip_symbolic_shape=True)
+
+    input_name = ort.InferenceSession(prepared_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+    nodes_to_exclude = detection_head_nodes(prepared_path) if exclude_head else []
+
+    quantize_static(
+        prepared_path,
+        int8_path,
+        _Reader(calib_paths, input_name, imgsz),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        nodes_to_exclude=nodes_to_exclude,
+    )
+    os.remove(prepared_path)
+
+
+def evaluate(backend, images):
+    """Latencia media por imagen (ms) y predicciones."""
+    backend.predict(images[:1])  # warmup
+    start = time.perf_counter()
+    predictions = [backend.predict([img])[0] for img in images]
+    return (time.perf_counter() - start) / len(images) * 1000, predictions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cuantizacion INT8 de los detectores YOLO")
+    parser.add_argument('--calib', required=True, help="Carpeta de frames de calibracion")
+    parser.add_argument('--holdout', required=True, help="Carpeta de imagenes de evaluacion (separada)")
+    parser.add_argument('--models', nargs='+', default=MODELS, choices=MODELS)
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--max-calib', type=int, default=200)
+    parser.add_argument('--max-drop', type=float, default=0.02,
+                        help="Caida maxima aceptable de mAP50 (o de concordancia si no hay etiquetas)")
+    parser.add_argument('--keep-head-fp32', action='store_true',
+                        help="No cuantizar la cabeza de deteccion (mas precision, menos speedup)")
+    args = parser.parse_args()
+
+    calib_paths = list_images(args.calib, args.max_calib)
+    holdout_paths = list_images(args.holdout)
+    if not calib_paths or not holdout_paths:
+        raise RuntimeError("Se necesitan imagenes de calibracion y de evaluacion")
+
+    holdout = [(p, cv2.imread(p)) for p in holdout_paths]
+    holdout = [(p, img) for p, img in holdout if img is not None]
+    images = [img for _, img in holdout]
+    labels = [load_yolo_labels(p, img.shape) for p, img in holdout]
+    has_labels = all(label is not None for label in labels)
+
+    report = {}
+    for name in args.models:
+        model_path = os.path.join(PROJECT_ROOT, 'models', f'{name}.pt')
+        print(f"\n[QUANT] {name}: exportando FP32 y calibrando con {len(calib_paths)} frames...")
+
+        fp32_path = export_static_fp32(model_path, args.imgsz)
+        int8_path = quantized_model_path(model_path)
+        quantize(fp32_path, int8_path, calib_paths, args.imgsz, args.keep_head_fp32)
+
+        fp32_ms, fp32_pred = evaluate(OnnxBackend(fp32_path), images)
+        int8_ms, int8_pred = evaluate(OnnxBackend(int8_path), images)
+
+        entry = {
+            'fp32_ms': fp32_ms,
+            'int8_ms': int8_ms,
+            'speedup': fp32_ms / int8_ms,
+            'agreement': float(np.mean([agreement(a, b) for a, b in zip(fp32_pred, int8_pred)])),
+        }
+        if has_labels:
+            entry['fp32_map50'] = map50(fp32_pred, labels)
+            entry['int8_map50'] = map50(int8_pred, labels)
+            entry['drop'] = entry['fp32_map50'] - entry['int8_map50']
+        else:
+            entry['drop'] = 1.0 - entry['agreement']
+        entry['safe'] = entry['drop'] <= args.max_drop
+        report[name] = entry
+
+    print("\n" + "=" * 78)
+    print(f"REPORTE INT8 vs FP32 ({len(images)} imagenes de evaluacion, "
+          f"{'mAP50 con etiquetas' if has_labels else 'sin etiquetas: concordancia'})")
+    print("=" * 78)
+    print(f"{'modelo':<16}{'FP32 ms':>9}{'INT8 ms':>9}{'speedup':>9}{'concord.':>10}"
+          f"{'mAP FP32':>10}{'mAP INT8':>10}{'usar':>6}")
+    for name, entry in report.items():
+        map_fp32 = f"{entry['fp32_map50']:.3f}" if has_labels else '-'
+        map_int8 = f"{entry['int8_map50']:.3f}" if has_labels else '-'
+        print(f"{name:<16}{entry['fp32_ms']:>9.1f}{entry['int8_ms']:>9.1f}{entry['speedup']:>9.2f}"
+              f"{entry['agreement']:>10.1%}{map_fp32:>10}{map_int8:>10}{'SI' if entry['safe'] else 'NO':>6}")
+    print("=" * 78)
+
+    print("\nConfiguracion sugerida para config.py:")
+    print("QUANTIZED_MODELS = {")
+    for name, entry in report.items():
+        print(f"    '{name}': {entry['safe']},")
+    print("}")
+
+    report_path = os.path.join(PROJECT_ROOT, 'models', 'quantization_report.json')
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReporte guardado en: {report_path}")
+
+
+if __name__ == "__main__":
+    main()